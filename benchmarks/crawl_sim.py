@@ -0,0 +1,211 @@
+"""
+End-to-end crawl simulation against the local publisher farm.
+
+Starts a PublisherFarm in a child process (so its CPU time is not counted
+against the crawler), points Settings.NEWS_SOURCES at it and runs
+TechInvestmentCrawler.run_crawl into a temporary database, one or more
+rounds. Between rounds the farm publishes new items, or with
+--no-advance stays unchanged so feeds answer 304. Run from the
+repository root:
+
+    python -m benchmarks.crawl_sim --hosts 20 --latency 0.02 --error-rate 0.02 --rounds 3
+    python -m benchmarks.crawl_sim --hosts 20 --drip-rate 0.1 --output crawl.json
+
+Each round reports articles/sec, p50/p99 fetch latency and CPU time per
+article.
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import socket
+import sys
+import tempfile
+import time
+from typing import List, Optional
+from unittest import mock
+
+import requests
+
+from tech_crawler.config import Settings
+
+from .publisher_farm import PublisherFarm, add_arguments, farm_options
+
+logger = logging.getLogger(__name__)
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of values"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+class FetchTimer:
+    """Records the wall time of every requests.get made while installed"""
+
+    def __init__(self):
+        self.timings: List[float] = []
+        self._get = requests.get
+
+    def __call__(self, *args, **kwargs):
+        began = time.perf_counter()
+        try:
+            return self._get(*args, **kwargs)
+        finally:
+            self.timings.append(time.perf_counter() - began)
+
+    def reset(self) -> List[float]:
+        timings, self.timings = self.timings, []
+        return timings
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _serve_farm(options: dict, port: int) -> None:
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    PublisherFarm(**options).serve_forever(port)
+
+
+def start_farm_process(options: dict, timeout: float = 10.0):
+    """
+    Start a PublisherFarm in a child process.
+
+    Returns:
+        (process, base URL)
+    """
+    port = _free_port()
+    process = multiprocessing.Process(target=_serve_farm, args=(options, port), daemon=True)
+    process.start()
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            requests.get(f"{base_url}/_farm/stats", timeout=1).raise_for_status()
+            return process, base_url
+        except requests.RequestException:
+            if time.monotonic() > deadline or not process.is_alive():
+                process.terminate()
+                raise RuntimeError("Publisher farm did not start")
+            time.sleep(0.05)
+
+
+def simulate(
+    base_url: str,
+    sources: List[dict],
+    rounds: int = 2,
+    advance: bool = True,
+    analyze: bool = True,
+) -> dict:
+    """
+    Run the crawler against a running farm.
+
+    Args:
+        base_url: Farm base URL (for advancing it between rounds)
+        sources: NEWS_SOURCES entries to crawl
+        rounds: Number of run_crawl passes
+        advance: Publish new items on the farm before each round after the first
+        analyze: Run the analyzer, as the production crawl does
+
+    Returns:
+        dict with a report per round and the farm's own counters
+    """
+    from main import TechInvestmentCrawler
+
+    timer = FetchTimer()
+    reports = []
+    with tempfile.TemporaryDirectory() as tmpdir, mock.patch.multiple(
+        Settings,
+        NEWS_SOURCES=sources,
+        DATABASE_URL=f"sqlite:///{os.path.join(tmpdir, 'sim.db')}",
+        ARCHIVE_DIR=os.path.join(tmpdir, "archive"),
+        RATE_LIMIT_DELAY=0,
+    ), mock.patch("requests.get", timer):
+        crawler = TechInvestmentCrawler()
+        try:
+            for number in range(1, rounds + 1):
+                if number > 1 and advance:
+                    requests.post(f"{base_url}/_farm/advance", timeout=5).raise_for_status()
+                timer.reset()
+                cpu_began = time.process_time()
+                began = time.perf_counter()
+                stats = crawler.run_crawl(save_to_db=True, analyze=analyze)
+                elapsed = time.perf_counter() - began
+                cpu = time.process_time() - cpu_began
+                timings = timer.reset()
+
+                articles = stats["total_articles"]
+                p50 = percentile(timings, 50)
+                p99 = percentile(timings, 99)
+                reports.append({
+                    "round": number,
+                    "seconds": round(elapsed, 3),
+                    "articles": articles,
+                    "new_articles": stats.get("new_articles", 0),
+                    "articles_per_sec": round(articles / elapsed, 2) if elapsed > 0 else None,
+                    "fetches": len(timings),
+                    "fetch_p50_ms": round(p50 * 1000, 2) if p50 is not None else None,
+                    "fetch_p99_ms": round(p99 * 1000, 2) if p99 is not None else None,
+                    "cpu_ms_per_article": round(cpu * 1000 / articles, 3) if articles else None,
+                    "sources_crawled": stats["sources_crawled"],
+                    "not_modified": stats["not_modified"],
+                    "errors": stats["errors"],
+                })
+        finally:
+            crawler.db.close()
+
+    farm_stats = requests.get(f"{base_url}/_farm/stats", timeout=5).json()
+    return {"rounds": reports, "farm": farm_stats}
+
+
+def main(argv=None) -> int:
+    """Run the crawl simulation from the command line"""
+    parser = argparse.ArgumentParser(description="Crawl simulation against a local publisher farm")
+    parser.add_argument("--rounds", type=int, default=2)
+    parser.add_argument("--no-advance", action="store_true", help="keep feeds unchanged between rounds")
+    parser.add_argument("--no-analyze", action="store_true")
+    parser.add_argument("--output", help="write the report JSON to this file")
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    options = farm_options(args)
+    process, base_url = start_farm_process(options)
+    try:
+        sources = PublisherFarm(**options).sources(base_url)
+        # Set up logging before main.py's INFO default; the crawlers log every article
+        logging.basicConfig(level=logging.WARNING)
+        report = simulate(
+            base_url,
+            sources,
+            rounds=args.rounds,
+            advance=not args.no_advance,
+            analyze=not args.no_analyze,
+        )
+    finally:
+        process.terminate()
+        process.join()
+
+    report["options"] = options
+    for result in report["rounds"]:
+        print(
+            f"round {result['round']}: {result['articles']} articles in {result['seconds']}s "
+            f"({result['articles_per_sec']}/s), fetch p50 {result['fetch_p50_ms']} ms "
+            f"p99 {result['fetch_p99_ms']} ms, CPU {result['cpu_ms_per_article']} ms/article, "
+            f"{result['not_modified']} unchanged, {result['errors']} errors"
+        )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,327 @@
+"""
+Local farm of fake news publishers for crawl load tests.
+
+Serves synthetic RSS feeds, HTML listing pages and article pages for N
+fake hosts, each under its own path prefix, with configurable latency,
+errors, slow-drip bodies and 304 revalidation. Run it with:
+
+    python -m benchmarks.publisher_farm --hosts 20 --latency 0.02 --write-sources sources.json
+
+then point the crawler at it with NEWS_SOURCES_FILE=sources.json.
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import random
+import threading
+import time
+from email.utils import formatdate
+from html import escape
+from typing import List, Optional
+
+from flask import Flask, Response, jsonify, request
+from werkzeug.serving import make_server
+
+from tech_crawler.config import Settings
+
+logger = logging.getLogger(__name__)
+
+_VERBS = ("expands", "invests in", "launches", "bets on", "cuts prices on", "partners on", "reports growth in")
+_NOUNS = ("platform", "chips", "infrastructure", "startup deal", "research lab", "product line")
+_FILLER = (
+    "Analysts expect the move to reshape competition over the next year.",
+    "The company told investors that enterprise demand remains strong.",
+    "Venture capital firms have poured money into the sector since 2023.",
+    "Regulators are reviewing the plan, which could take months to approve.",
+    "Developers will get access through a public API starting next quarter.",
+    "Shares rose in early trading after the announcement.",
+)
+
+
+class PublisherFarm:
+    """
+    Synthetic publishers behind one local HTTP server.
+
+    Host i serves /<i>/feed.xml (RSS), /<i>/ (an HTML listing) and
+    /<i>/articles/<n>. Content is deterministic for a given seed and
+    generation; advance() publishes new items on every host, and until
+    then feeds answer conditional requests with 304.
+    """
+
+    def __init__(
+        self,
+        hosts: int = 10,
+        items: int = 20,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        drip_rate: float = 0.0,
+        drip_chunks: int = 8,
+        drip_delay: float = 0.05,
+        html_every: int = 0,
+        seed: int = 0,
+    ):
+        """
+        Args:
+            hosts: Number of fake publishers
+            items: Items per feed
+            latency: Seconds to wait before answering each request
+            jitter: Extra random latency, up to this many seconds
+            error_rate: Fraction of requests answered with 503
+            drip_rate: Fraction of bodies sent in drip_chunks pieces, drip_delay apart
+            html_every: Make every Nth host an HTML source instead of RSS (0 for none)
+            seed: Random seed for content and failures
+        """
+        self.hosts = hosts
+        self.items = items
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.drip_rate = drip_rate
+        self.drip_chunks = max(1, drip_chunks)
+        self.drip_delay = drip_delay
+        self.html_every = html_every
+        self.seed = seed
+        self.generation = 0
+        self.stats = {"requests": 0, "errors": 0, "not_modified": 0, "dripped": 0}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._published_at = time.time()
+        self.app = self._create_app()
+        self._server = None
+        self._thread = None
+
+    def advance(self, new_items: Optional[int] = None) -> None:
+        """Publish new items on every host"""
+        with self._lock:
+            self.generation += new_items if new_items is not None else self.items
+            self._published_at = time.time()
+
+    def _item_ids(self) -> range:
+        return range(self.generation, self.generation + self.items)
+
+    def _title(self, host: int, item: int) -> str:
+        rng = random.Random(f"{self.seed}-{host}-{item}")
+        company = rng.choice(Settings.TECH_COMPANIES)["name"]
+        trend = rng.choice(Settings.TECH_TRENDS)
+        return f"{company} {rng.choice(_VERBS)} {trend} {rng.choice(_NOUNS)} (#{host}-{item})"
+
+    def _paragraphs(self, host: int, item: int) -> List[str]:
+        rng = random.Random(f"{self.seed}-{host}-{item}-body")
+        return [rng.choice(_FILLER) for _ in range(6)]
+
+    def _etag(self, host: int) -> str:
+        return '"' + hashlib.sha1(f"{self.seed}-{host}-{self.generation}".encode()).hexdigest()[:16] + '"'
+
+    def _before_request(self) -> Optional[Response]:
+        """Apply latency and failure injection; return a response to short-circuit"""
+        with self._lock:
+            self.stats["requests"] += 1
+            fail = self._random.random() < self.error_rate
+            delay = self.latency + (self._random.random() * self.jitter if self.jitter else 0.0)
+        if delay:
+            time.sleep(delay)
+        if fail:
+            with self._lock:
+                self.stats["errors"] += 1
+            return Response("Service unavailable", status=503)
+        return None
+
+    def _respond(self, body: str, mimetype: str, headers: Optional[dict] = None) -> Response:
+        """Send a body whole, or dripped slowly for a drip_rate share of responses"""
+        with self._lock:
+            drip = self._random.random() < self.drip_rate
+            if drip:
+                self.stats["dripped"] += 1
+        if not drip:
+            return Response(body, mimetype=mimetype, headers=headers)
+
+        data = body.encode("utf-8")
+        size = -(-len(data) // self.drip_chunks)
+        delay = self.drip_delay
+
+        def chunks():
+            for start in range(0, len(data), size):
+                yield data[start:start + size]
+                time.sleep(delay)
+
+        response = Response(chunks(), mimetype=mimetype, headers=headers)
+        response.headers["Content-Length"] = str(len(data))
+        return response
+
+    def _feed(self, host: int) -> str:
+        base = request.host_url.rstrip("/")
+        items = []
+        for item in self._item_ids():
+            url = f"{base}/{host}/articles/{item}"
+            items.append(
+                "<item>"
+                f"<title>{escape(self._title(host, item))}</title>"
+                f"<link>{url}</link><guid>{url}</guid>"
+                f"<pubDate>{formatdate(self._published_at - item * 60, usegmt=True)}</pubDate>"
+                f"<description>{escape(' '.join(self._paragraphs(host, item)[:2]))}</description>"
+                "</item>"
+            )
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+            f"<title>Mock Publisher {host}</title><link>{base}/{host}/</link>"
+            f"<description>Synthetic feed</description>{''.join(items)}</channel></rss>"
+        )
+
+    def _listing(self, host: int) -> str:
+        cards = "".join(
+            f'<article><h2><a href="/{host}/articles/{item}">{escape(self._title(host, item))}</a></h2>'
+            f"<p>{escape(self._paragraphs(host, item)[0])}</p></article>"
+            for item in self._item_ids()
+        )
+        return f"<html><head><title>Mock Publisher {host}</title></head><body><main>{cards}</main></body></html>"
+
+    def _article(self, host: int, item: int) -> str:
+        paragraphs = "".join(f"<p>{escape(p)}</p>" for p in self._paragraphs(host, item))
+        return (
+            f"<html><head><title>{escape(self._title(host, item))}</title></head><body>"
+            "<nav><p>Home | Markets | Tech</p></nav>"
+            f"<article><h1>{escape(self._title(host, item))}</h1>{paragraphs}</article>"
+            "<footer><p>Mock Publisher</p></footer></body></html>"
+        )
+
+    def _conditional(self, host: int, body, mimetype: str) -> Response:
+        """Answer 304 if the client already has this generation, else the page"""
+        etag = self._etag(host)
+        last_modified = formatdate(self._published_at, usegmt=True)
+        if request.headers.get("If-None-Match") == etag:
+            with self._lock:
+                self.stats["not_modified"] += 1
+            return Response(status=304, headers={"ETag": etag})
+        return self._respond(body(), mimetype, {"ETag": etag, "Last-Modified": last_modified})
+
+    def _create_app(self) -> Flask:
+        app = Flask(__name__)
+
+        @app.route("/<int:host>/feed.xml")
+        def feed(host):
+            if host >= self.hosts:
+                return Response("Not found", status=404)
+            return self._before_request() or self._conditional(
+                host, lambda: self._feed(host), "application/rss+xml"
+            )
+
+        @app.route("/<int:host>/")
+        def listing(host):
+            if host >= self.hosts:
+                return Response("Not found", status=404)
+            return self._before_request() or self._conditional(
+                host, lambda: self._listing(host), "text/html"
+            )
+
+        @app.route("/<int:host>/articles/<int:item>")
+        def article(host, item):
+            if host >= self.hosts:
+                return Response("Not found", status=404)
+            return self._before_request() or self._respond(self._article(host, item), "text/html")
+
+        @app.route("/_farm/advance", methods=["POST"])
+        def advance():
+            self.advance(request.args.get("items", type=int))
+            return jsonify({"generation": self.generation})
+
+        @app.route("/_farm/stats")
+        def stats():
+            with self._lock:
+                return jsonify(dict(self.stats, generation=self.generation))
+
+        return app
+
+    def sources(self, base_url: Optional[str] = None) -> List[dict]:
+        """NEWS_SOURCES entries pointing at every host"""
+        base_url = base_url or self.url
+        sources = []
+        for host in range(self.hosts):
+            if self.html_every and host % self.html_every == self.html_every - 1:
+                sources.append({"name": f"Mock Publisher {host}", "url": f"{base_url}/{host}/", "type": "html"})
+            else:
+                sources.append({"name": f"Mock Publisher {host}", "url": f"{base_url}/{host}/feed.xml", "type": "rss"})
+        return sources
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server"""
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def start(self, port: int = 0) -> "PublisherFarm":
+        """Serve in a background thread (port 0 picks a free port)"""
+        self._server = make_server("127.0.0.1", port, self.app, threaded=True)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self, port: int = 0) -> None:
+        """Serve in the calling thread"""
+        self._server = make_server("127.0.0.1", port, self.app, threaded=True)
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        """Shut the server down"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server = None
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Farm options shared with the crawl simulation"""
+    parser.add_argument("--hosts", type=int, default=10)
+    parser.add_argument("--items", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--drip-rate", type=float, default=0.0)
+    parser.add_argument("--drip-chunks", type=int, default=8)
+    parser.add_argument("--drip-delay", type=float, default=0.05)
+    parser.add_argument("--html-every", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def farm_options(args: argparse.Namespace) -> dict:
+    """PublisherFarm keyword arguments from parsed add_arguments options"""
+    return {
+        "hosts": args.hosts,
+        "items": args.items,
+        "latency": args.latency,
+        "jitter": args.jitter,
+        "error_rate": args.error_rate,
+        "drip_rate": args.drip_rate,
+        "drip_chunks": args.drip_chunks,
+        "drip_delay": args.drip_delay,
+        "html_every": args.html_every,
+        "seed": args.seed,
+    }
+
+
+def main():
+    """Run the publisher farm from the command line"""
+    parser = argparse.ArgumentParser(description="Local farm of fake news publishers")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--write-sources", help="write NEWS_SOURCES JSON for the farm to this file")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    farm = PublisherFarm(**farm_options(args)).start(args.port)
+    if args.write_sources:
+        with open(args.write_sources, "w", encoding="utf-8") as f:
+            json.dump(farm.sources(), f, indent=2)
+        logger.info(f"Wrote {args.hosts} sources to {args.write_sources}")
+    logger.info(f"Publisher farm listening on {farm.url}")
+    try:
+        while True:
+            time.sleep(5)
+            logger.info(f"Publisher farm stats: {farm.stats}")
+    except KeyboardInterrupt:
+        farm.stop()
+
+
+if __name__ == "__main__":
+    main()
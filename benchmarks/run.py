@@ -0,0 +1,285 @@
+"""
+Offline throughput benchmarks for the crawl, analysis and storage paths.
+
+Everything runs against the recorded pages in benchmarks/fixtures and a
+temporary SQLite database, so no network access is needed. Run from the
+repository root:
+
+    python -m benchmarks.run
+    python -m benchmarks.run --rows 1000,100000,1000000
+    python -m benchmarks.run --output results.json --compare benchmarks/baseline.json
+
+With --compare, a benchmark whose rate dropped by more than its threshold
+in benchmarks/thresholds.json counts as a regression and the exit status
+is 1.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from unittest import mock
+
+import feedparser
+
+from tech_crawler.analysis import ArticleAnalyzer
+from tech_crawler.crawlers import BaseCrawler, HTMLCrawler, RSSCrawler
+from tech_crawler.storage import Database
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+THRESHOLDS = os.path.join(os.path.dirname(__file__), "thresholds.json")
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+DEFAULT_ROWS = (1000,)
+INGEST_BATCH_SIZE = 1000
+SEARCH_QUERIES = ("nvidia", "cloud computing", '"machine learning"', "quant*", "semiconductor supply")
+
+
+def load_fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def _best_of(fn: Callable[[], int], repeat: int) -> Tuple[int, float]:
+    """Run fn repeat times; return its op count and the fastest time"""
+    best = None
+    ops = 0
+    for _ in range(repeat):
+        began = time.perf_counter()
+        ops = fn()
+        elapsed = time.perf_counter() - began
+        best = elapsed if best is None else min(best, elapsed)
+    return ops, best
+
+
+def _result(unit: str, ops: int, seconds: float) -> dict:
+    return {
+        "unit": unit,
+        "ops": ops,
+        "seconds": round(seconds, 6),
+        "rate": round(ops / seconds, 2) if seconds > 0 else None,
+    }
+
+
+def bench_feed_parse(name: str, repeat: int, copies: int = 50) -> dict:
+    """feedparser plus RSSCrawler.parse over a recorded feed, without full-content fetches"""
+    data = load_fixture(name)
+
+    def run():
+        parsed = 0
+        for _ in range(copies):
+            crawler = RSSCrawler("Benchmark", "https://news.example.com/feed")
+            crawler.feed_data = feedparser.parse(data)
+            with mock.patch.object(crawler, "fetch_full_content", return_value=None):
+                parsed += len(crawler.parse())
+        return parsed
+
+    return _result("articles/s", *_best_of(run, repeat))
+
+
+def bench_html_parse(repeat: int, copies: int = 50) -> dict:
+    """HTMLCrawler.parse over a recorded listing page"""
+    page = load_fixture("listing.html")
+
+    def run():
+        parsed = 0
+        for _ in range(copies):
+            crawler = HTMLCrawler("Benchmark", "https://news.example.com/")
+            crawler.html_content = page
+            with mock.patch.object(crawler, "fetch_full_content", return_value=None):
+                parsed += len(crawler.parse())
+        return parsed
+
+    return _result("articles/s", *_best_of(run, repeat))
+
+
+def bench_extract_content(repeat: int, copies: int = 200) -> dict:
+    """BaseCrawler.extract_content over a recorded article page"""
+    page = load_fixture("article.html")
+
+    def run():
+        for _ in range(copies):
+            BaseCrawler.extract_content(page)
+        return copies
+
+    return _result("pages/s", *_best_of(run, repeat))
+
+
+def fixture_articles() -> List[dict]:
+    """Articles as the RSS crawler produces them from the recorded feed"""
+    crawler = RSSCrawler("Benchmark", "https://news.example.com/feed")
+    crawler.feed_data = feedparser.parse(load_fixture("feed.rss"))
+    content = BaseCrawler.extract_content(load_fixture("article.html"))
+    with mock.patch.object(crawler, "fetch_full_content", return_value=content):
+        return crawler.parse()
+
+
+def bench_analyze(repeat: int, count: int = 1000) -> dict:
+    """ArticleAnalyzer.batch_analyze over fixture articles"""
+    base = fixture_articles()
+    articles = [dict(base[i % len(base)]) for i in range(count)]
+    analyzer = ArticleAnalyzer()
+
+    def run():
+        analyzer.batch_analyze([dict(a) for a in articles])
+        return count
+
+    return _result("articles/s", *_best_of(run, repeat))
+
+
+def generate_articles(total: int) -> Iterator[List[dict]]:
+    """Yield batches of analyzed, unique articles built from the fixtures"""
+    base = ArticleAnalyzer().batch_analyze(fixture_articles())
+    start = datetime.now(timezone.utc)
+    for offset in range(0, total, INGEST_BATCH_SIZE):
+        batch = []
+        for i in range(offset, min(offset + INGEST_BATCH_SIZE, total)):
+            article = dict(base[i % len(base)])
+            article["url"] = f"{article['url']}?n={i}"
+            article["title"] = f"{article['title']} ({i})"
+            article["source"] = f"Source {i % 12}"
+            article["published_date"] = start - timedelta(minutes=i)
+            batch.append(article)
+        yield batch
+
+
+def bench_database(rows: int, queries: int = 50) -> Dict[str, dict]:
+    """Database.add_articles_batch into an empty database, then search_articles over it"""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = Database(f"sqlite:///{os.path.join(tmpdir, 'bench.db')}")
+        try:
+            began = time.perf_counter()
+            inserted = 0
+            for batch in generate_articles(rows):
+                inserted += db.add_articles_batch(batch)
+            results[f"ingest_{rows}"] = _result("rows/s", inserted, time.perf_counter() - began)
+
+            def run():
+                for i in range(queries):
+                    db.search_articles(SEARCH_QUERIES[i % len(SEARCH_QUERIES)], limit=20)
+                return queries
+
+            results[f"search_{rows}"] = _result("queries/s", *_best_of(run, 3))
+            results[f"search_{rows}"]["backend"] = db.search_index.name
+        finally:
+            db.close()
+    return results
+
+
+def run_benchmarks(rows=DEFAULT_ROWS, repeat: int = 3, only: Optional[List[str]] = None) -> dict:
+    """
+    Run the suite.
+
+    Args:
+        rows: Database sizes to ingest and search
+        repeat: Runs per micro-benchmark; the fastest is kept
+        only: Run only benchmarks whose name starts with one of these
+
+    Returns:
+        dict with run metadata and a result per benchmark
+    """
+    def wanted(name):
+        return not only or any(name.startswith(prefix) for prefix in only)
+
+    results = {}
+    if wanted("rss_parse"):
+        results["rss_parse"] = bench_feed_parse("feed.rss", repeat)
+    if wanted("atom_parse"):
+        results["atom_parse"] = bench_feed_parse("feed.atom", repeat)
+    if wanted("html_parse"):
+        results["html_parse"] = bench_html_parse(repeat)
+    if wanted("extract_content"):
+        results["extract_content"] = bench_extract_content(repeat)
+    if wanted("analyze"):
+        results["analyze"] = bench_analyze(repeat)
+    for size in rows:
+        if wanted("ingest") or wanted("search"):
+            results.update(bench_database(size))
+
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def load_thresholds(path: str = THRESHOLDS) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(current: dict, baseline: dict, thresholds: dict) -> List[str]:
+    """
+    Compare two result sets.
+
+    Returns:
+        One message per benchmark whose rate fell by more than its
+        threshold (a fraction of the baseline rate)
+    """
+    regressions = []
+    default = thresholds.get("default", 0.2)
+    for name, result in current["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if not before or not before.get("rate") or not result.get("rate"):
+            continue
+        allowed = thresholds.get("benchmarks", {}).get(name, default)
+        change = result["rate"] / before["rate"] - 1
+        if change < -allowed:
+            regressions.append(
+                f"{name}: {result['rate']} {result['unit']} vs {before['rate']} "
+                f"({change:+.1%}, allowed -{allowed:.0%})"
+            )
+    return regressions
+
+
+def main(argv=None) -> int:
+    """Run the benchmark suite from the command line"""
+    parser = argparse.ArgumentParser(description="Offline throughput benchmarks")
+    parser.add_argument("--rows", default=",".join(str(r) for r in DEFAULT_ROWS),
+                        help="comma separated database sizes, e.g. 1000,100000,1000000")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", help="comma separated benchmark name prefixes")
+    parser.add_argument("--output", help="write results JSON to this file")
+    parser.add_argument("--compare", nargs="?", const=BASELINE,
+                        help="baseline results JSON to check for regressions "
+                             "(benchmarks/baseline.json when given without a path)")
+    parser.add_argument("--thresholds", default=THRESHOLDS)
+    args = parser.parse_args(argv)
+
+    # Crawlers and the database log every article at INFO
+    logging.basicConfig(level=logging.WARNING)
+
+    report = run_benchmarks(
+        rows=[int(r) for r in args.rows.split(",") if r],
+        repeat=args.repeat,
+        only=args.only.split(",") if args.only else None,
+    )
+    for name, result in report["results"].items():
+        rate = f"{result['rate']:>14,.1f}" if result["rate"] is not None else f"{'n/a':>14}"
+        print(f"{name:<24} {rate} {result['unit']}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, load_thresholds(args.thresholds))
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""
+Gunicorn configuration for the web interface.
+
+Run with:
+    gunicorn -c gunicorn.conf.py tech_crawler.web.wsgi:app
+
+The app is created once in the master and forked into the workers.
+Send HUP to the master to gracefully replace the workers; since the app is
+preloaded, deploying new code needs a restart (or USR2 + WINCH).
+"""
+
+import glob
+import os
+
+from tech_crawler.config import Settings
+
+if Settings.WEB_WORKER_CLASS == "gevent":
+    # Patch before the preloaded app creates its locks and thread-locals.
+    # The worker's own patching comes after the fork, too late for those:
+    # the request-scoped session would be shared by every greenlet.
+    from gevent import monkey
+    monkey.patch_all()
+
+# Workers write their metric samples to files in this directory and /metrics
+# sums them (prometheus_client multiprocess mode). It must be set before the
+# app imports prometheus_client, and files left by earlier workers would be
+# counted again, so they are removed whenever gunicorn (re)loads this file.
+# Only prometheus_client's own files (counter_<pid>.db and the like) go: the
+# variable may name a directory shared with other data, SQLite included.
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", Settings.WEB_METRICS_DIR)
+metrics_dir = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+os.makedirs(metrics_dir, exist_ok=True)
+for kind in ("counter", "gauge", "histogram", "summary"):
+    for stale in glob.glob(os.path.join(metrics_dir, f"{kind}_*.db")):
+        os.remove(stale)
+
+bind = f"{Settings.WEB_HOST}:{Settings.WEB_PORT}"
+workers = Settings.WEB_WORKERS
+# Every /articles tab keeps an /api/stream connection open. Under gevent (the
+# docker-compose default) each one is a greenlet and STREAM_MAX_CLIENTS alone
+# caps them. Under gthread each one holds a thread for as long as the tab stays
+# open, so the app accepts at most WEB_THREADS // 2 streams per worker
+# (Settings.stream_client_limit) to keep threads free for /api/* and /metrics;
+# refused tabs get 503 and retry with backoff.
+threads = Settings.WEB_THREADS
+worker_class = Settings.WEB_WORKER_CLASS
+timeout = Settings.WEB_TIMEOUT
+graceful_timeout = Settings.WEB_GRACEFUL_TIMEOUT
+keepalive = 5
+
+# Build the app (and run database setup) once instead of in every worker
+preload_app = True
+
+accesslog = "-"
+errorlog = "-"
+loglevel = "debug" if Settings.DEBUG else "info"
+
+
+def post_fork(server, worker):
+    """Give each worker its own connection pool"""
+    app = server.app.wsgi()
+    # Connections opened in the master during preload must not be shared;
+    # close=False leaves them for the master instead of closing its sockets
+    app.extensions["database"].engine.dispose(close=False)
+    server.log.info(f"Worker {worker.pid} reset its database pool")
+
+
+def child_exit(server, worker):
+    """Drop the exited worker's live gauges from /metrics"""
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
@@ -3,13 +3,18 @@
 import logging
 import sys
 import time
+from collections import Counter
+from datetime import datetime, timezone
 from typing import List
 
 from tech_crawler.config import Settings
 from tech_crawler.crawlers import RSSCrawler, HTMLCrawler
-from tech_crawler.storage import Database
-from tech_crawler.analysis import ArticleAnalyzer
+from tech_crawler.storage import Database, IngestQueue
+from tech_crawler.analysis import ArticleAnalyzer, DailySummaryCache
 from tech_crawler.blog import BlogPublisher
+from tech_crawler.metrics import (
+    CRAWL_ARTICLES, CRAWL_LAST_RUN, CRAWL_RUN_SECONDS, CRAWL_STAGE_SECONDS, write_textfile,
+)
 
 # Configure logging
 logging.basicConfig(
@@ -26,7 +31,7 @@ class TechInvestmentCrawler:
         """Initialize crawler with all components"""
         self.db = Database()
         self.analyzer = ArticleAnalyzer()
-        self.publisher = BlogPublisher()
+        self.publisher = BlogPublisher(self.db)
         self.crawlers = []
         self._init_crawlers()
 
@@ -63,54 +68,144 @@ class TechInvestmentCrawler:
             "total_articles": 0,
             "relevant_articles": 0,
             "sources_crawled": 0,
+            "not_modified": 0,
             "errors": 0,
         }
 
-        for crawler in self.crawlers:
-            try:
-                logger.info(f"Crawling {crawler.source_name}...")
+        started = time.perf_counter()
+        run_started_at = datetime.now(timezone.utc)
+
+        # A single writer thread commits what the crawlers enqueue
+        ingest = IngestQueue(self.db).start() if save_to_db else None
+
+        source_runs = [
+            self._crawl_source(crawler, ingest, analyze, stats)
+            for crawler in self.crawlers
+        ]
+
+        # Flush pending writes before reporting
+        if ingest:
+            ingest.close()
+            stats["new_articles"] = ingest.stats["added"]
+            stats["errors"] += ingest.stats["errors"]
+            # Precompute the dashboard summary so page views never have to
+            DailySummaryCache(self.db).refresh()
+
+        duration = time.perf_counter() - started
+        CRAWL_RUN_SECONDS.set(duration)
+        CRAWL_LAST_RUN.set(time.time())
+
+        if save_to_db:
+            for outcome in source_runs:
+                counts = ingest.source_stats.get(outcome["source"], Counter())
+                outcome["new_articles"] = counts["added"]
+                outcome["updated_articles"] = counts["updated"]
+                outcome["skipped_articles"] = (
+                    counts["skipped"] + outcome["articles_parsed"] - outcome["articles_relevant"]
+                )
+                if counts["errors"]:
+                    outcome["errors"] += counts["errors"]
+                    outcome["error"] = outcome["error"] or f"db_commit: {counts['errors']} articles not stored"
+            stats["run_id"] = self.db.record_crawl_run(
+                {
+                    "started_at": run_started_at,
+                    "finished_at": datetime.now(timezone.utc),
+                    "duration_seconds": round(duration, 3),
+                    "sources_crawled": stats["sources_crawled"],
+                    "not_modified": stats["not_modified"],
+                    "total_articles": stats["total_articles"],
+                    "relevant_articles": stats["relevant_articles"],
+                    "new_articles": stats.get("new_articles", 0),
+                    "errors": stats["errors"],
+                },
+                source_runs,
+            )
 
-                # Fetch and parse
-                if not crawler.fetch():
-                    logger.warning(f"Failed to fetch from {crawler.source_name}")
-                    stats["errors"] += 1
-                    continue
+        # Log summary
+        logger.info(
+            f"Crawl complete - Total: {stats['total_articles']}, "
+            f"Relevant: {stats['relevant_articles']}, "
+            f"Sources: {stats['sources_crawled']} ({stats['not_modified']} unchanged), "
+            f"Errors: {stats['errors']}"
+        )
+
+        return stats
+
+    def _crawl_source(self, crawler, ingest, analyze: bool, stats: dict) -> dict:
+        """
+        Fetch, parse and analyze one source, enqueueing relevant articles.
+
+        Returns:
+            dict: The source's outcome for the crawl history
+        """
+        crawler.start_run()
+        outcome = {
+            "source": crawler.source_name,
+            "started_at": datetime.now(timezone.utc),
+            "articles_parsed": 0,
+            "articles_relevant": 0,
+        }
+        began = time.perf_counter()
+        fetched = False
+
+        try:
+            logger.info(f"Crawling {crawler.source_name}...")
 
+            # Fetch and parse
+            if not crawler.fetch():
+                logger.warning(f"Failed to fetch from {crawler.source_name}")
+                stats["errors"] += 1
+                if not crawler.errors:
+                    crawler.errors = 1
+                    crawler.last_error = "fetch: no entries"
+            elif crawler.not_modified:
+                stats["not_modified"] += 1
+                stats["sources_crawled"] += 1
+            else:
                 articles = crawler.parse()
                 stats["total_articles"] += len(articles)
+                outcome["articles_parsed"] = len(articles)
+                CRAWL_ARTICLES.labels(source=crawler.source_name, outcome="parsed").inc(len(articles))
 
                 # Analyze if requested
                 if analyze:
-                    articles = self.analyzer.batch_analyze(articles)
+                    with CRAWL_STAGE_SECONDS.labels(source=crawler.source_name, stage="analyze").time():
+                        articles = self.analyzer.batch_analyze(articles)
                     relevant = [a for a in articles if a.get("is_relevant", False)]
                     stats["relevant_articles"] += len(relevant)
                 else:
                     relevant = articles
+                outcome["articles_relevant"] = len(relevant)
+                CRAWL_ARTICLES.labels(source=crawler.source_name, outcome="relevant").inc(len(relevant))
 
                 # Save to database if requested
-                if save_to_db:
-                    self.db.add_articles_batch(relevant)
+                if ingest:
+                    ingest.put_many(relevant)
 
                 stats["sources_crawled"] += 1
+                fetched = True
 
-                # Rate limiting
-                time.sleep(Settings.RATE_LIMIT_DELAY)
+        except Exception as e:
+            logger.error(
+                f"Error crawling {crawler.source_name}: {str(e)}"
+            )
+            stats["errors"] += 1
+            crawler.record_error("crawl", e)
 
-            except Exception as e:
-                logger.error(
-                    f"Error crawling {crawler.source_name}: {str(e)}"
-                )
-                stats["errors"] += 1
+        outcome.update({
+            "duration_seconds": round(time.perf_counter() - began, 3),
+            "http_status": crawler.http_status,
+            "not_modified": crawler.not_modified,
+            "bytes_downloaded": crawler.bytes_downloaded,
+            "errors": crawler.errors,
+            "error": crawler.last_error,
+        })
 
-        # Log summary
-        logger.info(
-            f"Crawl complete - Total: {stats['total_articles']}, "
-            f"Relevant: {stats['relevant_articles']}, "
-            f"Sources: {stats['sources_crawled']}, "
-            f"Errors: {stats['errors']}"
-        )
+        # Rate limiting
+        if fetched:
+            time.sleep(Settings.RATE_LIMIT_DELAY)
 
-        return stats
+        return outcome
 
     def search_articles(self, keyword: str, limit: int = 20) -> List[dict]:
         """Search articles by keyword"""
@@ -138,8 +233,10 @@ def main():
     """Main execution function"""
     logger.info(f"Starting {Settings.APP_NAME} v{Settings.APP_VERSION}")
 
+    crawler = None
     try:
         crawler = TechInvestmentCrawler()
+        crawler.db.migrate_legacy_content()
 
         # Run crawl
         stats = crawler.run_crawl(save_to_db=True, analyze=True)
@@ -156,6 +253,15 @@ def main():
         stats = crawler.get_statistics()
         logger.info(f"Database statistics: {stats}")
 
+        # Move articles past the retention window to the archive
+        if Settings.ARCHIVE_AFTER_DAYS > 0:
+            crawler.db.archive_articles()
+        crawler.db.prune_article_events()
+        crawler.db.prune_crawl_runs()
+
+        if Settings.METRICS_TEXTFILE:
+            write_textfile(Settings.METRICS_TEXTFILE)
+
         logger.info("Crawler execution completed successfully")
         return 0
 
@@ -163,6 +269,10 @@ def main():
         logger.error(f"Fatal error: {str(e)}")
         return 1
 
+    finally:
+        if crawler is not None:
+            crawler.db.close()
+
 
 if __name__ == "__main__":
     sys.exit(main())
@@ -15,5 +15,15 @@ setup(
         "aiohttp>=3.9.1",
         "sqlalchemy>=2.0.23",
         "python-dotenv>=1.0.0",
+        "prometheus_client>=0.17.0",
+        "numpy>=1.26.4",
     ],
+    extras_require={
+        "web": [
+            "flask>=3.0.0",
+            "orjson>=3.8.3",
+            "gunicorn>=21.2.0; platform_system != 'Windows'",
+            "gevent>=23.9.1; platform_system != 'Windows'",
+        ],
+    },
 )
@@ -1,5 +1,7 @@
 """Analysis module for article classification and insights"""
 
 from .analyzer import ArticleAnalyzer
+from .summary import DailySummaryCache, build_daily_summary
+from .trends import build_series, series_start
 
-__all__ = ["ArticleAnalyzer"]
+__all__ = ["ArticleAnalyzer", "DailySummaryCache", "build_daily_summary", "build_series", "series_start"]
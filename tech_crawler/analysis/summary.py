@@ -0,0 +1,136 @@
+"""Daily dashboard summary, computed once and served from cache"""
+
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from datetime import date, datetime, timezone
+from typing import Iterable, Optional, Tuple
+
+from ..config import Settings
+
+logger = logging.getLogger(__name__)
+
+STOPWORDS = frozenset({
+    "about", "after", "against", "among", "amongst", "because", "before",
+    "being", "between", "could", "during", "first", "other", "should",
+    "since", "their", "there", "these", "those", "through", "under",
+    "using", "where", "which", "while", "within", "without", "would",
+})
+
+_WORD_PATTERN = re.compile(r"\b\w{5,}\b")
+
+
+def build_daily_summary(rollup: dict, texts: Iterable[Tuple[str, str]]) -> dict:
+    """
+    Build the dashboard summary for one day.
+
+    Args:
+        rollup: Counters from Database.get_daily_rollup
+        texts: (title, summary) pairs of the day's articles, for keywords
+
+    Returns:
+        dict: summary and narrative HTML plus the topics covered
+    """
+    source_counts = rollup["sources"]
+    tag_counts = rollup["tags"]
+    company_counts = rollup["companies"]
+    article_count = sum(source_counts.values())
+
+    summary = f"<b>{article_count}</b> articles crawled today from <b>{len(source_counts)}</b> sources."
+    if not article_count:
+        return {
+            "summary": summary,
+            "narrative": "No articles crawled today.",
+            "topics_covered": [],
+            "article_count": 0,
+        }
+
+    top_sources = ', '.join(f"{src} ({cnt})" for src, cnt in source_counts.most_common(3))
+    top_tags = ', '.join(f"{tag} ({cnt})" for tag, cnt in tag_counts.most_common(3))
+    summary += f" Top sources: {top_sources}."
+    if top_tags:
+        summary += f" Top tags: {top_tags}."
+
+    trend_counts = Counter({tag: cnt for tag, cnt in tag_counts.items() if tag not in company_counts})
+    top_company = company_counts.most_common(1)
+    top_trend = trend_counts.most_common(1)
+
+    word_counts = Counter()
+    for title, text in texts:
+        for word in _WORD_PATTERN.findall(f"{title or ''} {text or ''}"):
+            word = word.lower()
+            if word not in STOPWORDS:
+                word_counts[word] += 1
+    top_words = ', '.join(w for w, _ in word_counts.most_common(3))
+
+    narrative = "<b>Today's articles</b> covered topics such as "
+    if top_trend:
+        narrative += f"<b>{top_trend[0][0].replace('_', ' ').title()}</b>"
+    if top_company:
+        narrative += f", with frequent mentions of <b>{top_company[0][0]}</b>"
+    if top_words:
+        narrative += f", and discussed keywords like <b>{top_words}</b>"
+    narrative += "."
+
+    return {
+        "summary": summary,
+        "narrative": narrative,
+        "topics_covered": [tag for tag, _ in tag_counts.most_common(10)],
+        "article_count": article_count,
+    }
+
+
+class DailySummaryCache:
+    """
+    Serves the daily summary without recomputing it per page view.
+
+    The crawler calls refresh() after each ingest run and the result is
+    stored in the database. Readers use the stored copy while it matches
+    the current ingest generation, or while it is younger than the TTL,
+    and keep it in memory between checks, so rendering the dashboard does
+    not depend on how many articles arrived today.
+    """
+
+    def __init__(self, db, ttl: Optional[float] = None):
+        """Initialize cache over a Database"""
+        self.db = db
+        self.ttl = Settings.SUMMARY_TTL if ttl is None else ttl
+        self._memory = None  # (day, generation, payload, valid_until)
+        self._lock = threading.Lock()
+
+    def refresh(self, day: Optional[date] = None) -> dict:
+        """Compute the summary for a day and store it"""
+        day = day or datetime.now(timezone.utc).date()
+        generation = self.db.get_ingest_state()[0]
+        payload = build_daily_summary(
+            self.db.get_daily_rollup(day),
+            self.db.get_day_texts(day),
+        )
+        self.db.save_daily_summary(day, generation, payload)
+        with self._lock:
+            self._memory = (day, generation, payload, time.time() + self.ttl)
+        logger.debug(f"Refreshed daily summary for {day} at generation {generation}")
+        return payload
+
+    def get(self, day: Optional[date] = None) -> dict:
+        """Return the summary for a day, computing it only when stale"""
+        day = day or datetime.now(timezone.utc).date()
+        generation = self.db.get_ingest_state()[0]
+        now = time.time()
+
+        with self._lock:
+            memory = self._memory
+        if memory and memory[0] == day and (memory[1] == generation or now < memory[3]):
+            return memory[2]
+
+        stored = self.db.get_daily_summary(day)
+        if stored is not None:
+            computed_at = stored["computed_at"].replace(tzinfo=timezone.utc).timestamp()
+            if stored["generation"] == generation or now - computed_at < self.ttl:
+                with self._lock:
+                    self._memory = (day, stored["generation"], stored["payload"], computed_at + self.ttl)
+                return stored["payload"]
+
+        return self.refresh(day)
@@ -0,0 +1,120 @@
+"""Mention volume time series computed from the daily tag rollups"""
+
+import logging
+from datetime import date, timedelta
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+INTERVALS = ("day", "week")
+# Trailing buckets used for moving averages and spike baselines
+DEFAULT_WINDOWS = {"day": 7, "week": 4}
+
+
+def series_start(start: date, interval: str) -> date:
+    """First day of the bucket containing start (weeks start on Monday)"""
+    if interval == "week":
+        return start - timedelta(days=start.weekday())
+    return start
+
+
+def _trailing_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Mean of each value and up to window - 1 values before it"""
+    sums = np.cumsum(values)
+    sums[window:] = sums[window:] - sums[:-window]
+    counts = np.minimum(np.arange(1, len(values) + 1), window)
+    return sums / counts
+
+
+def _spikes(values: np.ndarray, window: int, threshold: float, min_count: int) -> np.ndarray:
+    """
+    Flag buckets far above the trailing baseline.
+
+    The baseline is the mean and standard deviation of the previous
+    ``window`` buckets, excluding the bucket itself.
+    """
+    n = len(values)
+    padded = np.concatenate(([0.0], values))
+    sums = np.cumsum(padded)
+    squares = np.cumsum(padded ** 2)
+
+    index = np.arange(n)
+    start = np.maximum(index - window, 0)
+    counts = index - start
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = (sums[index] - sums[start]) / counts
+        variance = (squares[index] - squares[start]) / counts - mean ** 2
+    std = np.sqrt(np.clip(np.nan_to_num(variance), 0, None))
+    mean = np.nan_to_num(mean)
+
+    # Require a full baseline so the first buckets are never spikes
+    return (counts == window) & (values >= min_count) & (values > mean + threshold * np.maximum(std, 1.0))
+
+
+def build_series(
+    rows: Sequence[Tuple],
+    start: date,
+    end: date,
+    interval: str = "day",
+    window: Optional[int] = None,
+    threshold: float = 3.0,
+    min_count: int = 3,
+) -> List[dict]:
+    """
+    Bucket daily tag rollups into a dense time series.
+
+    Args:
+        rows: (day, article_count, relevance_sum, scored_count) tuples
+        start: First day of the series
+        end: Last day of the series (inclusive)
+        interval: "day" or "week" (weeks start on Monday)
+        window: Buckets in the moving average and spike baseline
+        threshold: Standard deviations above baseline that count as a spike
+        min_count: Smallest count that can be a spike
+
+    Returns:
+        List of bucket dicts, oldest first
+    """
+    if interval not in INTERVALS:
+        raise ValueError(f"Unknown interval: {interval}")
+    window = window or DEFAULT_WINDOWS[interval]
+
+    start = series_start(start, interval)
+    step = 7 if interval == "week" else 1
+    size = (end - start).days // step + 1
+    if size <= 0:
+        return []
+
+    if rows:
+        days = np.fromiter(((row[0] - start).days for row in rows), dtype=np.int64, count=len(rows))
+        data = np.array([row[1:] for row in rows], dtype=np.float64)
+        keep = (days >= 0) & (days < size * step)
+        buckets = days[keep] // step
+        counts = np.bincount(buckets, weights=data[keep, 0], minlength=size)
+        relevance = np.bincount(buckets, weights=data[keep, 1], minlength=size)
+        scored = np.bincount(buckets, weights=data[keep, 2], minlength=size)
+    else:
+        counts = np.zeros(size)
+        relevance = np.zeros(size)
+        scored = np.zeros(size)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        average_relevance = np.where(scored > 0, relevance / scored, np.nan)
+    moving_average = _trailing_mean(counts, window)
+    spikes = _spikes(counts, window, threshold, min_count)
+
+    bucket_starts = [start + timedelta(days=i * step) for i in range(size)]
+    return [
+        {
+            "start": bucket_start.isoformat(),
+            "count": int(count),
+            "avg_relevance": None if np.isnan(avg) else round(float(avg), 4),
+            "moving_average": round(float(ma), 3),
+            "spike": bool(spike),
+        }
+        for bucket_start, count, avg, ma, spike in zip(
+            bucket_starts, counts, average_relevance, moving_average, spikes
+        )
+    ]
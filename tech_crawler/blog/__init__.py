@@ -1,5 +1,7 @@
 """Blog module for publishing articles (future enhancement)"""
 
+from .digest import DigestBuilder, build_digest
+from .outbox import OutboxWorker
 from .publisher import BlogPublisher
 
-__all__ = ["BlogPublisher"]
+__all__ = ["BlogPublisher", "DigestBuilder", "OutboxWorker", "build_digest"]
@@ -0,0 +1,179 @@
+"""Top-article digests for blog summary posts"""
+
+import heapq
+import itertools
+import logging
+import os
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Dict, FrozenSet, Iterable, List, Optional
+
+from jinja2 import Environment, FileSystemLoader
+
+from ..analysis.summary import STOPWORDS
+from ..config import Settings
+
+logger = logging.getLogger(__name__)
+
+_TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), "templates")
+_WORD_PATTERN = re.compile(r"\w+")
+
+_environment = Environment(
+    loader=FileSystemLoader(_TEMPLATE_DIR),
+    trim_blocks=True,
+    lstrip_blocks=True,
+    keep_trailing_newline=True,
+)
+
+
+def _field(article, name: str):
+    """Read a field from an article dict or an ArticleSummary"""
+    if isinstance(article, dict):
+        return article.get(name)
+    return getattr(article, name, None)
+
+
+def title_words(title: Optional[str]) -> FrozenSet[str]:
+    """Significant lowercased words of a title, for duplicate detection"""
+    return frozenset(
+        word for word in _WORD_PATTERN.findall((title or "").lower())
+        if len(word) > 2 and word not in STOPWORDS
+    )
+
+
+def similarity(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """Jaccard similarity of two word sets"""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class _Candidate:
+    __slots__ = ("key", "source", "words", "article")
+
+    def __init__(self, key, source, words, article):
+        self.key = key  # (relevance, -arrival order); larger wins, earlier on ties
+        self.source = source
+        self.words = words
+        self.article = article
+
+    def __lt__(self, other):
+        return self.key < other.key
+
+
+class DigestBuilder:
+    """
+    Streaming top-K selection of articles by relevance.
+
+    Each source keeps a min-heap of at most per_source candidates, so
+    memory is bounded by the number of sources rather than the number of
+    articles fed in. An article whose title is a near duplicate of a kept
+    candidate replaces it only if it scores higher.
+    """
+
+    def __init__(
+        self,
+        top_k: Optional[int] = None,
+        per_source: Optional[int] = None,
+        duplicate_threshold: Optional[float] = None,
+    ):
+        """Initialize builder; unset limits come from Settings"""
+        self.top_k = top_k or Settings.DIGEST_TOP_K
+        self.per_source = min(per_source or Settings.DIGEST_PER_SOURCE or self.top_k, self.top_k)
+        self.duplicate_threshold = (
+            Settings.DIGEST_DUPLICATE_THRESHOLD if duplicate_threshold is None else duplicate_threshold
+        )
+        self.seen = 0
+        self._heaps: Dict[str, List[_Candidate]] = {}
+        self._order = itertools.count()
+
+    def _find_duplicate(self, words: FrozenSet[str]) -> Optional[_Candidate]:
+        for heap in self._heaps.values():
+            for candidate in heap:
+                if similarity(words, candidate.words) >= self.duplicate_threshold:
+                    return candidate
+        return None
+
+    def _remove(self, candidate: _Candidate) -> None:
+        heap = self._heaps[candidate.source]
+        heap.remove(candidate)
+        heapq.heapify(heap)
+
+    def add(self, article) -> bool:
+        """
+        Offer one article (a dict or an ArticleSummary).
+
+        Returns:
+            bool: True if it is currently among the candidates
+        """
+        self.seen += 1
+        key = (_field(article, "relevance_score") or 0.0, -next(self._order))
+        source = _field(article, "source") or "Unknown"
+        heap = self._heaps.setdefault(source, [])
+
+        # Most articles lose to the weakest kept one from their source;
+        # reject those before doing any text work
+        if len(heap) >= self.per_source and key <= heap[0].key:
+            return False
+
+        words = title_words(_field(article, "title"))
+        duplicate = self._find_duplicate(words)
+        if duplicate is not None:
+            if key <= duplicate.key:
+                return False
+            self._remove(duplicate)
+
+        if not isinstance(article, dict):
+            article = article.to_dict()
+        candidate = _Candidate(key, source, words, article)
+        if len(heap) >= self.per_source:
+            heapq.heapreplace(heap, candidate)
+        else:
+            heapq.heappush(heap, candidate)
+        return True
+
+    def extend(self, articles: Iterable) -> "DigestBuilder":
+        """Offer every article from an iterable, consuming it lazily"""
+        for article in articles:
+            self.add(article)
+        return self
+
+    def top(self) -> List[dict]:
+        """The selected articles, most relevant first"""
+        candidates = [candidate for heap in self._heaps.values() for candidate in heap]
+        return [candidate.article for candidate in heapq.nlargest(self.top_k, candidates)]
+
+
+def build_digest(
+    db,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    **options,
+) -> List[dict]:
+    """
+    Select the top articles published in a time window.
+
+    Args:
+        db: Database to stream articles from
+        since: Window start (default: DIGEST_DAYS ago)
+        until: Window end (default: now)
+        **options: DigestBuilder limits
+
+    Returns:
+        List of article dicts, most relevant first
+    """
+    if since is None:
+        since = datetime.now(timezone.utc) - timedelta(days=Settings.DIGEST_DAYS)
+    builder = DigestBuilder(**options).extend(db.iter_articles(since, until))
+    picked = builder.top()
+    logger.info(f"Digest picked {len(picked)} of {builder.seen} articles")
+    return picked
+
+
+def render_digest(articles: List[dict], title: str, generated_on: Optional[datetime] = None) -> str:
+    """Render selected articles as a Markdown summary post"""
+    return _environment.get_template("digest.md").render(
+        title=title,
+        articles=articles,
+        generated_on=generated_on or datetime.now(),
+    )
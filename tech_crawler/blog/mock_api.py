@@ -0,0 +1,150 @@
+"""
+Local stand-in for a blog API, for testing and measuring publishing.
+
+Run it with:
+    python -m tech_crawler.blog.mock_api --port 8081 --latency 0.05 --error-rate 0.1
+
+then point BLOG_API_URL at http://127.0.0.1:8081 with any BLOG_API_KEY.
+"""
+
+import argparse
+import itertools
+import logging
+import random
+import threading
+import time
+from typing import Optional
+
+from flask import Flask, jsonify, request
+from werkzeug.serving import make_server
+
+logger = logging.getLogger(__name__)
+
+
+class MockBlogAPI:
+    """
+    In-memory blog API with configurable latency and failures.
+
+    Posts are deduplicated on the Idempotency-Key header, like a real
+    API would, so retried requests do not create duplicate posts.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_every: int = 0,
+        retry_after: float = 1.0,
+        seed: Optional[int] = None,
+    ):
+        """
+        Args:
+            latency: Seconds to sleep per request
+            error_rate: Fraction of requests answered with 503
+            rate_limit_every: Answer every Nth request with 429 (0 disables)
+            retry_after: Retry-After seconds sent with 429 responses
+            seed: Random seed for reproducible failures
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self.posts = {}  # Idempotency-Key -> post
+        self.stats = {"requests": 0, "created": 0, "duplicates": 0, "rate_limited": 0, "errors": 0}
+        self._ids = itertools.count(1)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.app = self._create_app()
+        self._server = None
+        self._thread = None
+
+    def _create_app(self) -> Flask:
+        app = Flask(__name__)
+
+        @app.route("/articles", methods=["POST"])
+        def create_article():
+            with self._lock:
+                self.stats["requests"] += 1
+                count = self.stats["requests"]
+                fail = self._random.random() < self.error_rate
+
+            if not request.headers.get("Authorization", "").startswith("Bearer "):
+                return jsonify({"error": "Unauthorized"}), 401
+
+            if self.latency:
+                time.sleep(self.latency)
+
+            if self.rate_limit_every and count % self.rate_limit_every == 0:
+                with self._lock:
+                    self.stats["rate_limited"] += 1
+                response = jsonify({"error": "Too many requests"})
+                response.status_code = 429
+                response.headers["Retry-After"] = str(self.retry_after)
+                return response
+
+            if fail:
+                with self._lock:
+                    self.stats["errors"] += 1
+                return jsonify({"error": "Service unavailable"}), 503
+
+            payload = request.get_json(silent=True) or {}
+            key = request.headers.get("Idempotency-Key") or str(next(self._ids))
+            with self._lock:
+                existing = self.posts.get(key)
+                if existing is not None:
+                    self.stats["duplicates"] += 1
+                    return jsonify(existing), 200
+                post = {"id": next(self._ids), "title": payload.get("title", "")}
+                self.posts[key] = post
+                self.stats["created"] += 1
+            return jsonify(post), 201
+
+        return app
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server"""
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def start(self, port: int = 0) -> "MockBlogAPI":
+        """Serve in a background thread (port 0 picks a free port)"""
+        self._server = make_server("127.0.0.1", port, self.app, threaded=True)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Shut the server down"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server = None
+
+
+def main():
+    """Run the mock blog API from the command line"""
+    parser = argparse.ArgumentParser(description="Local stand-in blog API")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-every", type=int, default=0)
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    api = MockBlogAPI(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        rate_limit_every=args.rate_limit_every,
+        retry_after=args.retry_after,
+    ).start(args.port)
+    logger.info(f"Mock blog API listening on {api.url}")
+    try:
+        while True:
+            time.sleep(5)
+            logger.info(f"Mock blog API stats: {api.stats}")
+    except KeyboardInterrupt:
+        api.stop()
+
+
+if __name__ == "__main__":
+    main()
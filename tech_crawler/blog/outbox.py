@@ -0,0 +1,153 @@
+"""
+Drain worker for the blog publish outbox.
+
+The crawler only queues new articles in the publish_outbox table, in the
+same transaction that stores them. This worker posts them in batches, so
+publishing never slows the crawl and a restart resumes where it left off.
+
+Run it with:
+    python -m tech_crawler.blog.outbox          # poll until interrupted
+    python -m tech_crawler.blog.outbox --once   # drain what is due, then exit
+    python -m tech_crawler.blog.outbox --retry-failed --once   # requeue parked rows first
+
+Rows that fail BLOG_OUTBOX_MAX_ATTEMPTS times are parked as "failed" and
+only posted again after --retry-failed.
+
+Delivery is at-least-once: a worker that dies after posting but before
+removing the row posts again once the lease expires. The publish ledger
+and the Idempotency-Key header make that repeat a no-op, so in practice
+each article is posted once.
+"""
+
+import argparse
+import logging
+import threading
+from typing import Optional
+
+from ..config import Settings
+from .publisher import BlogPublisher
+
+logger = logging.getLogger(__name__)
+
+# Longest wait between retries of a failing row
+MAX_RETRY_DELAY = 6 * 3600
+
+
+class OutboxWorker:
+    """Publishes queued articles from the outbox in batches"""
+
+    def __init__(
+        self,
+        db,
+        publisher: Optional[BlogPublisher] = None,
+        batch_size: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+    ):
+        """Initialize worker over a Database"""
+        self.db = db
+        self.publisher = publisher or BlogPublisher(db)
+        self.batch_size = batch_size or Settings.BLOG_OUTBOX_BATCH_SIZE
+        self.poll_interval = Settings.BLOG_OUTBOX_POLL_INTERVAL if poll_interval is None else poll_interval
+        self.lease = Settings.BLOG_OUTBOX_LEASE
+        self.max_attempts = Settings.BLOG_OUTBOX_MAX_ATTEMPTS
+        self.stats = {"published": 0, "failed": 0}
+        self._stop = threading.Event()
+
+    def drain_once(self) -> int:
+        """
+        Claim and publish one batch of due articles.
+
+        Returns:
+            int: Number of rows claimed (0 when nothing is due)
+        """
+        claimed = self.db.claim_outbox(self.batch_size, self.lease)
+        if not claimed:
+            return 0
+
+        outbox_ids = [outbox_id for outbox_id, _ in claimed]
+        results = self.publisher.publish_many([article for _, article in claimed])
+
+        done = [outbox_id for outbox_id, ok in zip(outbox_ids, results) if ok]
+        failed = [outbox_id for outbox_id, ok in zip(outbox_ids, results) if not ok]
+        self.db.complete_outbox(done)
+        self.db.defer_outbox(
+            failed,
+            Settings.BLOG_OUTBOX_RETRY_DELAY,
+            MAX_RETRY_DELAY,
+            self.max_attempts,
+            error="publish failed",
+        )
+
+        self.stats["published"] += len(done)
+        self.stats["failed"] += len(failed)
+        logger.info(f"Outbox batch: {len(done)} published, {len(failed)} deferred")
+        return len(claimed)
+
+    def drain(self) -> int:
+        """
+        Publish batches until nothing is due.
+
+        Returns:
+            int: Number of rows claimed in total
+        """
+        total = 0
+        while not self._stop.is_set():
+            claimed = self.drain_once()
+            total += claimed
+            if claimed < self.batch_size:
+                break
+        return total
+
+    def run_forever(self) -> None:
+        """Drain the outbox, then poll for new rows until stopped"""
+        if not self.publisher._is_configured():
+            logger.warning("Blog publishing is not configured (BLOG_ENABLED/BLOG_API_URL); outbox worker exiting")
+            return
+
+        logger.info("Publish outbox worker started")
+        while not self._stop.is_set():
+            try:
+                self.drain()
+            except Exception as e:
+                logger.error(f"Error draining publish outbox: {str(e)}")
+            self._stop.wait(self.poll_interval)
+
+    def stop(self) -> None:
+        """Ask run_forever to return after the current batch"""
+        self._stop.set()
+
+
+def main():
+    """Run the outbox drain worker from the command line"""
+    from ..storage import Database
+
+    parser = argparse.ArgumentParser(description="Publish queued articles to the blog")
+    parser.add_argument("--once", action="store_true", help="drain what is due, then exit")
+    parser.add_argument("--retry-failed", action="store_true",
+                        help="requeue rows parked after BLOG_OUTBOX_MAX_ATTEMPTS failures first")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO if not Settings.DEBUG else logging.DEBUG,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    db = Database()
+    worker = OutboxWorker(db)
+    try:
+        if args.retry_failed:
+            db.requeue_failed_outbox()
+        if args.once:
+            if worker.publisher._is_configured():
+                worker.drain()
+        else:
+            worker.run_forever()
+    except KeyboardInterrupt:
+        worker.stop()
+    finally:
+        logger.info(f"Outbox worker stats: {worker.stats}, backlog: {db.get_outbox_counts()}")
+        worker.publisher.close()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
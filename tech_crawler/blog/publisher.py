@@ -1,64 +1,193 @@
-"""Blog publisher for sharing articles (future implementation)"""
+"""Blog publisher for sharing articles"""
 
+import hashlib
 import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Iterable, List, Optional, Tuple
+
 import requests
-from typing import Dict, List, Optional
+from requests.adapters import HTTPAdapter
 
 from ..config import Settings
+from .digest import DigestBuilder, build_digest, render_digest
 
 logger = logging.getLogger(__name__)
 
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def idempotency_key(article: dict) -> str:
+    """
+    Stable key for an article so the blog API can drop repeated posts.
+
+    Posts without a URL (summary posts) are keyed by their rendered content
+    as well as title and date, so each week's summary is a new post while a
+    retry of the same one is still dropped.
+    """
+    identity = article.get("url")
+    if not identity:
+        content = article.get("content") or article.get("summary") or ""
+        identity = "|".join([
+            article.get("title", ""),
+            str(article.get("published_date", "")),
+            hashlib.sha256(content.encode("utf-8")).hexdigest(),
+        ])
+    return hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+
+def retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds or as an HTTP date"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
 
 class BlogPublisher:
     """
     Publisher for blog articles.
-    
-    This is a placeholder for future integration with a blog platform.
-    Can be extended to support various blog APIs (WordPress, Medium, Ghost, etc.)
+
+    Posts go through one pooled HTTP session. Batches are published
+    concurrently, transient failures (429/5xx, connection errors) are
+    retried with backoff, and when a Database is given, published URLs
+    are recorded in a ledger so re-running a batch skips them.
     """
 
-    def __init__(self):
+    def __init__(self, db=None, session: Optional[requests.Session] = None):
         """Initialize blog publisher"""
         self.enabled = Settings.BLOG_ENABLED
         self.api_url = Settings.BLOG_API_URL
         self.api_key = Settings.BLOG_API_KEY
+        self.db = db
+        self.concurrency = max(1, Settings.BLOG_CONCURRENCY)
+        self.timeout = Settings.BLOG_TIMEOUT
+        self.max_retries = Settings.BLOG_MAX_RETRIES
+        self._session = session
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        """HTTP session shared by all posts, created on first use"""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(
+                        pool_connections=1,
+                        pool_maxsize=self.concurrency,
+                    )
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    session.headers.update({
+                        "Authorization": f"Bearer {self.api_key}",
+                        "Content-Type": "application/json",
+                    })
+                    self._session = session
+        return self._session
+
+    def close(self) -> None:
+        """Release pooled connections"""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def _is_configured(self) -> bool:
+        if not self.enabled:
+            logger.info("Blog publishing is not enabled")
+            return False
+
+        if not self.api_url or not self.api_key:
+            logger.warning("Blog API credentials not configured")
+            return False
+
+        return True
+
+    def _backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Delay before the next attempt: Retry-After if given, else jittered exponential"""
+        if retry_after is not None:
+            return min(retry_after, Settings.BLOG_BACKOFF_MAX)
+        delay = Settings.BLOG_BACKOFF_BASE * (2 ** attempt)
+        return min(delay, Settings.BLOG_BACKOFF_MAX) * random.uniform(0.5, 1.0)
+
+    def _post(self, path: str, payload: dict, key: str) -> Optional[requests.Response]:
+        """
+        POST with retries on transient failures.
+
+        Returns:
+            The final response, or None if every attempt failed to connect
+        """
+        response = None
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            try:
+                response = self.session.post(
+                    f"{self.api_url}{path}",
+                    json=payload,
+                    headers={"Idempotency-Key": key},
+                    timeout=self.timeout,
+                )
+                if response.status_code not in RETRY_STATUSES:
+                    return response
+                retry_after = retry_after_seconds(response.headers.get("Retry-After"))
+                reason = f"status {response.status_code}"
+            except (requests.ConnectionError, requests.Timeout) as e:
+                response = None
+                reason = str(e)
+
+            if attempt < self.max_retries:
+                delay = self._backoff(attempt, retry_after)
+                logger.warning(f"Blog post failed ({reason}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+        return response
 
     def publish_article(self, article: dict) -> bool:
         """
         Publish article to blog.
-        
+
         Args:
             article: Article data with title, content, etc.
-            
+
         Returns:
-            bool: True if published successfully
+            bool: True if published successfully (or already published)
         """
-        if not self.enabled:
-            logger.info("Blog publishing is not enabled")
+        if not self._is_configured():
             return False
 
-        if not self.api_url or not self.api_key:
-            logger.warning("Blog API credentials not configured")
-            return False
+        url = article.get("url")
+        if url and self.db is not None and self.db.get_published_urls([url]):
+            logger.debug(f"Already published: {url}")
+            return True
+
+        return self._publish(article)
 
+    def _publish(self, article: dict) -> bool:
         try:
             # Prepare article payload
             payload = self._prepare_payload(article)
-            
-            # Post to blog API
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-            }
-            
-            response = requests.post(
-                f"{self.api_url}/articles",
-                json=payload,
-                headers=headers,
-                timeout=30,
-            )
-            
+            response = self._post("/articles", payload, idempotency_key(article))
+
+            if response is None:
+                logger.error(f"Failed to publish article: {article.get('title', '')}")
+                return False
+
             if response.status_code in [200, 201]:
+                if article.get("url") and self.db is not None:
+                    self.db.record_published(article["url"], self._remote_id(response))
                 logger.info(f"Published article: {article['title']}")
                 return True
             else:
@@ -73,75 +202,148 @@ class BlogPublisher:
             logger.error(f"Error publishing article: {str(e)}")
             return False
 
+    @staticmethod
+    def _remote_id(response: requests.Response) -> Optional[str]:
+        try:
+            remote_id = response.json().get("id")
+        except ValueError:
+            return None
+        return str(remote_id) if remote_id is not None else None
+
+    def _select_pending(self, articles: List[dict]) -> Tuple[List[dict], set]:
+        """
+        Drop repeated URLs and URLs already in the ledger.
+
+        Returns:
+            (articles still to post, URLs already published)
+        """
+        pending = []
+        seen = set()
+        for article in articles:
+            url = article.get("url")
+            if url:
+                if url in seen:
+                    continue
+                seen.add(url)
+            pending.append(article)
+
+        published = set()
+        if self.db is not None:
+            published = self.db.get_published_urls(list(seen))
+            pending = [a for a in pending if a.get("url") not in published]
+        return pending, published
+
+    def _publish_concurrently(self, articles: List[dict]) -> List[bool]:
+        if not articles:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(articles))) as pool:
+            return list(pool.map(self._publish, articles))
+
     def publish_articles_batch(self, articles: List[dict]) -> int:
         """
-        Publish multiple articles.
-        
+        Publish multiple articles concurrently.
+
+        Articles already in the ledger, and repeated URLs within the batch,
+        are skipped.
+
         Args:
             articles: List of article data
-            
+
         Returns:
-            int: Number of successfully published articles
+            int: Number of articles newly published
         """
-        published_count = 0
-        
-        for article in articles:
-            if self.publish_article(article):
-                published_count += 1
-        
-        logger.info(f"Published {published_count}/{len(articles)} articles")
+        if not articles or not self._is_configured():
+            return 0
+
+        pending, _ = self._select_pending(articles)
+        if not pending:
+            logger.info(f"All {len(articles)} articles already published")
+            return 0
+
+        published_count = sum(self._publish_concurrently(pending))
+        logger.info(
+            f"Published {published_count}/{len(pending)} articles "
+            f"({len(articles) - len(pending)} skipped)"
+        )
         return published_count
 
+    def publish_many(self, articles: List[dict]) -> List[bool]:
+        """
+        Publish multiple articles concurrently and report each outcome.
+
+        Returns:
+            List of bools in input order; True if the article is now
+            published, including articles that already were
+        """
+        if not articles:
+            return []
+        if not self._is_configured():
+            return [False] * len(articles)
+
+        pending, already_published = self._select_pending(articles)
+        results = self._publish_concurrently(pending)
+        published_urls = set(already_published)
+        outcomes = {}
+        for article, ok in zip(pending, results):
+            outcomes[id(article)] = ok
+            if ok and article.get("url"):
+                published_urls.add(article["url"])
+
+        return [
+            outcomes[id(article)] if id(article) in outcomes
+            else article.get("url") in published_urls
+            for article in articles
+        ]
+
     def _prepare_payload(self, article: dict) -> dict:
         """
         Prepare article data for blog API.
         This can be customized based on the target blog platform.
         """
+        published_at = article.get("published_date", "")
+        if isinstance(published_at, datetime):
+            published_at = published_at.isoformat()
+
         return {
             "title": article.get("title", ""),
             "content": article.get("content", article.get("summary", "")),
-            "excerpt": article.get("summary", "")[:200],
+            "excerpt": (article.get("summary") or "")[:200],
             "tags": article.get("tags", []),
             "source_url": article.get("url", ""),
             "source": article.get("source", ""),
-            "published_at": article.get("published_date", ""),
+            "published_at": published_at,
         }
 
     def create_summary_post(
         self,
-        articles: List[dict],
+        articles: Optional[Iterable] = None,
         title: str = "Tech Investment Week Summary",
     ) -> bool:
         """
-        Create a summary post from multiple articles.
-        
+        Create a summary post of the most relevant articles.
+
         Args:
-            articles: List of articles to summarize
+            articles: Articles to pick from; by default the last
+                DIGEST_DAYS of articles are streamed from the database
             title: Post title
-            
+
         Returns:
             bool: True if successful
         """
-        if not articles:
-            return False
-
-        # Generate summary content
-        content = f"# {title}\n\n"
-        content += f"*Generated on {datetime.now().strftime('%Y-%m-%d')}*\n\n"
+        if articles is None:
+            if self.db is None:
+                return False
+            picked = build_digest(self.db)
+        else:
+            picked = DigestBuilder().extend(articles).top()
 
-        for article in articles[:10]:  # Limit to 10 articles
-            content += f"## {article.get('title', '')}\n"
-            content += f"Source: [{article.get('source', 'Unknown')}]({article.get('url', '')})\n"
-            content += f"{article.get('summary', '')}\n\n"
+        if not picked:
+            return False
 
         summary_article = {
             "title": title,
-            "content": content,
+            "content": render_digest(picked, title),
             "tags": ["summary", "investment", "tech"],
         }
 
         return self.publish_article(summary_article)
-
-
-# Import datetime for the create_summary_post method
-from datetime import datetime
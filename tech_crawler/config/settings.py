@@ -1,5 +1,6 @@
 """Application configuration settings"""
 
+import json
 import os
 from typing import List
 from dotenv import load_dotenv
@@ -19,6 +20,70 @@ class Settings:
     DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///tech_crawler.db")
     DATA_DIR = os.getenv("DATA_DIR", "data")
     ARTICLES_DIR = os.path.join(DATA_DIR, "articles")
+    ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", os.path.join(DATA_DIR, "archive"))
+
+    # Retention: articles older than this many days move to the archive (0 disables)
+    ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "0"))
+    ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+
+    # Connection pool (ignored for in-memory SQLite)
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "True").lower() == "true"
+
+    # Read cache for article details and listings (0 disables)
+    READ_CACHE_SIZE = int(os.getenv("READ_CACHE_SIZE", "2048"))
+    READ_CACHE_TTL = float(os.getenv("READ_CACHE_TTL", "300"))
+    # Longest a stored dashboard summary is served after new articles arrive
+    SUMMARY_TTL = float(os.getenv("SUMMARY_TTL", "60"))
+    # How often readers check the ingest generation counter for new writes
+    GENERATION_POLL_INTERVAL = float(os.getenv("GENERATION_POLL_INTERVAL", "2.0"))
+    # Seconds clients may reuse JSON API responses before revalidating
+    API_CACHE_MAX_AGE = int(os.getenv("API_CACHE_MAX_AGE", "0"))
+
+    # API response encoding: "auto" uses orjson when installed, "stdlib" forces json
+    JSON_SERIALIZER = os.getenv("JSON_SERIALIZER", "auto")
+    # Bodies smaller than this are sent uncompressed (-1 disables compression)
+    RESPONSE_COMPRESSION_MIN_SIZE = int(os.getenv("RESPONSE_COMPRESSION_MIN_SIZE", "1024"))
+    RESPONSE_COMPRESSION_LEVEL = int(os.getenv("RESPONSE_COMPRESSION_LEVEL", "6"))
+
+    # Autocomplete (/api/suggest): how often tag counts for past days are re-read
+    SUGGEST_FULL_REFRESH_INTERVAL = float(os.getenv("SUGGEST_FULL_REFRESH_INTERVAL", "3600"))
+
+    # Live article stream (/api/stream)
+    STREAM_POLL_INTERVAL = float(os.getenv("STREAM_POLL_INTERVAL", "1.0"))
+    STREAM_HEARTBEAT_INTERVAL = float(os.getenv("STREAM_HEARTBEAT_INTERVAL", "15"))
+    # Per web process; under sync/gthread workers every open stream holds a
+    # worker thread, so stream_client_limit() also caps it at WEB_THREADS // 2
+    STREAM_MAX_CLIENTS = int(os.getenv("STREAM_MAX_CLIENTS", "50"))
+    # Batches a client may fall behind before it is disconnected
+    STREAM_QUEUE_SIZE = int(os.getenv("STREAM_QUEUE_SIZE", "100"))
+    # Article events kept for reconnecting clients (Last-Event-ID)
+    EVENT_RETENTION_HOURS = float(os.getenv("EVENT_RETENTION_HOURS", "24"))
+
+    # Production web server (gunicorn.conf.py)
+    WEB_HOST = os.getenv("WEB_HOST", "0.0.0.0")
+    WEB_PORT = int(os.getenv("WEB_PORT", "5000"))
+    WEB_WORKERS = int(os.getenv("WEB_WORKERS", str(os.cpu_count() or 1)))
+    WEB_THREADS = int(os.getenv("WEB_THREADS", "4"))
+    # "gevent" suits many open /api/stream clients (the docker-compose default)
+    WEB_WORKER_CLASS = os.getenv("WEB_WORKER_CLASS", "gthread")
+    WEB_TIMEOUT = int(os.getenv("WEB_TIMEOUT", "30"))
+    WEB_GRACEFUL_TIMEOUT = int(os.getenv("WEB_GRACEFUL_TIMEOUT", "30"))
+
+    # SQLite tuning (applied to every new connection)
+    SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+    SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    SQLITE_MAINTENANCE_INTERVAL = int(os.getenv("SQLITE_MAINTENANCE_INTERVAL", "900"))
+
+    # Article bodies are stored compressed ("zlib", "zstd" or "none")
+    CONTENT_CODEC = os.getenv("CONTENT_CODEC", "zlib")
+    CONTENT_COMPRESSION_LEVEL = int(os.getenv("CONTENT_COMPRESSION_LEVEL", "6"))
 
     # Crawling settings
     REQUEST_TIMEOUT = int(os.getenv("REQUEST_TIMEOUT", "10"))
@@ -28,6 +93,11 @@ class Settings:
     )
     RATE_LIMIT_DELAY = float(os.getenv("RATE_LIMIT_DELAY", "1.0"))
 
+    # Ingestion: crawlers enqueue articles, one writer thread commits batches
+    INGEST_QUEUE_SIZE = int(os.getenv("INGEST_QUEUE_SIZE", "1000"))
+    INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "200"))
+    INGEST_FLUSH_INTERVAL = float(os.getenv("INGEST_FLUSH_INTERVAL", "2.0"))
+
     # News sources (can be extended)
     NEWS_SOURCES = [
         {
@@ -96,6 +166,12 @@ class Settings:
             "type": "rss",
         },
     ]
+    # A JSON file with a list of sources in the same shape replaces the list
+    # above, e.g. the mock publisher farm (python -m benchmarks.publisher_farm)
+    NEWS_SOURCES_FILE = os.getenv("NEWS_SOURCES_FILE", "")
+    if NEWS_SOURCES_FILE:
+        with open(NEWS_SOURCES_FILE, encoding="utf-8") as _sources_file:
+            NEWS_SOURCES = json.load(_sources_file)
 
     # Tech companies to track (S&P 500 tech companies)
     TECH_COMPANIES = [
@@ -138,10 +214,60 @@ class Settings:
         "containers",
     ]
 
+    # Crawl run history: kept for CRAWL_HISTORY_DAYS, /api/crawl-health
+    # aggregates the last CRAWL_HEALTH_DAYS by default
+    CRAWL_HISTORY_DAYS = int(os.getenv("CRAWL_HISTORY_DAYS", "90"))
+    CRAWL_HEALTH_DAYS = int(os.getenv("CRAWL_HEALTH_DAYS", "7"))
+
+    # Crawler metrics are written here in Prometheus text format after each
+    # run and appended to the web app's /metrics (empty disables)
+    METRICS_TEXTFILE = os.getenv("METRICS_TEXTFILE", os.path.join(DATA_DIR, "crawler.prom"))
+    # gunicorn workers share their web metrics through files here
+    # (prometheus_client multiprocess mode); its files are removed when gunicorn starts
+    WEB_METRICS_DIR = os.getenv("WEB_METRICS_DIR", os.path.join(DATA_DIR, "web-metrics"))
+
     # Blog configuration (for future enhancement)
     BLOG_ENABLED = os.getenv("BLOG_ENABLED", "False").lower() == "true"
     BLOG_API_URL = os.getenv("BLOG_API_URL", "")
     BLOG_API_KEY = os.getenv("BLOG_API_KEY", "")
+    # Parallel posts per batch (also the HTTP connection pool size)
+    BLOG_CONCURRENCY = int(os.getenv("BLOG_CONCURRENCY", "4"))
+    BLOG_TIMEOUT = float(os.getenv("BLOG_TIMEOUT", "10"))
+    # Retries on 429/5xx and connection errors, with exponential backoff
+    BLOG_MAX_RETRIES = int(os.getenv("BLOG_MAX_RETRIES", "3"))
+    BLOG_BACKOFF_BASE = float(os.getenv("BLOG_BACKOFF_BASE", "0.5"))
+    BLOG_BACKOFF_MAX = float(os.getenv("BLOG_BACKOFF_MAX", "30"))
+    # Queue new articles in the publish outbox for the drain worker
+    # (python -m tech_crawler.blog.outbox); defaults to BLOG_ENABLED
+    BLOG_OUTBOX_ENABLED = os.getenv("BLOG_OUTBOX_ENABLED", str(BLOG_ENABLED)).lower() == "true"
+    BLOG_OUTBOX_BATCH_SIZE = int(os.getenv("BLOG_OUTBOX_BATCH_SIZE", "50"))
+    BLOG_OUTBOX_POLL_INTERVAL = float(os.getenv("BLOG_OUTBOX_POLL_INTERVAL", "10"))
+    # Seconds a claimed batch stays hidden from other workers
+    BLOG_OUTBOX_LEASE = int(os.getenv("BLOG_OUTBOX_LEASE", "300"))
+    # Failed batches are retried after RETRY_DELAY, doubling each attempt,
+    # and parked as "failed" after MAX_ATTEMPTS
+    BLOG_OUTBOX_RETRY_DELAY = float(os.getenv("BLOG_OUTBOX_RETRY_DELAY", "60"))
+    BLOG_OUTBOX_MAX_ATTEMPTS = int(os.getenv("BLOG_OUTBOX_MAX_ATTEMPTS", "10"))
+    # Summary post digest: top articles by relevance over DIGEST_DAYS, at
+    # most DIGEST_PER_SOURCE per source, skipping titles at least
+    # DIGEST_DUPLICATE_THRESHOLD similar (word Jaccard) to a picked one
+    DIGEST_DAYS = int(os.getenv("DIGEST_DAYS", "7"))
+    DIGEST_TOP_K = int(os.getenv("DIGEST_TOP_K", "10"))
+    DIGEST_PER_SOURCE = int(os.getenv("DIGEST_PER_SOURCE", "3"))
+    DIGEST_DUPLICATE_THRESHOLD = float(os.getenv("DIGEST_DUPLICATE_THRESHOLD", "0.6"))
+
+    @classmethod
+    def stream_client_limit(cls) -> int:
+        """
+        Most /api/stream clients one web process accepts.
+
+        Thread-based workers tie up a thread per open stream, so there the
+        limit leaves at least half of WEB_THREADS for other requests.
+        Async workers (gevent, eventlet) only use STREAM_MAX_CLIENTS.
+        """
+        if cls.WEB_WORKER_CLASS in ("sync", "gthread"):
+            return min(cls.STREAM_MAX_CLIENTS, cls.WEB_THREADS // 2)
+        return cls.STREAM_MAX_CLIENTS
 
     @classmethod
     def get_config_dict(cls) -> dict:
@@ -152,6 +278,7 @@ class Settings:
             "debug": cls.DEBUG,
             "database_url": cls.DATABASE_URL,
             "data_dir": cls.DATA_DIR,
+            "sqlite_journal_mode": cls.SQLITE_JOURNAL_MODE,
             "request_timeout": cls.REQUEST_TIMEOUT,
             "rate_limit_delay": cls.RATE_LIMIT_DELAY,
         }
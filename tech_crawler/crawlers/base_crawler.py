@@ -9,6 +9,7 @@ import requests
 from bs4 import BeautifulSoup
 
 from ..config import Settings
+from ..metrics import CRAWL_BYTES, CRAWL_CACHE_HITS, CRAWL_ERRORS, CRAWL_STAGE_SECONDS
 
 
 logger = logging.getLogger(__name__)
@@ -22,6 +23,25 @@ class BaseCrawler(ABC):
         self.source_name = source_name
         self.source_url = source_url
         self.articles: List[Dict[str, Any]] = []
+        # Validators from the last successful fetch, sent back so unchanged
+        # sources can answer 304 Not Modified
+        self.etag: Optional[str] = None
+        self.modified: Optional[str] = None
+        self.not_modified = False
+        self.start_run()
+
+    def start_run(self) -> None:
+        """Reset the per-run outcome recorded for crawl history"""
+        self.http_status: Optional[int] = None
+        self.bytes_downloaded = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+
+    def record_error(self, stage: str, error: Exception) -> None:
+        """Count a failure in this run and in the crawl metrics"""
+        self.errors += 1
+        self.last_error = f"{stage}: {error}"
+        CRAWL_ERRORS.labels(source=self.source_name, stage=stage).inc()
 
     @abstractmethod
     def fetch(self) -> bool:
@@ -66,34 +86,79 @@ class BaseCrawler(ABC):
         self.articles.append(article)
         logger.info(f"Added article: {title[:50]}... from {self.source_name}")
 
+    def conditional_get(self, url: str) -> Optional[requests.Response]:
+        """
+        GET a source page, revalidating with the validators from the last fetch.
+
+        Returns:
+            The response, or None if the source answered 304 Not Modified
+        """
+        headers = {"User-Agent": Settings.USER_AGENT}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.modified:
+            headers["If-Modified-Since"] = self.modified
+
+        with CRAWL_STAGE_SECONDS.labels(source=self.source_name, stage="fetch").time():
+            response = requests.get(url, headers=headers, timeout=Settings.REQUEST_TIMEOUT)
+        self.http_status = response.status_code
+        if response.status_code == 304:
+            logger.info(f"{self.source_name} not modified since last fetch")
+            CRAWL_CACHE_HITS.labels(source=self.source_name).inc()
+            self.not_modified = True
+            return None
+
+        response.raise_for_status()
+        self.bytes_downloaded += len(response.content)
+        CRAWL_BYTES.labels(source=self.source_name, kind="source").inc(len(response.content))
+        self.not_modified = False
+        self.etag = response.headers.get("ETag")
+        self.modified = response.headers.get("Last-Modified")
+        return response
+
+    @staticmethod
+    def extract_content(html: str) -> Optional[str]:
+        """
+        Extract the readable text of an article page.
+
+        Paragraphs inside the <article> element are preferred; pages
+        without one fall back to every paragraph on the page.
+        """
+        soup = BeautifulSoup(html, "html.parser")
+
+        article_element = soup.find("article")
+        if article_element:
+            paragraphs = article_element.find_all("p")
+        else:
+            paragraphs = soup.find_all("p")
+
+        chunks = []
+        for p in paragraphs:
+            text = p.get_text(strip=True)
+            if text:
+                chunks.append(text)
+
+        content = "\n\n".join(chunks)
+        return content or None
+
     def fetch_full_content(self, url: str) -> Optional[str]:
         """Fetch full article content from the URL"""
         try:
             headers = {"User-Agent": Settings.USER_AGENT}
-            response = requests.get(
-                url,
-                headers=headers,
-                timeout=Settings.REQUEST_TIMEOUT,
-            )
+            with CRAWL_STAGE_SECONDS.labels(source=self.source_name, stage="full_content").time():
+                response = requests.get(
+                    url,
+                    headers=headers,
+                    timeout=Settings.REQUEST_TIMEOUT,
+                )
             response.raise_for_status()
-            soup = BeautifulSoup(response.text, "html.parser")
-
-            article_element = soup.find("article")
-            if article_element:
-                paragraphs = article_element.find_all("p")
-            else:
-                paragraphs = soup.find_all("p")
-
-            chunks = []
-            for p in paragraphs:
-                text = p.get_text(strip=True)
-                if text:
-                    chunks.append(text)
-
-            content = "\n\n".join(chunks)
-            return content or None
+            self.bytes_downloaded += len(response.content)
+            CRAWL_BYTES.labels(source=self.source_name, kind="article").inc(len(response.content))
+            with CRAWL_STAGE_SECONDS.labels(source=self.source_name, stage="extract").time():
+                return self.extract_content(response.text)
         except Exception as e:
             logger.debug(f"Unable to fetch full content for {url}: {str(e)}")
+            self.record_error("full_content", e)
             return None
 
     def get_articles(self) -> List[Dict[str, Any]]:
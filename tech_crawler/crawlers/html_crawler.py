@@ -8,6 +8,7 @@ from bs4 import BeautifulSoup
 
 from .base_crawler import BaseCrawler
 from ..config import Settings
+from ..metrics import CRAWL_STAGE_SECONDS
 
 logger = logging.getLogger(__name__)
 
@@ -24,38 +25,38 @@ class HTMLCrawler(BaseCrawler):
         """Fetch HTML content from URL"""
         try:
             logger.info(f"Fetching HTML content from {self.source_url}")
-            headers = {"User-Agent": Settings.USER_AGENT}
-            response = requests.get(
-                self.source_url,
-                headers=headers,
-                timeout=Settings.REQUEST_TIMEOUT,
-            )
-            response.raise_for_status()
-            self.html_content = response.text
+            response = self.conditional_get(self.source_url)
+            # None means unchanged since the last fetch
+            self.html_content = response.text if response is not None else None
             return True
 
         except requests.exceptions.RequestException as e:
             logger.error(
                 f"Error fetching HTML from {self.source_url}: {str(e)}"
             )
+            self.record_error("fetch", e)
             return False
 
     def parse(self) -> List[Dict[str, Any]]:
         """Parse HTML content (basic implementation for demo)"""
+        self.clear_articles()
+        if self.not_modified:
+            return []
         if not self.html_content:
             logger.warning(f"No HTML content for {self.source_name}")
             return []
 
         try:
-            soup = BeautifulSoup(self.html_content, "html.parser")
-            
-            # Example: Parse articles from a news site
-            # This is a basic implementation that should be customized per source
-            articles = soup.find_all("article")
-            
-            if not articles:
-                # Fallback: look for common article containers
-                articles = soup.find_all("div", class_=lambda x: x and "article" in x.lower())
+            with CRAWL_STAGE_SECONDS.labels(source=self.source_name, stage="parse").time():
+                soup = BeautifulSoup(self.html_content, "html.parser")
+
+                # Example: Parse articles from a news site
+                # This is a basic implementation that should be customized per source
+                articles = soup.find_all("article")
+
+                if not articles:
+                    # Fallback: look for common article containers
+                    articles = soup.find_all("div", class_=lambda x: x and "article" in x.lower())
 
             for article in articles[:20]:  # Limit to 20 articles
                 try:
@@ -101,4 +102,5 @@ class HTMLCrawler(BaseCrawler):
 
         except Exception as e:
             logger.error(f"Error parsing HTML for {self.source_name}: {str(e)}")
+            self.record_error("parse", e)
             return []
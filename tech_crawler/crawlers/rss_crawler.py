@@ -8,6 +8,7 @@ from dateutil import parser as date_parser
 
 from .base_crawler import BaseCrawler
 from ..config import Settings
+from ..metrics import CRAWL_STAGE_SECONDS
 
 logger = logging.getLogger(__name__)
 
@@ -24,8 +25,18 @@ class RSSCrawler(BaseCrawler):
         """Fetch RSS feed"""
         try:
             logger.info(f"Fetching RSS feed from {self.source_url}")
-            self.feed_data = feedparser.parse(self.source_url)
-            
+            response = self.conditional_get(self.source_url)
+            if response is None:
+                # Unchanged since the last fetch; there is nothing new to parse
+                self.feed_data = None
+                return True
+
+            with CRAWL_STAGE_SECONDS.labels(source=self.source_name, stage="parse").time():
+                self.feed_data = feedparser.parse(
+                    response.content,
+                    response_headers={"content-type": response.headers.get("Content-Type", "")},
+                )
+
             if self.feed_data.bozo:
                 logger.warning(
                     f"Feed parsing issue for {self.source_name}: "
@@ -35,10 +46,14 @@ class RSSCrawler(BaseCrawler):
             return len(self.feed_data.entries) > 0
         except Exception as e:
             logger.error(f"Error fetching RSS feed {self.source_url}: {str(e)}")
+            self.record_error("fetch", e)
             return False
 
     def parse(self) -> List[Dict[str, Any]]:
         """Parse RSS feed entries"""
+        self.clear_articles()
+        if self.not_modified:
+            return []
         if not self.feed_data:
             logger.warning(f"No feed data for {self.source_name}")
             return []
@@ -75,4 +90,5 @@ class RSSCrawler(BaseCrawler):
 
         except Exception as e:
             logger.error(f"Error parsing RSS feed {self.source_name}: {str(e)}")
+            self.record_error("parse", e)
             return []
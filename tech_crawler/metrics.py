@@ -0,0 +1,141 @@
+"""
+Crawler and web metrics, exported with prometheus_client.
+
+Web metrics live in prometheus_client's default registry. Under gunicorn,
+gunicorn.conf.py points PROMETHEUS_MULTIPROC_DIR at WEB_METRICS_DIR so each
+worker writes its samples there and /metrics reports the sum over all
+workers. Crawler metrics live in CRAWLER_REGISTRY: the crawler exits after
+each run, so it writes them to a textfile (METRICS_TEXTFILE) that the web
+app appends to its own output and node_exporter's textfile collector can
+also read.
+"""
+
+import os
+from typing import Iterable, List
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram,
+    generate_latest, write_to_textfile,
+)
+from prometheus_client.multiprocess import MultiProcessCollector
+from prometheus_client.parser import text_string_to_metric_families
+
+CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+# Seconds; covers fast parses through slow full-page downloads
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+CRAWLER_REGISTRY = CollectorRegistry()
+
+
+class _Families:
+    """Already collected metric families, in the shape generate_latest expects"""
+
+    def __init__(self, families: List):
+        self._families = families
+
+    def collect(self):
+        return self._families
+
+
+def multiprocess_enabled() -> bool:
+    """Whether samples are shared between processes through PROMETHEUS_MULTIPROC_DIR"""
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def web_registry():
+    """Registry /metrics reads: every gunicorn worker's samples in multiprocess mode, else this process's"""
+    if not multiprocess_enabled():
+        return REGISTRY
+    registry = CollectorRegistry()
+    MultiProcessCollector(registry)
+    return registry
+
+
+def exposition(registry, extra: Iterable = (), exported: str = "") -> bytes:
+    """
+    Prometheus text for a registry, scrape-time families and a crawler export
+
+    Args:
+        registry: Registry (or collector) with the serving process's metrics
+        extra: Metric families computed at scrape time
+        exported: Text written by write_textfile in the crawler process
+
+    Returns:
+        The combined exposition
+    """
+    # In multiprocess mode the crawler metrics this process merely imported
+    # show up too, always empty; the crawler's own export replaces them
+    crawler_names = {family.name for family in CRAWLER_REGISTRY.collect()}
+    families = [family for family in registry.collect() if family.name not in crawler_names]
+    families.extend(extra)
+    if exported:
+        families.extend(text_string_to_metric_families(exported))
+    return generate_latest(_Families(families))
+
+
+def write_textfile(path: str) -> None:
+    """Write the crawler metrics atomically, for readers that may open the file mid-write"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    write_to_textfile(path, CRAWLER_REGISTRY)
+
+
+# Crawler
+CRAWL_STAGE_SECONDS = Histogram(
+    "crawler_stage_seconds",
+    "Time spent in each crawl stage (fetch, parse, full_content, extract, analyze, db_commit)",
+    ("source", "stage"),
+    buckets=DEFAULT_BUCKETS,
+    registry=CRAWLER_REGISTRY,
+)
+CRAWL_BYTES = Counter(
+    "crawler_bytes_downloaded_total",
+    "Response bytes downloaded, by source page or article page",
+    ("source", "kind"),
+    registry=CRAWLER_REGISTRY,
+)
+CRAWL_CACHE_HITS = Counter(
+    "crawler_cache_hits_total",
+    "Source fetches answered 304 Not Modified",
+    ("source",),
+    registry=CRAWLER_REGISTRY,
+)
+CRAWL_ERRORS = Counter(
+    "crawler_errors_total",
+    "Failures by crawl stage",
+    ("source", "stage"),
+    registry=CRAWLER_REGISTRY,
+)
+CRAWL_ARTICLES = Counter(
+    "crawler_articles_total",
+    "Articles parsed and found relevant",
+    ("source", "outcome"),
+    registry=CRAWLER_REGISTRY,
+)
+CRAWL_LAST_RUN = Gauge(
+    "crawler_last_run_timestamp_seconds",
+    "Unix time the last crawl finished",
+    registry=CRAWLER_REGISTRY,
+    multiprocess_mode="mostrecent",
+)
+CRAWL_RUN_SECONDS = Gauge(
+    "crawler_last_run_duration_seconds",
+    "Wall time of the last crawl",
+    registry=CRAWLER_REGISTRY,
+    multiprocess_mode="mostrecent",
+)
+
+# Web
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by endpoint, method and status",
+    ("endpoint", "method", "status"),
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Time to produce a response (streamed bodies excluded)",
+    ("endpoint",),
+    buckets=DEFAULT_BUCKETS,
+)
@@ -1,6 +1,7 @@
 """Storage module for article persistence"""
 
 from .database import Database
-from .models import Article
+from .ingest import IngestQueue
+from .models import Article, ArticleSummary
 
-__all__ = ["Database", "Article"]
+__all__ = ["Database", "Article", "ArticleSummary", "IngestQueue"]
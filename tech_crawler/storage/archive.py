@@ -0,0 +1,92 @@
+"""Cold storage for articles past the retention window"""
+
+import gzip
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+from ..config import Settings
+
+logger = logging.getLogger(__name__)
+
+
+def partition_for(published_date: datetime) -> str:
+    """Return the YYYY-MM partition an article belongs to"""
+    return published_date.strftime("%Y-%m")
+
+
+class ArticleArchive:
+    """
+    Month-partitioned, gzip-compressed JSONL archive of articles.
+
+    Each write appends one gzip member to the partition file and returns
+    its byte offset. Stubs record that offset, so a lookup decompresses a
+    single batch instead of the whole month.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        """Initialize archive rooted at directory"""
+        self.directory = directory or Settings.ARCHIVE_DIR
+
+    def path_for(self, partition: str) -> str:
+        """Return the file path for a partition"""
+        return os.path.join(self.directory, f"articles-{partition}.jsonl.gz")
+
+    def append(self, partition: str, records: Iterable[dict]) -> int:
+        """
+        Append records to a partition as one gzip member.
+
+        Returns:
+            int: Byte offset of the new member
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        payload = "".join(
+            json.dumps(record, ensure_ascii=False, default=str) + "\n"
+            for record in records
+        ).encode("utf-8")
+
+        with open(self.path_for(partition), "ab") as f:
+            offset = f.tell()
+            f.write(gzip.compress(payload))
+            f.flush()
+            os.fsync(f.fileno())
+        return offset
+
+    def read(self, partition: str, offset: int, article_id: int) -> Optional[dict]:
+        """Read one archived article record"""
+        path = self.path_for(partition)
+        try:
+            with open(path, "rb") as f:
+                f.seek(offset)
+                with gzip.GzipFile(fileobj=f) as member:
+                    for line in member:
+                        record = json.loads(line)
+                        if record.get("id") == article_id:
+                            return record
+        except FileNotFoundError:
+            logger.error(f"Archive partition missing: {path}")
+        except Exception as e:
+            logger.error(f"Error reading archive {path}: {str(e)}")
+        return None
+
+    def iter_partition(self, partition: str) -> Iterable[dict]:
+        """Yield every record in a partition"""
+        path = self.path_for(partition)
+        if not os.path.exists(path):
+            return
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                yield json.loads(line)
+
+    def partitions(self) -> List[str]:
+        """List archived partitions, oldest first"""
+        if not os.path.isdir(self.directory):
+            return []
+        names = []
+        for name in os.listdir(self.directory):
+            if name.startswith("articles-") and name.endswith(".jsonl.gz"):
+                names.append(name[len("articles-"):-len(".jsonl.gz")])
+        return sorted(names)
+
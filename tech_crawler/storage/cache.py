@@ -0,0 +1,84 @@
+"""In-process read cache for hot articles and listings"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Tuple
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    Thread-safe, size-bounded LRU cache with an optional per-entry TTL.
+
+    Counts hits, misses and evictions so the hit rate can be reported.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 0):
+        """
+        Initialize cache.
+
+        Args:
+            max_size: Maximum entries kept; 0 disables caching
+            ttl: Seconds an entry stays valid; 0 means until evicted or cleared
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def get(self, key: Hashable, default: Any = _MISSING) -> Any:
+        """Return a cached value, or default (a private sentinel) on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if not self.ttl or time.monotonic() - stored_at < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry if full"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Return size and hit-rate counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+def is_missing(value: Any) -> bool:
+    """Return True if LRUCache.get reported a miss"""
+    return value is _MISSING
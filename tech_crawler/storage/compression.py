@@ -0,0 +1,68 @@
+"""Compression codecs for stored article bodies"""
+
+import logging
+import zlib
+from typing import Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+from ..config import Settings
+
+logger = logging.getLogger(__name__)
+
+CODEC_NONE = "none"
+CODEC_ZLIB = "zlib"
+CODEC_ZSTD = "zstd"
+
+
+def available_codecs() -> Tuple[str, ...]:
+    """Return the codecs usable in this environment"""
+    codecs = (CODEC_NONE, CODEC_ZLIB)
+    if zstandard is not None:
+        codecs += (CODEC_ZSTD,)
+    return codecs
+
+
+def default_codec() -> str:
+    """Return the configured codec, falling back to zlib if unavailable"""
+    codec = Settings.CONTENT_CODEC.lower()
+    if codec not in available_codecs():
+        logger.warning(f"Content codec '{codec}' unavailable, using zlib")
+        return CODEC_ZLIB
+    return codec
+
+
+def compress_text(text: str, codec: Optional[str] = None) -> Tuple[str, bytes]:
+    """
+    Compress text for storage.
+
+    Returns:
+        Tuple of (codec, data); the codec must be stored with the data
+    """
+    codec = codec or default_codec()
+    raw = (text or "").encode("utf-8")
+    level = Settings.CONTENT_COMPRESSION_LEVEL
+
+    if codec == CODEC_ZSTD:
+        return codec, zstandard.ZstdCompressor(level=level).compress(raw)
+    if codec == CODEC_ZLIB:
+        return codec, zlib.compress(raw, level)
+    return CODEC_NONE, raw
+
+
+def decompress_text(codec: str, data: Optional[bytes]) -> str:
+    """Decompress data written by compress_text"""
+    if not data:
+        return ""
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd-compressed content")
+        raw = zstandard.ZstdDecompressor().decompress(data)
+    elif codec == CODEC_ZLIB:
+        raw = zlib.decompress(data)
+    else:
+        raw = data
+    return raw.decode("utf-8")
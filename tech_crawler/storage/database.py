@@ -1,31 +1,165 @@
 """Database management for articles"""
 
+import base64
+import binascii
+import json
 import logging
 import os
-from sqlalchemy import create_engine, func
-from sqlalchemy.orm import sessionmaker, Session
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from sqlalchemy import MetaData, String, case, create_engine, event, func, inspect, text, tuple_
+from sqlalchemy.engine import make_url
+from sqlalchemy.schema import CreateTable
+from sqlalchemy.orm import joinedload, scoped_session, sessionmaker, Session
 from datetime import datetime, timedelta, timezone
-from typing import List, Optional
+from typing import Iterator, List, Optional, Sequence, Tuple
 
-from .models import Base, Article
+from .archive import ArticleArchive, partition_for
+from .cache import LRUCache, is_missing
+from .models import (
+    Base, Article, ArchivedArticle, ArticleEvent, ArticleSummary, DailySourceCount, DailySummary,
+    CrawlRun, CrawlSourceRun, DailyTagCount, PublishedArticle, PublishOutbox, StorageMeta,
+)
+from .rollups import RollupAccumulator, rebuild_rollups, summarize_day
+from .search import create_search_index
 from ..config import Settings
 
 logger = logging.getLogger(__name__)
 
+GENERATION_KEY = "ingest_generation"
+UPDATED_AT_KEY = "ingest_updated_at"
+
+SQLITE_JOURNAL_MODES = {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}
+SQLITE_SYNCHRONOUS_MODES = {"OFF", "NORMAL", "FULL", "EXTRA"}
+
+
+def _configure_sqlite(engine) -> None:
+    """Apply the configured SQLite pragmas to every new connection"""
+    journal_mode = Settings.SQLITE_JOURNAL_MODE.upper()
+    synchronous = Settings.SQLITE_SYNCHRONOUS.upper()
+
+    if journal_mode not in SQLITE_JOURNAL_MODES:
+        logger.warning(f"Ignoring unknown SQLite journal mode: {journal_mode}")
+        journal_mode = None
+    if synchronous not in SQLITE_SYNCHRONOUS_MODES:
+        logger.warning(f"Ignoring unknown SQLite synchronous mode: {synchronous}")
+        synchronous = None
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            # busy_timeout first so the journal mode switch can wait on a
+            # writer held by another process instead of failing outright
+            cursor.execute(f"PRAGMA busy_timeout = {int(Settings.SQLITE_BUSY_TIMEOUT_MS)}")
+            if journal_mode:
+                cursor.execute(f"PRAGMA journal_mode = {journal_mode}")
+            if synchronous:
+                cursor.execute(f"PRAGMA synchronous = {synchronous}")
+            # Negative cache_size is interpreted by SQLite as KiB
+            cursor.execute(f"PRAGMA cache_size = -{abs(int(Settings.SQLITE_CACHE_SIZE_KB))}")
+            cursor.execute(f"PRAGMA mmap_size = {int(Settings.SQLITE_MMAP_SIZE)}")
+            cursor.execute("PRAGMA temp_store = MEMORY")
+        finally:
+            cursor.close()
+
+
+def _pool_options(database_url: str) -> dict:
+    """Connection pool options from Settings for pooled (non in-memory) engines"""
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        # In-memory SQLite uses a per-thread singleton pool
+        return {}
+
+    return {
+        "pool_size": Settings.DB_POOL_SIZE,
+        "max_overflow": Settings.DB_MAX_OVERFLOW,
+        "pool_timeout": Settings.DB_POOL_TIMEOUT,
+        "pool_recycle": Settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": Settings.DB_POOL_PRE_PING,
+    }
+
 
 class Database:
     """Database manager for articles"""
 
-    def __init__(self, database_url: str = None):
+    def __init__(self, database_url: str = None, archive: ArticleArchive = None):
         """Initialize database connection"""
         self.database_url = database_url or Settings.DATABASE_URL
+        self.archive = archive or ArticleArchive()
         self.engine = create_engine(
             self.database_url,
             echo=Settings.DEBUG,
+            **_pool_options(self.database_url),
         )
-        self.SessionLocal = sessionmaker(bind=self.engine)
+        self.is_sqlite = self.engine.dialect.name == "sqlite"
+        if self.is_sqlite:
+            _configure_sqlite(self.engine)
+        # Keep committed objects readable after their session closes
+        self.SessionLocal = sessionmaker(bind=self.engine, expire_on_commit=False)
+        # Thread-local session shared by every call inside a request scope
+        self._scoped_session = scoped_session(self.SessionLocal)
+        self._scope = threading.local()
+
+        self.read_cache = LRUCache(Settings.READ_CACHE_SIZE, Settings.READ_CACHE_TTL)
+        self._ingest_state = (0, 0)
+        self._ingest_state_checked_at: Optional[float] = None
+        self._cache_generation: Optional[int] = None
+        self._ingest_lock = threading.Lock()
+        self._last_maintenance = time.monotonic()
+        self.outbox_enabled = Settings.BLOG_OUTBOX_ENABLED
+        self.search_index = create_search_index(self.engine)
         self._init_db()
 
+    def _in_request_scope(self) -> bool:
+        return getattr(self._scope, "depth", 0) > 0
+
+    def _session(self) -> Session:
+        """Return the request-scoped session if one is active, else a new one"""
+        if self._in_request_scope():
+            return self._scoped_session()
+        return self.SessionLocal()
+
+    def _release(self, session: Session) -> None:
+        """Close a session unless it belongs to the active request scope"""
+        if not self._in_request_scope():
+            session.close()
+
+    def begin_request(self) -> None:
+        """Start a unit of work: calls on this thread share one session"""
+        self._scope.depth = getattr(self._scope, "depth", 0) + 1
+
+    def end_request(self, error: Optional[BaseException] = None) -> None:
+        """End the unit of work and return its connection to the pool"""
+        depth = getattr(self._scope, "depth", 0)
+        if depth <= 0:
+            return
+
+        self._scope.depth = depth - 1
+        if self._scope.depth == 0:
+            if error is not None:
+                self._scoped_session().rollback()
+            self._scoped_session.remove()
+
+    @contextmanager
+    def session_scope(self):
+        """Context manager form of begin_request/end_request"""
+        self.begin_request()
+        error = None
+        try:
+            yield self
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self.end_request(error)
+
+    def get_pool_status(self) -> str:
+        """Describe the connection pool state"""
+        return self.engine.pool.status()
+
     @staticmethod
     def _serialize_tags(tags) -> str:
         if not tags:
@@ -40,26 +174,360 @@ class Database:
         """Initialize database tables"""
         try:
             Base.metadata.create_all(self.engine)
-            logger.info("Database initialized successfully")
+            self._ensure_columns()
+            self._ensure_autoincrement()
+            self._ensure_indexes()
+            with self.engine.begin() as connection:
+                needs_rebuild = self.search_index.create(connection)
+            if needs_rebuild:
+                self.rebuild_search_index()
+            self._backfill_rollups()
+            self._ensure_meta()
+            logger.info(f"Database initialized successfully (search: {self.search_index.name})")
         except Exception as e:
             logger.error(f"Error initializing database: {str(e)}")
             raise
 
+    def _ensure_columns(self) -> None:
+        """Add nullable columns added to the models after their table already existed"""
+        existing_tables = inspect(self.engine).get_table_names()
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing = {c["name"] for c in inspect(self.engine).get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+                column_type = column.type.compile(dialect=self.engine.dialect)
+                with self.engine.begin() as connection:
+                    connection.execute(text(
+                        f'ALTER TABLE {table.name} ADD COLUMN "{column.name}" {column_type}'
+                    ))
+                logger.info(f"Added column {table.name}.{column.name}")
+
+    def _ensure_autoincrement(self) -> None:
+        """
+        Rebuild SQLite tables created before the models declared AUTOINCREMENT.
+
+        create_all leaves existing tables alone, and a plain rowid table hands
+        the highest id out again once that row is deleted, so an archived
+        article's id could be given to a new article. The rebuilt articles
+        sequence starts past archived ids too. Indexes dropped with the old
+        table are recreated by _ensure_indexes.
+        """
+        if not self.is_sqlite:
+            return
+        for table in Base.metadata.sorted_tables:
+            if not table.dialect_options["sqlite"]["autoincrement"]:
+                continue
+            with self.engine.connect() as connection:
+                sql = connection.execute(
+                    text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                    {"name": table.name},
+                ).scalar()
+            if sql is None or "AUTOINCREMENT" in sql.upper():
+                continue
+
+            existing = {c["name"] for c in inspect(self.engine).get_columns(table.name)}
+            columns = ", ".join(f'"{c.name}"' for c in table.columns if c.name in existing)
+            rebuilt = table.to_metadata(MetaData(), name=f"{table.name}_rebuild")
+            with self.engine.begin() as connection:
+                # Dropping the old table must not cascade into its children
+                connection.execute(text("PRAGMA foreign_keys = OFF"))
+                connection.execute(CreateTable(rebuilt))
+                connection.execute(text(
+                    f"INSERT INTO {rebuilt.name} ({columns}) SELECT {columns} FROM {table.name}"
+                ))
+                connection.execute(text(f"DROP TABLE {table.name}"))
+                connection.execute(text(f"ALTER TABLE {rebuilt.name} RENAME TO {table.name}"))
+                if table.name == Article.__tablename__:
+                    seq = connection.execute(text(
+                        "SELECT MAX(id) FROM (SELECT MAX(id) AS id FROM articles"
+                        " UNION ALL SELECT MAX(id) FROM archived_articles)"
+                    )).scalar()
+                    connection.execute(text("DELETE FROM sqlite_sequence WHERE name = 'articles'"))
+                    connection.execute(
+                        text("INSERT INTO sqlite_sequence (name, seq) VALUES ('articles', :seq)"),
+                        {"seq": seq or 0},
+                    )
+            logger.info(f"Rebuilt {table.name} with AUTOINCREMENT")
+
+    def _ensure_indexes(self) -> None:
+        """Create indexes added to the models after their table already existed"""
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(self.engine, checkfirst=True)
+
+    def _backfill_rollups(self) -> None:
+        """
+        Populate rollup tables for databases created before they existed.
+
+        Also rebuilds them when daily_tag_counts predates relevance_sum and
+        scored_count: _ensure_columns adds those columns empty (NULL), while
+        rows written since always carry a value.
+        """
+        session = self.SessionLocal()
+        try:
+            has_articles = (
+                session.query(Article.id).first() is not None
+                or session.query(ArchivedArticle.id).first() is not None
+            )
+            missing = session.query(DailySourceCount.day).first() is None
+            unscored = session.query(DailyTagCount.day).filter(
+                DailyTagCount.scored_count.is_(None)
+            ).first() is not None
+            needs_rollups = has_articles and (missing or unscored)
+        finally:
+            session.close()
+        if needs_rollups:
+            self.rebuild_rollups()
+
+    def _ensure_meta(self) -> None:
+        """Create the shared counters if they do not exist yet"""
+        session = self.SessionLocal()
+        try:
+            for key in (GENERATION_KEY, UPDATED_AT_KEY):
+                if session.get(StorageMeta, key) is None:
+                    session.add(StorageMeta(key=key, value=0))
+            session.commit()
+        finally:
+            session.close()
+
+    def _bump_generation(self, session: Session) -> None:
+        """Record a data change inside the writing transaction"""
+        session.query(StorageMeta).filter(StorageMeta.key == GENERATION_KEY).update(
+            {StorageMeta.value: StorageMeta.value + 1},
+            synchronize_session=False,
+        )
+        session.query(StorageMeta).filter(StorageMeta.key == UPDATED_AT_KEY).update(
+            {StorageMeta.value: int(time.time())},
+            synchronize_session=False,
+        )
+        # Make this process notice its own write on the next read
+        self._ingest_state_checked_at = None
+
+    def get_ingest_state(self) -> Tuple[int, int]:
+        """
+        Get the ingest generation counter and last write time.
+
+        The generation increases with every committed write from any
+        process. The value is re-read at most every
+        GENERATION_POLL_INTERVAL seconds.
+
+        Returns:
+            Tuple of (generation, updated_at as Unix seconds)
+        """
+        now = time.monotonic()
+        with self._ingest_lock:
+            checked_at = self._ingest_state_checked_at
+            if checked_at is not None and now - checked_at < Settings.GENERATION_POLL_INTERVAL:
+                return self._ingest_state
+
+        session = self._session()
+        try:
+            rows = dict(
+                session.query(StorageMeta.key, StorageMeta.value)
+                .filter(StorageMeta.key.in_([GENERATION_KEY, UPDATED_AT_KEY]))
+                .all()
+            )
+            state = (rows.get(GENERATION_KEY, 0), rows.get(UPDATED_AT_KEY, 0))
+        except Exception as e:
+            logger.error(f"Error reading ingest state: {str(e)}")
+            return self._ingest_state
+        finally:
+            self._release(session)
+
+        with self._ingest_lock:
+            self._ingest_state = state
+            self._ingest_state_checked_at = now
+        return state
+
+    def _cache_get(self, key) -> Tuple[Optional[object], tuple]:
+        """
+        Look up the read cache, dropping it first if new data was ingested.
+
+        Returns:
+            (cached value or None, key to store a fresh result under). The
+            store key carries the generation read before the caller queries,
+            so a result that raced an ingest is never served as current.
+        """
+        if not self.read_cache.enabled:
+            return None, key
+        generation = self.get_ingest_state()[0]
+        if generation != self._cache_generation:
+            self.read_cache.clear()
+            self._cache_generation = generation
+        versioned_key = (generation, key)
+        value = self.read_cache.get(versioned_key)
+        return (None if is_missing(value) else value), versioned_key
+
+    def cache_stats(self) -> dict:
+        """Read cache counters plus the generation they are valid for"""
+        stats = self.read_cache.stats()
+        stats["generation"] = self._cache_generation
+        return stats
+
+    def rebuild_rollups(self) -> None:
+        """Recompute the daily rollup tables from stored and archived articles"""
+        session = self.SessionLocal()
+        try:
+            rebuild_rollups(session, archived=self._archived_rollup_rows(session))
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error rebuilding rollups: {str(e)}")
+        finally:
+            session.close()
+
+    def _archived_rollup_rows(self, session: Session) -> Iterator[tuple]:
+        """(published_date, source, tags, relevance_score) of every archived article"""
+        for record in self._iter_archived_records(session):
+            yield (
+                self._parse_record_date(record.get("published_date")),
+                record["source"],
+                record.get("tags"),
+                record.get("relevance_score"),
+            )
+
+    def run_maintenance(self) -> None:
+        """Refresh planner statistics and checkpoint the SQLite WAL"""
+        self._last_maintenance = time.monotonic()
+        if not self.is_sqlite:
+            return
+
+        try:
+            with self.engine.connect() as connection:
+                connection.execute(text("PRAGMA optimize"))
+                # PASSIVE never blocks readers or the writer; it copies what it
+                # can and leaves the rest for the next checkpoint
+                connection.execute(text("PRAGMA wal_checkpoint(PASSIVE)"))
+            logger.debug("SQLite maintenance completed")
+        except Exception as e:
+            logger.warning(f"Error running SQLite maintenance: {str(e)}")
+
+    def _maybe_run_maintenance(self) -> None:
+        """Run maintenance if the configured interval has elapsed"""
+        interval = Settings.SQLITE_MAINTENANCE_INTERVAL
+        if interval > 0 and time.monotonic() - self._last_maintenance >= interval:
+            self.run_maintenance()
+
+    def close(self) -> None:
+        """Run final maintenance and release pooled connections"""
+        self.run_maintenance()
+        self.engine.dispose()
+
+    @staticmethod
+    def _search_fields(article: Article) -> Tuple[str, str, str]:
+        """(title, summary, body) as the search index sees them"""
+        # Touch the relationship so the body loads inside the session
+        body = article.body
+        return article.title, article.summary, body.text if body is not None else article.content
+
+    def _index_for_search(
+        self,
+        session: Session,
+        article: Article,
+        previous: Optional[Tuple[str, str, str]] = None,
+    ) -> None:
+        """
+        Refresh an article's full-text index entry (requires a flushed id).
+
+        Args:
+            previous: _search_fields() of an already indexed article,
+                taken before it was modified
+        """
+        self.search_index.index_article(
+            session, article.id, *self._search_fields(article), previous=previous,
+        )
+
+    def rebuild_search_index(self, batch_size: int = 500) -> None:
+        """Rebuild the full-text index from stored and archived articles"""
+        with self.engine.begin() as connection:
+            self.search_index.clear(connection)
+
+        session = self.SessionLocal()
+        try:
+            last_id = 0
+            indexed = 0
+            while True:
+                articles = (
+                    session.query(Article)
+                    .options(joinedload(Article.body))
+                    .filter(Article.id > last_id)
+                    .order_by(Article.id)
+                    .limit(batch_size)
+                    .all()
+                )
+                if not articles:
+                    break
+
+                for article in articles:
+                    self._index_for_search(session, article)
+                session.commit()
+                session.expunge_all()
+                indexed += len(articles)
+                last_id = articles[-1].id
+
+            # Archived articles keep their search entries, indexed from the archive bodies
+            for record in self._iter_archived_records(session):
+                self.search_index.index_archived(
+                    session, record["id"], record.get("title"), record.get("summary"), record.get("content"),
+                )
+                indexed += 1
+                if indexed % batch_size == 0:
+                    session.commit()
+            session.commit()
+
+            logger.info(f"Rebuilt {self.search_index.name} search index ({indexed} articles)")
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error rebuilding search index: {str(e)}")
+        finally:
+            session.close()
+
+    @staticmethod
+    def _is_archived(session: Session, url: str) -> bool:
+        return session.query(ArchivedArticle.id).filter(ArchivedArticle.url == url).first() is not None
+
+    @staticmethod
+    def _archived_urls(session: Session, urls: List[str]) -> set:
+        if not urls:
+            return set()
+        rows = session.query(ArchivedArticle.url).filter(ArchivedArticle.url.in_(urls)).all()
+        return {row[0] for row in rows}
+
     def add_article(self, article_data: dict) -> Optional[Article]:
         """Add or update an article"""
-        session = self.SessionLocal()
+        session = self._session()
         try:
+            if self._is_archived(session, article_data["url"]):
+                logger.debug(f"Skipping archived article: {article_data['url']}")
+                return None
+
             # Check if article already exists
             existing = session.query(Article).filter(
                 Article.url == article_data["url"]
             ).first()
 
+            rollups = RollupAccumulator()
+
+            previous = None
             if existing:
                 # Update existing article
+                previous = self._search_fields(existing)
                 existing.updated_date = datetime.now(timezone.utc)
                 existing.summary = article_data.get("summary", existing.summary)
-                existing.content = article_data.get("content", existing.content)
-                existing.tags = self._serialize_tags(article_data.get("tags")) or existing.tags
+                if "content" in article_data:
+                    existing.set_content(article_data["content"])
+                old_relevance = existing.relevance_score
+                if article_data.get("relevance_score") is not None:
+                    existing.relevance_score = article_data["relevance_score"]
+                new_tags = self._serialize_tags(article_data.get("tags")) or existing.tags
+                rollups.update_tags(
+                    existing.published_date, existing.tags, new_tags,
+                    old_relevance, existing.relevance_score,
+                )
+                existing.tags = new_tags
                 logger.debug(f"Updated article: {article_data['title'][:50]}...")
             else:
                 # Create new article
@@ -67,14 +535,26 @@ class Database:
                     title=article_data["title"],
                     url=article_data["url"],
                     summary=article_data.get("summary", ""),
-                    content=article_data.get("content", ""),
                     source=article_data.get("source", "Unknown"),
                     published_date=article_data.get("published_date", datetime.now(timezone.utc)),
                     tags=self._serialize_tags(article_data.get("tags")),
+                    relevance_score=article_data.get("relevance_score"),
                 )
+                article.set_content(article_data.get("content", ""))
                 session.add(article)
+                rollups.add_article(
+                    article.published_date, article.source, article.tags, article.relevance_score,
+                )
                 logger.debug(f"Added article: {article_data['title'][:50]}...")
 
+            session.flush()
+            if not existing:
+                session.add(ArticleEvent(article_id=article.id))
+                if self.outbox_enabled:
+                    session.add(PublishOutbox(article_id=article.id))
+            self._index_for_search(session, existing or article, previous)
+            rollups.apply(session)
+            self._bump_generation(session)
             session.commit()
             return existing or article
 
@@ -83,15 +563,41 @@ class Database:
             logger.error(f"Error adding article: {str(e)}")
             return None
         finally:
-            session.close()
+            self._release(session)
 
-    def add_articles_batch(self, articles: List[dict]) -> int:
-        """Add multiple articles at once"""
-        session = self.SessionLocal()
-        added_count = 0
+    def add_articles_batch(
+        self,
+        articles: List[dict],
+        source_stats: Optional[dict] = None,
+        raise_errors: bool = False,
+    ) -> int:
+        """
+        Add multiple articles at once.
+
+        Args:
+            articles: Article data dicts
+            source_stats: Optional dict of source -> Counter; once the batch
+                commits, "added", "updated" and "skipped" (archived) counts
+                are added to it
+            raise_errors: Re-raise after rolling back a failed batch instead
+                of returning 0, so callers can retry the articles separately
+        """
+        session = self._session()
+        added = []
+        # Article -> its search fields before this batch (None if new); a URL
+        # repeated in the batch keeps the first, which is what is indexed
+        touched = {}
+        outcomes = []
+        rollups = RollupAccumulator()
 
         try:
+            archived_urls = self._archived_urls(session, [a["url"] for a in articles])
+
             for article_data in articles:
+                if article_data["url"] in archived_urls:
+                    outcomes.append((article_data.get("source", "Unknown"), "skipped"))
+                    continue
+
                 existing = session.query(Article).filter(
                     Article.url == article_data["url"]
                 ).first()
@@ -101,30 +607,144 @@ class Database:
                         title=article_data["title"],
                         url=article_data["url"],
                         summary=article_data.get("summary", ""),
-                        content=article_data.get("content", ""),
                         source=article_data.get("source", "Unknown"),
                         published_date=article_data.get("published_date", datetime.now(timezone.utc)),
                         tags=self._serialize_tags(article_data.get("tags")),
+                        relevance_score=article_data.get("relevance_score"),
                     )
+                    article.set_content(article_data.get("content", ""))
                     session.add(article)
-                    added_count += 1
+                    rollups.add_article(
+                        article.published_date, article.source, article.tags, article.relevance_score,
+                    )
+                    touched.setdefault(article, None)
+                    added.append(article)
+                    outcomes.append((article.source, "added"))
                 else:
+                    previous = self._search_fields(existing)
                     existing.summary = article_data.get("summary", existing.summary)
-                    existing.content = article_data.get("content", existing.content)
-                    serialized_tags = self._serialize_tags(article_data.get("tags"))
-                    if serialized_tags:
-                        existing.tags = serialized_tags
+                    if "content" in article_data:
+                        existing.set_content(article_data["content"])
+                    old_relevance = existing.relevance_score
+                    if article_data.get("relevance_score") is not None:
+                        existing.relevance_score = article_data["relevance_score"]
+                    serialized_tags = self._serialize_tags(article_data.get("tags")) or existing.tags
+                    rollups.update_tags(
+                        existing.published_date, existing.tags, serialized_tags,
+                        old_relevance, existing.relevance_score,
+                    )
+                    existing.tags = serialized_tags
+                    touched.setdefault(existing, previous)
+                    outcomes.append((existing.source, "updated"))
 
+            session.flush()
+            session.add_all([ArticleEvent(article_id=article.id) for article in added])
+            if self.outbox_enabled:
+                # Same transaction as the articles, so none can be ingested
+                # without also being queued for the blog
+                session.add_all([PublishOutbox(article_id=article.id) for article in added])
+            for article, previous in touched.items():
+                self._index_for_search(session, article, previous)
+            rollups.apply(session)
+            if touched:
+                self._bump_generation(session)
             session.commit()
-            logger.info(f"Added {added_count} new articles to database")
-            return added_count
+            if source_stats is not None:
+                for source, outcome in outcomes:
+                    source_stats.setdefault(source, Counter())[outcome] += 1
+            logger.info(f"Added {len(added)} new articles to database")
+            self._maybe_run_maintenance()
+            return len(added)
 
         except Exception as e:
             session.rollback()
             logger.error(f"Error adding articles batch: {str(e)}")
+            if raise_errors:
+                raise
             return 0
         finally:
-            session.close()
+            self._release(session)
+
+    def get_latest_event_id(self) -> int:
+        """Get the id of the newest article event, or 0 if there are none"""
+        session = self._session()
+
+        try:
+            return session.query(func.max(ArticleEvent.id)).scalar() or 0
+        except Exception as e:
+            logger.error(f"Error getting latest article event: {str(e)}")
+            return 0
+        finally:
+            self._release(session)
+
+    def get_article_events(
+        self,
+        after_id: int,
+        limit: int = 500,
+    ) -> List[Tuple[int, ArticleSummary]]:
+        """
+        Get articles ingested after an event id, oldest first.
+
+        Returns:
+            List of (event_id, article) tuples; archived articles are skipped
+        """
+        session = self._session()
+
+        try:
+            rows = (
+                session.query(ArticleEvent.id, *ArticleSummary.COLUMNS)
+                .join(Article, Article.id == ArticleEvent.article_id)
+                .filter(ArticleEvent.id > after_id)
+                .order_by(ArticleEvent.id)
+                .limit(limit)
+                .all()
+            )
+            return [(row[0], ArticleSummary.from_row(row[1:])) for row in rows]
+        except Exception as e:
+            logger.error(f"Error getting article events: {str(e)}")
+            return []
+        finally:
+            self._release(session)
+
+    def prune_article_events(self, older_than_hours: Optional[float] = None) -> int:
+        """Delete article events past the retention window"""
+        hours = Settings.EVENT_RETENTION_HOURS if older_than_hours is None else older_than_hours
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
+        session = self._session()
+
+        try:
+            deleted = (
+                session.query(ArticleEvent)
+                .filter(ArticleEvent.created_at < cutoff)
+                .delete(synchronize_session=False)
+            )
+            session.commit()
+            if deleted:
+                logger.info(f"Pruned {deleted} article events")
+            return deleted
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error pruning article events: {str(e)}")
+            return 0
+        finally:
+            self._release(session)
+
+    @staticmethod
+    def encode_cursor(published_date: datetime, article_id: int) -> str:
+        """Encode a listing position as an opaque pagination cursor"""
+        raw = f"{published_date.isoformat()}|{article_id}".encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+        """Decode a pagination cursor, raising ValueError if it is malformed"""
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+            published, article_id = raw.rsplit("|", 1)
+            return datetime.fromisoformat(published), int(article_id)
+        except (binascii.Error, UnicodeError, ValueError) as e:
+            raise ValueError(f"Invalid cursor: {cursor}") from e
 
     def get_articles(
         self,
@@ -132,60 +752,165 @@ class Database:
         offset: int = 0,
         source: Optional[str] = None,
         days_back: Optional[int] = None,
-    ) -> List[Article]:
-        """Get articles with optional filters"""
-        session = self.SessionLocal()
+        cursor: Optional[str] = None,
+        tag: Optional[str] = None,
+        published_after: Optional[datetime] = None,
+        published_before: Optional[datetime] = None,
+        min_relevance: Optional[float] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[ArticleSummary]:
+        """
+        Get article summaries with optional filters, newest first.
+
+        Every filter is applied in SQL, so a page is always full unless the
+        results run out. Pass the ``cursor`` returned by get_articles_page
+        to continue after the last row of a previous page; unlike
+        ``offset`` this costs the same on every page.
+
+        Args:
+            tag: Only articles carrying this exact tag
+            published_after: Inclusive lower bound on published_date
+            published_before: Exclusive upper bound on published_date
+            min_relevance: Minimum analyzer relevance score
+            fields: Subset of ArticleSummary.FIELDS to select; id and
+                published_date are always selected for cursors
+        """
+        fields = tuple(fields) if fields else None
+        cache_key = (
+            "articles", limit, offset, source, days_back, cursor,
+            tag, published_after, published_before, min_relevance, fields,
+        )
+        cached, cache_key = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        session = self._session()
 
         try:
-            query = session.query(Article).order_by(Article.published_date.desc())
+            if fields:
+                columns = [c for c in ArticleSummary.COLUMNS
+                           if c.key in fields or c.key in ("id", "published_date")]
+            else:
+                columns = ArticleSummary.COLUMNS
+            names = [c.key for c in columns]
+
+            query = session.query(*columns).order_by(
+                Article.published_date.desc(),
+                Article.id.desc(),
+            )
+
+            if cursor:
+                query = query.filter(
+                    tuple_(Article.published_date, Article.id) < tuple_(*self.decode_cursor(cursor))
+                )
 
             if source:
                 query = query.filter(Article.source == source)
 
+            if tag:
+                query = query.filter(self._tag_filter(tag))
+
             if days_back:
                 cutoff_date = datetime.now(timezone.utc) - timedelta(days=days_back)
                 query = query.filter(Article.published_date >= cutoff_date)
 
-            articles = query.limit(limit).offset(offset).all()
+            if published_after:
+                query = query.filter(Article.published_date >= published_after)
+
+            if published_before:
+                query = query.filter(Article.published_date < published_before)
+
+            if min_relevance is not None:
+                query = query.filter(Article.relevance_score >= min_relevance)
+
+            rows = query.limit(limit).offset(offset).all()
+            articles = [ArticleSummary(**dict(zip(names, row))) for row in rows]
+            self.read_cache.set(cache_key, articles)
             return articles
 
         except Exception as e:
             logger.error(f"Error retrieving articles: {str(e)}")
             return []
         finally:
-            session.close()
+            self._release(session)
+
+    @staticmethod
+    def _tag_filter(tag: str):
+        """Match one entry of the comma-separated tags column exactly"""
+        escaped = tag.strip().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        tags = func.replace(func.coalesce(Article.tags, ""), ", ", ",", type_=String)
+        return ("," + tags + ",").like(f"%,{escaped},%", escape="\\")
+
+    def get_articles_page(
+        self,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        **filters,
+    ) -> Tuple[List[ArticleSummary], Optional[str]]:
+        """
+        Get one keyset page of articles.
+
+        Returns:
+            Tuple of (articles, next_cursor); next_cursor is None on the last page
+        """
+        articles = self.get_articles(limit=limit + 1, cursor=cursor, **filters)
+        if len(articles) <= limit:
+            return articles, None
+
+        articles = articles[:limit]
+        last = articles[-1]
+        return articles, self.encode_cursor(last.published_date, last.id)
 
     def search_articles(
         self,
         keyword: str,
         limit: int = 50,
-    ) -> List[Article]:
-        """Search articles by keyword"""
-        session = self.SessionLocal()
+    ) -> List[ArticleSummary]:
+        """
+        Search articles by keyword.
+
+        Supports quoted phrases ("machine learning") and prefix terms
+        (quant*). Results are ranked best match first and carry a
+        highlighted ``snippet`` when the backend provides one.
+        """
+        session = self._session()
 
         try:
-            articles = (
-                session.query(Article)
-                .filter(
-                    (Article.title.ilike(f"%{keyword}%")) |
-                    (Article.summary.ilike(f"%{keyword}%")) |
-                    (Article.content.ilike(f"%{keyword}%"))
-                )
-                .order_by(Article.published_date.desc())
-                .limit(limit)
+            hits = self.search_index.search(session, keyword, limit)
+            if not hits:
+                return []
+
+            ids = [article_id for article_id, _ in hits]
+            rows = (
+                session.query(*ArticleSummary.COLUMNS)
+                .filter(Article.id.in_(ids))
                 .all()
             )
+            by_id = {row.id: ArticleSummary.from_row(row) for row in rows}
+
+            # Hits that are no longer hot fall through to archive stubs
+            missing = [article_id for article_id in ids if article_id not in by_id]
+            if missing:
+                stubs = session.query(ArchivedArticle).filter(ArchivedArticle.id.in_(missing)).all()
+                by_id.update({stub.id: stub.to_summary() for stub in stubs})
+
+            articles = []
+            for article_id, snippet in hits:
+                article = by_id.get(article_id)
+                if article is not None:
+                    article.snippet = snippet
+                    articles.append(article)
             return articles
 
         except Exception as e:
             logger.error(f"Error searching articles: {str(e)}")
             return []
         finally:
-            session.close()
+            self._release(session)
 
     def get_article_count(self) -> int:
         """Get total article count"""
-        session = self.SessionLocal()
+        session = self._session()
 
         try:
             count = session.query(func.count(Article.id)).scalar()
@@ -194,29 +919,804 @@ class Database:
             logger.error(f"Error getting article count: {str(e)}")
             return 0
         finally:
-            session.close()
+            self._release(session)
 
     def get_article_by_id(self, article_id: int) -> Optional[Article]:
         """Fetch a single article by ID"""
-        session = self.SessionLocal()
+        cache_key = ("article", article_id)
+        cached, cache_key = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        session = self._session()
 
         try:
-            return session.query(Article).filter(Article.id == article_id).first()
+            article = (
+                session.query(Article)
+                .options(joinedload(Article.body))
+                .filter(Article.id == article_id)
+                .first()
+            )
+            if article is not None:
+                # Cached instances are shared across threads, so detach them
+                # from the (possibly request-scoped) session first
+                session.expunge(article)
+            else:
+                article = self._get_archived_article(session, article_id)
+
+            if article is not None:
+                self.read_cache.set(cache_key, article)
+            return article
         except Exception as e:
             logger.error(f"Error retrieving article {article_id}: {str(e)}")
             return None
         finally:
-            session.close()
+            self._release(session)
+
+    def _get_archived_article(self, session: Session, article_id: int) -> Optional[Article]:
+        """Load an article from the cold archive as a transient Article"""
+        stub = session.get(ArchivedArticle, article_id)
+        if stub is None:
+            return None
+
+        record = self.archive.read(stub.partition, stub.offset, article_id)
+        if record is None:
+            return None
+
+        return self._article_from_record(record)
+
+    @staticmethod
+    def _parse_record_date(value) -> Optional[datetime]:
+        return datetime.fromisoformat(value) if value else None
+
+    @classmethod
+    def _article_from_record(cls, record: dict) -> Article:
+        """Rebuild a transient Article from an archive record"""
+        return Article(
+            id=record["id"],
+            title=record["title"],
+            url=record["url"],
+            summary=record.get("summary"),
+            content=record.get("content"),
+            source=record["source"],
+            published_date=cls._parse_record_date(record.get("published_date")),
+            crawled_date=cls._parse_record_date(record.get("crawled_date")),
+            updated_date=cls._parse_record_date(record.get("updated_date")),
+            relevant=record.get("relevant", True),
+            processed=record.get("processed", False),
+            tags=record.get("tags"),
+            relevance_score=record.get("relevance_score"),
+        )
+
+    def _iter_archived_records(self, session: Session) -> Iterator[dict]:
+        """
+        Yield the archive record of every stubbed article, once each.
+
+        A crash mid-archive can leave duplicate records, and records whose
+        rows were rolled back have no stub; both are skipped.
+        """
+        for partition in self.archive.partitions():
+            pending = {
+                row[0]
+                for row in session.query(ArchivedArticle.id)
+                .filter(ArchivedArticle.partition == partition)
+                .all()
+            }
+            for record in self.archive.iter_partition(partition):
+                if record.get("id") in pending:
+                    pending.discard(record["id"])
+                    yield record
+
+    @staticmethod
+    def _archive_record(article: Article) -> dict:
+        return {
+            "id": article.id,
+            "title": article.title,
+            "url": article.url,
+            "summary": article.summary,
+            "content": article.full_content,
+            "source": article.source,
+            "published_date": article.published_date.isoformat() if article.published_date else None,
+            "crawled_date": article.crawled_date.isoformat() if article.crawled_date else None,
+            "updated_date": article.updated_date.isoformat() if article.updated_date else None,
+            "relevant": article.relevant,
+            "processed": article.processed,
+            "tags": article.tags,
+            "relevance_score": article.relevance_score,
+        }
+
+    def archive_articles(
+        self,
+        older_than_days: Optional[int] = None,
+        batch_size: Optional[int] = None,
+    ) -> int:
+        """
+        Move articles past the retention window into the cold archive.
+
+        Each batch is appended to month-partitioned gzip JSONL files before
+        the rows are replaced by stubs, so a crash can duplicate archive
+        records but never lose an article. Search index entries and daily
+        rollups are kept, so search, detail pages and statistics still see
+        archived articles.
+
+        Returns:
+            int: Number of articles archived
+        """
+        days = Settings.ARCHIVE_AFTER_DAYS if older_than_days is None else older_than_days
+        batch_size = batch_size or Settings.ARCHIVE_BATCH_SIZE
+        if days <= 0:
+            return 0
+
+        cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+        archived = 0
+
+        while True:
+            session = self.SessionLocal()
+            try:
+                articles = (
+                    session.query(Article)
+                    .options(joinedload(Article.body))
+                    .filter(Article.published_date < cutoff)
+                    .order_by(Article.published_date, Article.id)
+                    .limit(batch_size)
+                    .all()
+                )
+                if not articles:
+                    break
+
+                partitions = {}
+                for article in articles:
+                    partitions.setdefault(partition_for(article.published_date), []).append(article)
+
+                for partition, group in partitions.items():
+                    offset = self.archive.append(partition, [self._archive_record(a) for a in group])
+                    for article in group:
+                        session.merge(ArchivedArticle(
+                            id=article.id,
+                            url=article.url,
+                            title=article.title,
+                            source=article.source,
+                            published_date=article.published_date,
+                            tags=article.tags,
+                            partition=partition,
+                            offset=offset,
+                        ))
+                session.flush()
+
+                self.search_index.archive_articles(session, [article.id for article in articles])
+                for article in articles:
+                    session.delete(article)
+
+                self._bump_generation(session)
+                session.commit()
+                archived += len(articles)
+            except Exception as e:
+                session.rollback()
+                logger.error(f"Error archiving articles: {str(e)}")
+                break
+            finally:
+                session.close()
+
+        if archived:
+            logger.info(f"Archived {archived} articles older than {days} days")
+        return archived
+
+    def migrate_legacy_content(self, batch_size: int = 500) -> int:
+        """
+        Move bodies still stored inline in articles.content into article_bodies.
+
+        SQLite only returns the freed pages to the OS after a VACUUM.
+
+        Returns:
+            int: Number of articles migrated
+        """
+        migrated = 0
+
+        while True:
+            session = self.SessionLocal()
+            try:
+                articles = (
+                    session.query(Article)
+                    .filter(Article.content.isnot(None), Article.content != "")
+                    .limit(batch_size)
+                    .all()
+                )
+                if not articles:
+                    return migrated
+
+                for article in articles:
+                    article.set_content(article.content)
+                session.commit()
+                migrated += len(articles)
+                logger.info(f"Migrated {migrated} article bodies to compressed storage")
+            except Exception as e:
+                session.rollback()
+                logger.error(f"Error migrating article content: {str(e)}")
+                return migrated
+            finally:
+                session.close()
+
+    def get_totals(self) -> dict:
+        """
+        Get article and source totals from the daily rollups.
+
+        Returns:
+            dict: total_articles and sources (sorted list)
+        """
+        session = self._session()
+
+        try:
+            rows = (
+                session.query(DailySourceCount.source, func.sum(DailySourceCount.article_count))
+                .group_by(DailySourceCount.source)
+                .all()
+            )
+            return {
+                "total_articles": int(sum(count or 0 for _, count in rows)),
+                "sources": sorted(source for source, count in rows if count),
+            }
+        except Exception as e:
+            logger.error(f"Error getting totals: {str(e)}")
+            return {"total_articles": 0, "sources": []}
+        finally:
+            self._release(session)
+
+    def get_daily_rollup(self, day) -> dict:
+        """
+        Get pre-aggregated counts for one day.
+
+        Returns:
+            dict: Counters keyed "sources", "tags" and "companies"
+        """
+        session = self._session()
+
+        try:
+            return summarize_day(session, day)
+        except Exception as e:
+            logger.error(f"Error getting daily rollup for {day}: {str(e)}")
+            return {"sources": Counter(), "tags": Counter(), "companies": Counter()}
+        finally:
+            self._release(session)
+
+    def get_day_texts(self, day) -> List[Tuple[str, str]]:
+        """Get (title, summary) pairs for articles published on one day"""
+        session = self._session()
+
+        try:
+            start = datetime.combine(day, datetime.min.time())
+            rows = (
+                session.query(Article.title, Article.summary)
+                .filter(Article.published_date >= start, Article.published_date < start + timedelta(days=1))
+                .all()
+            )
+            return [(title, summary) for title, summary in rows]
+        except Exception as e:
+            logger.error(f"Error getting texts for {day}: {str(e)}")
+            return []
+        finally:
+            self._release(session)
+
+    def iter_articles(
+        self,
+        since: datetime,
+        until: Optional[datetime] = None,
+        min_relevance: Optional[float] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[ArticleSummary]:
+        """
+        Stream articles published in a time window, without their bodies.
+
+        Rows are fetched batch_size at a time through a server-side cursor
+        where the driver supports one, so memory use does not grow with
+        the size of the window.
+        """
+        session = self._session()
+
+        try:
+            query = (
+                session.query(*ArticleSummary.COLUMNS)
+                .filter(Article.published_date >= since)
+            )
+            if until is not None:
+                query = query.filter(Article.published_date < until)
+            if min_relevance is not None:
+                query = query.filter(Article.relevance_score >= min_relevance)
+            for row in query.yield_per(batch_size):
+                yield ArticleSummary.from_row(row)
+        except Exception as e:
+            logger.error(f"Error streaming articles: {str(e)}")
+        finally:
+            self._release(session)
+
+    def get_daily_summary(self, day) -> Optional[dict]:
+        """
+        Get the stored dashboard summary for one day.
+
+        Returns:
+            dict with generation, payload and computed_at, or None
+        """
+        session = self._session()
+
+        try:
+            row = session.get(DailySummary, day)
+            if row is None:
+                return None
+            return {
+                "generation": row.generation,
+                "payload": json.loads(row.payload),
+                "computed_at": row.computed_at,
+            }
+        except Exception as e:
+            logger.error(f"Error getting daily summary for {day}: {str(e)}")
+            return None
+        finally:
+            self._release(session)
+
+    def save_daily_summary(self, day, generation: int, payload: dict) -> None:
+        """Store the dashboard summary for one day"""
+        session = self._session()
+
+        try:
+            session.merge(DailySummary(
+                day=day,
+                generation=generation,
+                payload=json.dumps(payload),
+                computed_at=datetime.now(timezone.utc),
+            ))
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error saving daily summary for {day}: {str(e)}")
+        finally:
+            self._release(session)
+
+    def get_tag_counts(self, since=None, before=None) -> Counter:
+        """
+        Get article counts per tag from the daily rollups.
+
+        Args:
+            since: Optional first day to include
+            before: Optional day to stop before (exclusive)
+        """
+        session = self._session()
+
+        try:
+            query = session.query(DailyTagCount.tag, func.sum(DailyTagCount.article_count))
+            if since is not None:
+                query = query.filter(DailyTagCount.day >= since)
+            if before is not None:
+                query = query.filter(DailyTagCount.day < before)
+            return Counter({
+                tag: int(count)
+                for tag, count in query.group_by(DailyTagCount.tag).all()
+                if count
+            })
+        except Exception as e:
+            logger.error(f"Error getting tag counts: {str(e)}")
+            return Counter()
+        finally:
+            self._release(session)
+
+    def get_tag_series(self, tag: str, since=None) -> List[Tuple]:
+        """
+        Get the daily rollup rows for one tag, oldest first.
+
+        Returns:
+            List of (day, article_count, relevance_sum, scored_count) tuples
+        """
+        session = self._session()
+
+        try:
+            query = (
+                session.query(
+                    DailyTagCount.day,
+                    DailyTagCount.article_count,
+                    DailyTagCount.relevance_sum,
+                    DailyTagCount.scored_count,
+                )
+                .filter(DailyTagCount.tag == tag)
+            )
+            if since is not None:
+                query = query.filter(DailyTagCount.day >= since)
+            return [
+                (day, count or 0, relevance_sum or 0.0, scored or 0)
+                for day, count, relevance_sum, scored in query.order_by(DailyTagCount.day).all()
+            ]
+        except Exception as e:
+            logger.error(f"Error getting series for tag {tag}: {str(e)}")
+            return []
+        finally:
+            self._release(session)
+
+    def get_published_urls(self, urls: Sequence[str]) -> set:
+        """Get which of the given URLs are already in the blog ledger"""
+        if not urls:
+            return set()
+        session = self._session()
+
+        try:
+            rows = (
+                session.query(PublishedArticle.url)
+                .filter(PublishedArticle.url.in_(list(urls)))
+                .all()
+            )
+            return {row[0] for row in rows}
+        except Exception as e:
+            logger.error(f"Error reading publish ledger: {str(e)}")
+            return set()
+        finally:
+            self._release(session)
+
+    def record_published(self, url: str, remote_id: Optional[str] = None) -> None:
+        """Add a URL to the blog ledger"""
+        session = self._session()
+
+        try:
+            session.merge(PublishedArticle(
+                url=url,
+                remote_id=remote_id,
+                published_at=datetime.now(timezone.utc),
+            ))
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error recording published article {url}: {str(e)}")
+        finally:
+            self._release(session)
+
+    def claim_outbox(self, limit: int, lease_seconds: float) -> List[Tuple[int, dict]]:
+        """
+        Claim due publish outbox rows for a drain worker.
+
+        Claimed rows are hidden from other workers until the lease expires,
+        so rows held by a worker that crashed are retried later.
+
+        Returns:
+            List of (outbox_id, article dict) tuples, oldest first
+        """
+        now = datetime.now(timezone.utc)
+        session = self._session()
+
+        try:
+            entries = (
+                session.query(PublishOutbox)
+                .filter(PublishOutbox.status == "pending")
+                .filter(PublishOutbox.next_attempt_at <= now)
+                .order_by(PublishOutbox.id)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+                .all()
+            )
+            if not entries:
+                session.commit()
+                return []
+
+            for entry in entries:
+                entry.attempts += 1
+                entry.next_attempt_at = now + timedelta(seconds=lease_seconds)
+
+            ids = [entry.article_id for entry in entries]
+            articles = {
+                article.id: article
+                for article in session.query(Article)
+                .options(joinedload(Article.body))
+                .filter(Article.id.in_(ids))
+                .all()
+            }
+            claimed = []
+            for entry in entries:
+                article = articles.get(entry.article_id)
+                if article is None:
+                    article = self._get_archived_article(session, entry.article_id)
+                if article is None:
+                    # Deleted since it was queued; nothing left to publish
+                    session.delete(entry)
+                    continue
+                claimed.append((entry.id, article.to_dict()))
+            session.commit()
+            return claimed
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error claiming publish outbox: {str(e)}")
+            return []
+        finally:
+            self._release(session)
+
+    def complete_outbox(self, outbox_ids: Sequence[int]) -> None:
+        """Remove published rows from the outbox"""
+        if not outbox_ids:
+            return
+        session = self._session()
+
+        try:
+            (
+                session.query(PublishOutbox)
+                .filter(PublishOutbox.id.in_(list(outbox_ids)))
+                .delete(synchronize_session=False)
+            )
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error completing publish outbox rows: {str(e)}")
+        finally:
+            self._release(session)
+
+    def defer_outbox(
+        self,
+        outbox_ids: Sequence[int],
+        base_delay: float,
+        max_delay: float,
+        max_attempts: int,
+        error: Optional[str] = None,
+    ) -> None:
+        """
+        Schedule failed outbox rows for retry, or park them once out of attempts.
+
+        The delay doubles with each attempt, starting at base_delay.
+        """
+        if not outbox_ids:
+            return
+        now = datetime.now(timezone.utc)
+        session = self._session()
+
+        try:
+            entries = (
+                session.query(PublishOutbox)
+                .filter(PublishOutbox.id.in_(list(outbox_ids)))
+                .all()
+            )
+            for entry in entries:
+                entry.last_error = error
+                if entry.attempts >= max_attempts:
+                    entry.status = "failed"
+                else:
+                    delay = min(base_delay * 2 ** max(entry.attempts - 1, 0), max_delay)
+                    entry.next_attempt_at = now + timedelta(seconds=delay)
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error deferring publish outbox rows: {str(e)}")
+        finally:
+            self._release(session)
+
+    def requeue_failed_outbox(self) -> int:
+        """
+        Move parked (failed) outbox rows back to pending with fresh attempts.
+
+        Returns:
+            int: Number of rows requeued
+        """
+        session = self._session()
+
+        try:
+            requeued = (
+                session.query(PublishOutbox)
+                .filter(PublishOutbox.status == "failed")
+                .update(
+                    {
+                        PublishOutbox.status: "pending",
+                        PublishOutbox.attempts: 0,
+                        PublishOutbox.next_attempt_at: datetime.now(timezone.utc),
+                    },
+                    synchronize_session=False,
+                )
+            )
+            session.commit()
+            if requeued:
+                logger.info(f"Requeued {requeued} failed outbox rows")
+            return requeued
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error requeueing publish outbox: {str(e)}")
+            return 0
+        finally:
+            self._release(session)
+
+    def get_outbox_counts(self) -> dict:
+        """Get the number of outbox rows per status"""
+        session = self._session()
+
+        try:
+            rows = (
+                session.query(PublishOutbox.status, func.count(PublishOutbox.id))
+                .group_by(PublishOutbox.status)
+                .all()
+            )
+            return dict(rows)
+        except Exception as e:
+            logger.error(f"Error counting publish outbox: {str(e)}")
+            return {}
+        finally:
+            self._release(session)
+
+    def record_crawl_run(self, run: dict, sources: List[dict]) -> Optional[int]:
+        """
+        Store the outcome of a crawl run and of each source in it.
+
+        Args:
+            run: CrawlRun column values
+            sources: CrawlSourceRun column values, one dict per source
+
+        Returns:
+            The new run id, or None on failure
+        """
+        session = self._session()
+
+        try:
+            crawl_run = CrawlRun(**run)
+            session.add(crawl_run)
+            session.flush()
+            session.add_all([CrawlSourceRun(run_id=crawl_run.id, **source) for source in sources])
+            session.commit()
+            return crawl_run.id
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error recording crawl run: {str(e)}")
+            return None
+        finally:
+            self._release(session)
+
+    def get_crawl_health(
+        self,
+        days: Optional[int] = None,
+        recent_hours: int = 24,
+        run_limit: int = 10,
+    ) -> dict:
+        """
+        Aggregate crawl history per source.
+
+        Args:
+            days: Window to aggregate over (default CRAWL_HEALTH_DAYS)
+            recent_hours: Shorter window compared against it, to spot
+                sources that are getting slower
+            run_limit: Number of latest runs to include
+
+        Returns:
+            dict with per-source aggregates and the latest runs
+        """
+        days = days or Settings.CRAWL_HEALTH_DAYS
+        now = datetime.now(timezone.utc)
+        since = now - timedelta(days=days)
+        recent_since = now - timedelta(hours=recent_hours)
+        session = self._session()
+
+        try:
+            rows = (
+                session.query(
+                    CrawlSourceRun.source,
+                    func.count(CrawlSourceRun.id),
+                    func.avg(CrawlSourceRun.duration_seconds),
+                    func.max(CrawlSourceRun.duration_seconds),
+                    func.sum(CrawlSourceRun.bytes_downloaded),
+                    func.sum(CrawlSourceRun.articles_parsed),
+                    func.sum(CrawlSourceRun.new_articles),
+                    func.sum(CrawlSourceRun.updated_articles),
+                    func.sum(CrawlSourceRun.skipped_articles),
+                    func.sum(CrawlSourceRun.errors),
+                    func.sum(case((CrawlSourceRun.errors > 0, 1), else_=0)),
+                    func.sum(case((CrawlSourceRun.not_modified, 1), else_=0)),
+                    func.max(CrawlSourceRun.id),
+                )
+                .filter(CrawlSourceRun.started_at >= since)
+                .group_by(CrawlSourceRun.source)
+                .all()
+            )
+            recent = dict(
+                session.query(CrawlSourceRun.source, func.avg(CrawlSourceRun.duration_seconds))
+                .filter(CrawlSourceRun.started_at >= recent_since)
+                .group_by(CrawlSourceRun.source)
+                .all()
+            )
+            latest = {
+                row.id: row
+                for row in session.query(CrawlSourceRun)
+                .filter(CrawlSourceRun.id.in_([row[-1] for row in rows]))
+                .all()
+            }
+
+            sources = []
+            for (source, runs, avg_duration, max_duration, bytes_total, parsed, new, updated,
+                 skipped, errors, failed_runs, not_modified, latest_id) in rows:
+                last = latest.get(latest_id)
+                recent_duration = recent.get(source)
+                sources.append({
+                    "source": source,
+                    "runs": runs,
+                    "avg_duration": round(avg_duration or 0.0, 3),
+                    "max_duration": round(max_duration or 0.0, 3),
+                    "recent_avg_duration": round(recent_duration, 3) if recent_duration is not None else None,
+                    "bytes_downloaded": bytes_total or 0,
+                    "articles_parsed": parsed or 0,
+                    "new_articles": new or 0,
+                    "updated_articles": updated or 0,
+                    "skipped_articles": skipped or 0,
+                    "new_per_run": round((new or 0) / runs, 3),
+                    "bytes_per_new_article": round(bytes_total / new) if new and bytes_total else None,
+                    "errors": errors or 0,
+                    "error_rate": round((failed_runs or 0) / runs, 4),
+                    "not_modified_rate": round((not_modified or 0) / runs, 4),
+                    "last_status": last.http_status if last else None,
+                    "last_error": last.error if last else None,
+                    "last_run_at": last.started_at.isoformat() if last else None,
+                })
+            sources.sort(key=lambda s: s["avg_duration"], reverse=True)
+
+            runs = (
+                session.query(CrawlRun)
+                .order_by(CrawlRun.started_at.desc())
+                .limit(run_limit)
+                .all()
+            )
+            return {
+                "window_days": days,
+                "recent_hours": recent_hours,
+                "sources": sources,
+                "runs": [
+                    {
+                        "id": run.id,
+                        "started_at": run.started_at.isoformat(),
+                        "duration_seconds": run.duration_seconds,
+                        "sources_crawled": run.sources_crawled,
+                        "not_modified": run.not_modified,
+                        "total_articles": run.total_articles,
+                        "relevant_articles": run.relevant_articles,
+                        "new_articles": run.new_articles,
+                        "errors": run.errors,
+                    }
+                    for run in runs
+                ],
+            }
+        except Exception as e:
+            logger.error(f"Error aggregating crawl health: {str(e)}")
+            return {"window_days": days, "recent_hours": recent_hours, "sources": [], "runs": []}
+        finally:
+            self._release(session)
+
+    def prune_crawl_runs(self, older_than_days: Optional[int] = None) -> int:
+        """Delete crawl history past the retention window"""
+        days = Settings.CRAWL_HISTORY_DAYS if older_than_days is None else older_than_days
+        cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+        session = self._session()
+
+        try:
+            old_runs = session.query(CrawlRun.id).filter(CrawlRun.started_at < cutoff)
+            (
+                session.query(CrawlSourceRun)
+                .filter(CrawlSourceRun.run_id.in_(old_runs.scalar_subquery()))
+                .delete(synchronize_session=False)
+            )
+            deleted = (
+                session.query(CrawlRun)
+                .filter(CrawlRun.started_at < cutoff)
+                .delete(synchronize_session=False)
+            )
+            session.commit()
+            if deleted:
+                logger.info(f"Pruned {deleted} crawl runs")
+            return deleted
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Error pruning crawl runs: {str(e)}")
+            return 0
+        finally:
+            self._release(session)
 
     def get_sources(self) -> List[str]:
         """Get list of unique sources"""
-        session = self.SessionLocal()
+        session = self._session()
 
         try:
-            sources = session.query(Article.source).distinct().all()
+            # The rollup table holds one row per source per day, which is far
+            # smaller than scanning articles for DISTINCT source
+            sources = (
+                session.query(DailySourceCount.source)
+                .filter(DailySourceCount.article_count > 0)
+                .distinct()
+                .all()
+            )
             return [s[0] for s in sources]
         except Exception as e:
             logger.error(f"Error getting sources: {str(e)}")
             return []
         finally:
-            session.close()
+            self._release(session)
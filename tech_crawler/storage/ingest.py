@@ -0,0 +1,174 @@
+"""Write-behind ingestion queue with a single batched writer"""
+
+import logging
+import queue
+import threading
+import time
+from collections import Counter
+from typing import Iterable, Optional
+
+from ..config import Settings
+from ..metrics import CRAWL_ERRORS, CRAWL_STAGE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class IngestQueue:
+    """
+    Bounded queue in front of Database.add_articles_batch.
+
+    Any number of producer threads enqueue analyzed articles; one writer
+    thread drains them and commits a batch once batch_size articles are
+    waiting or flush_interval seconds have passed since the first one.
+    With a single writer, crawl workers never contend on the database
+    write lock. put() blocks while the queue is full, which throttles
+    producers to the speed of the writer.
+    """
+
+    def __init__(
+        self,
+        db,
+        max_size: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+    ):
+        """Initialize queue for a Database"""
+        self.db = db
+        self.batch_size = batch_size or Settings.INGEST_BATCH_SIZE
+        self.flush_interval = flush_interval or Settings.INGEST_FLUSH_INTERVAL
+        self._queue = queue.Queue(maxsize=max_size or Settings.INGEST_QUEUE_SIZE)
+        self._writer: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+        self.stats = {
+            "enqueued": 0,
+            "written": 0,
+            "added": 0,
+            "batches": 0,
+            "errors": 0,
+        }
+        # source -> Counter of added/updated/skipped/errors, filled by the writer
+        self.source_stats = {}
+
+    def start(self) -> "IngestQueue":
+        """Start the writer thread"""
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = threading.Thread(
+                target=self._run,
+                name="ingest-writer",
+                daemon=True,
+            )
+            self._writer.start()
+        return self
+
+    def put(self, article: dict, timeout: Optional[float] = None) -> None:
+        """
+        Enqueue one article, blocking while the queue is full.
+
+        Raises:
+            queue.Full: If timeout elapses before space frees up
+        """
+        if self._writer is None:
+            raise RuntimeError("IngestQueue.start() must be called before put()")
+        self._queue.put(article, timeout=timeout)
+        with self._lock:
+            self.stats["enqueued"] += 1
+
+    def put_many(self, articles: Iterable[dict], timeout: Optional[float] = None) -> None:
+        """Enqueue several articles"""
+        for article in articles:
+            self.put(article, timeout=timeout)
+
+    def flush(self) -> None:
+        """Block until every enqueued article has been written"""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Flush pending articles and stop the writer thread"""
+        if self._writer is None:
+            return
+        self._queue.put(_STOP)
+        self._writer.join()
+        self._writer = None
+        logger.info(
+            f"Ingest queue closed - Written: {self.stats['written']}, "
+            f"Added: {self.stats['added']}, Batches: {self.stats['batches']}, "
+            f"Errors: {self.stats['errors']}"
+        )
+
+    def __enter__(self) -> "IngestQueue":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        """Writer loop: gather a batch, commit it, repeat until stopped"""
+        stopping = False
+
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                break
+
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    self._queue.task_done()
+                    break
+                batch.append(item)
+
+            self._write(batch)
+
+    def _write(self, batch: list) -> None:
+        try:
+            self._commit(batch)
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
+    def _commit(self, batch: list) -> None:
+        """
+        Commit a batch, splitting it in halves on failure.
+
+        Batches mix sources, so one article that cannot be stored must not
+        take the rest down with it. Retrying halves isolates it in about
+        log2(batch_size) extra commits; only the article itself is dropped
+        and counted as an error against its source.
+        """
+        try:
+            # Batches mix sources, so commits are timed under one "ingest" source
+            with CRAWL_STAGE_SECONDS.labels(source="ingest", stage="db_commit").time():
+                added = self.db.add_articles_batch(batch, self.source_stats, raise_errors=True)
+        except Exception as e:
+            if len(batch) > 1:
+                middle = len(batch) // 2
+                self._commit(batch[:middle])
+                self._commit(batch[middle:])
+                return
+
+            article = batch[0]
+            source = article.get("source", "Unknown")
+            logger.error(f"Error writing article {article.get('url')}: {str(e)}")
+            CRAWL_ERRORS.labels(source=source, stage="db_commit").inc()
+            with self._lock:
+                self.stats["errors"] += 1
+                self.source_stats.setdefault(source, Counter())["errors"] += 1
+            return
+
+        with self._lock:
+            self.stats["written"] += len(batch)
+            self.stats["added"] += added
+            self.stats["batches"] += 1
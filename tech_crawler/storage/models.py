@@ -1,9 +1,14 @@
 """Database models for articles"""
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, create_engine
-from sqlalchemy.orm import declarative_base
+from sqlalchemy import (
+    Column, Integer, Float, String, Text, Date, DateTime, Boolean, ForeignKey, Index,
+    LargeBinary, create_engine, inspect,
+)
+from sqlalchemy.orm import declarative_base, relationship
 from datetime import datetime, timezone
 
+from .compression import compress_text, decompress_text
+
 Base = declarative_base()
 
 
@@ -11,12 +16,21 @@ class Article(Base):
     """Article database model"""
 
     __tablename__ = "articles"
+    __table_args__ = (
+        # Keyset pagination walks (published_date, id) in descending order,
+        # optionally within a single source
+        Index("ix_articles_published_id", "published_date", "id"),
+        Index("ix_articles_source_published_id", "source", "published_date", "id"),
+        # Archived ids stay referenced by the search index and archive stubs,
+        # so SQLite must never hand them out again
+        {"sqlite_autoincrement": True},
+    )
 
     id = Column(Integer, primary_key=True)
     title = Column(String(500), nullable=False, index=True)
     url = Column(String(1000), unique=True, nullable=False, index=True)
     summary = Column(Text)
-    content = Column(Text)
+    content = Column(Text)  # Legacy inline body; new bodies live in article_bodies
     source = Column(String(100), nullable=False, index=True)
     published_date = Column(DateTime, nullable=False, index=True)
     crawled_date = Column(DateTime, default=lambda: datetime.now(timezone.utc))
@@ -24,10 +38,34 @@ class Article(Base):
     relevant = Column(Boolean, default=True)
     processed = Column(Boolean, default=False)
     tags = Column(String(500))  # Comma-separated tags
+    relevance_score = Column(Float, index=True)  # 0-1 from ArticleAnalyzer; NULL if not analyzed
+
+    body = relationship(
+        "ArticleBody",
+        uselist=False,
+        cascade="all, delete-orphan",
+        back_populates="article",
+    )
 
     def __repr__(self):
         return f"<Article(id={self.id}, title='{self.title[:50]}...')>"
 
+    @property
+    def full_content(self):
+        """Article body, decompressed from article_bodies when stored there"""
+        # Only use the relationship when it is already loaded so detached
+        # instances never trigger a lazy load
+        if "body" not in inspect(self).unloaded and self.body is not None:
+            return self.body.text
+        return self.content
+
+    def set_content(self, text) -> None:
+        """Store the article body compressed and clear the legacy column"""
+        if self.body is None:
+            self.body = ArticleBody()
+        self.body.text = text
+        self.content = None
+
     def to_dict(self):
         """Convert to dictionary"""
         return {
@@ -35,11 +73,316 @@ class Article(Base):
             "title": self.title,
             "url": self.url,
             "summary": self.summary,
-            "content": self.content,
+            "content": self.full_content,
             "source": self.source,
             "published_date": self.published_date.isoformat() if self.published_date else None,
             "crawled_date": self.crawled_date.isoformat() if self.crawled_date else None,
             "relevant": self.relevant,
             "processed": self.processed,
             "tags": self.tags.split(",") if self.tags else [],
+            "relevance_score": self.relevance_score,
+        }
+
+
+class ArticleBody(Base):
+    """Compressed article body, kept out of the hot articles table"""
+
+    __tablename__ = "article_bodies"
+
+    article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"), primary_key=True)
+    codec = Column(String(16), nullable=False)
+    data = Column(LargeBinary)
+    raw_size = Column(Integer, default=0)
+
+    article = relationship("Article", back_populates="body")
+
+    @property
+    def text(self) -> str:
+        """Decompressed body text"""
+        cached = self.__dict__.get("_text")
+        if cached is None:
+            cached = decompress_text(self.codec, self.data)
+            self.__dict__["_text"] = cached
+        return cached
+
+    @text.setter
+    def text(self, value) -> None:
+        value = value or ""
+        self.codec, self.data = compress_text(value)
+        self.raw_size = len(value)
+        self.__dict__["_text"] = value
+
+    def __repr__(self):
+        return f"<ArticleBody(article_id={self.article_id}, codec='{self.codec}', raw_size={self.raw_size})>"
+
+
+class ArchivedArticle(Base):
+    """Stub left behind for an article moved to the cold archive"""
+
+    __tablename__ = "archived_articles"
+
+    id = Column(Integer, primary_key=True)  # Original articles.id
+    url = Column(String(1000), unique=True, nullable=False, index=True)
+    title = Column(String(500), nullable=False)
+    source = Column(String(100), nullable=False)
+    published_date = Column(DateTime, nullable=False)
+    tags = Column(String(500))
+    partition = Column(String(7), nullable=False)  # YYYY-MM
+    offset = Column(Integer, nullable=False)  # Byte offset of the gzip member
+    archived_date = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+    def to_summary(self) -> "ArticleSummary":
+        """Build a listing record from the stub"""
+        return ArticleSummary(
+            id=self.id,
+            title=self.title,
+            url=self.url,
+            summary=None,
+            source=self.source,
+            published_date=self.published_date,
+            tags=self.tags,
+        )
+
+
+class ArticleEvent(Base):
+    """
+    Change log of newly ingested articles.
+
+    Written in the same transaction as the article, so web processes can
+    tail it by id to push new articles to live clients.
+    """
+
+    __tablename__ = "article_events"
+    __table_args__ = ({"sqlite_autoincrement": True},)
+
+    id = Column(Integer, primary_key=True)
+    article_id = Column(Integer, nullable=False)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), index=True)
+
+
+class PublishedArticle(Base):
+    """Ledger of articles already posted to the blog"""
+
+    __tablename__ = "published_articles"
+
+    url = Column(String(1000), primary_key=True)
+    remote_id = Column(String(200))  # Id returned by the blog API
+    published_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+
+class PublishOutbox(Base):
+    """
+    Articles waiting to be posted to the blog.
+
+    Rows are written in the same transaction as the article, so a crash
+    between ingest and publishing cannot lose one. The drain worker
+    deletes a row once the post succeeds.
+    """
+
+    __tablename__ = "publish_outbox"
+    __table_args__ = (
+        Index("ix_publish_outbox_due", "status", "next_attempt_at"),
+        {"sqlite_autoincrement": True},
+    )
+
+    id = Column(Integer, primary_key=True)
+    article_id = Column(Integer, nullable=False, unique=True)
+    status = Column(String(20), nullable=False, default="pending")  # "pending" or "failed"
+    attempts = Column(Integer, nullable=False, default=0)
+    # Claimed rows are pushed forward by the lease, so a crashed worker's
+    # rows become due again once it expires
+    next_attempt_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    last_error = Column(Text)
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+
+class CrawlRun(Base):
+    """One execution of the crawler across every source"""
+
+    __tablename__ = "crawl_runs"
+
+    id = Column(Integer, primary_key=True)
+    started_at = Column(DateTime, nullable=False, index=True)
+    finished_at = Column(DateTime)
+    duration_seconds = Column(Float)
+    sources_crawled = Column(Integer, default=0)
+    not_modified = Column(Integer, default=0)
+    total_articles = Column(Integer, default=0)
+    relevant_articles = Column(Integer, default=0)
+    new_articles = Column(Integer, default=0)
+    errors = Column(Integer, default=0)
+
+
+class CrawlSourceRun(Base):
+    """Outcome of one source within a crawl run"""
+
+    __tablename__ = "crawl_source_runs"
+    __table_args__ = (
+        Index("ix_crawl_source_runs_source_started", "source", "started_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    run_id = Column(Integer, ForeignKey("crawl_runs.id", ondelete="CASCADE"), nullable=False, index=True)
+    source = Column(String(100), nullable=False)
+    started_at = Column(DateTime, nullable=False, index=True)
+    duration_seconds = Column(Float)
+    http_status = Column(Integer)  # None when no response was received
+    not_modified = Column(Boolean, default=False)
+    bytes_downloaded = Column(Integer, default=0)
+    articles_parsed = Column(Integer, default=0)
+    articles_relevant = Column(Integer, default=0)
+    new_articles = Column(Integer, default=0)
+    updated_articles = Column(Integer, default=0)
+    skipped_articles = Column(Integer, default=0)  # Irrelevant or already archived
+    errors = Column(Integer, default=0)
+    error = Column(Text)  # Last error message, if any
+
+
+class StorageMeta(Base):
+    """Small key/value counters shared between the crawler and web processes"""
+
+    __tablename__ = "storage_meta"
+
+    key = Column(String(50), primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
+
+
+class DailySummary(Base):
+    """Precomputed dashboard summary for one day"""
+
+    __tablename__ = "daily_summaries"
+
+    day = Column(Date, primary_key=True)
+    generation = Column(Integer, nullable=False)  # Ingest generation it reflects
+    payload = Column(Text, nullable=False)  # JSON
+    computed_at = Column(DateTime, nullable=False)
+
+
+class DailySourceCount(Base):
+    """Articles ingested per day and source (maintained at ingest time)"""
+
+    __tablename__ = "daily_source_counts"
+
+    day = Column(Date, primary_key=True)
+    source = Column(String(100), primary_key=True)
+    article_count = Column(Integer, nullable=False, default=0)
+
+
+class DailyTagCount(Base):
+    """Articles per day and tag (maintained at ingest time)"""
+
+    __tablename__ = "daily_tag_counts"
+
+    day = Column(Date, primary_key=True)
+    tag = Column(String(100), primary_key=True)
+    article_count = Column(Integer, nullable=False, default=0)
+    # Sum and number of analyzer relevance scores, for average relevance
+    relevance_sum = Column(Float, default=0.0)
+    scored_count = Column(Integer, default=0)
+
+
+class DailyCompanyCount(Base):
+    """Articles per day mentioning a tracked company (maintained at ingest time)"""
+
+    __tablename__ = "daily_company_counts"
+
+    day = Column(Date, primary_key=True)
+    company = Column(String(100), primary_key=True)
+    article_count = Column(Integer, nullable=False, default=0)
+
+
+class ArticleSummary:
+    """
+    Read-only article record for listings.
+
+    Built from a column-projected query, so the article body is never
+    loaded. Use Database.get_article_by_id for the full Article.
+    """
+
+    __slots__ = (
+        "id",
+        "title",
+        "url",
+        "summary",
+        "source",
+        "published_date",
+        "crawled_date",
+        "relevant",
+        "tags",
+        "relevance_score",
+        "snippet",
+    )
+
+    # Columns selected for listings, in constructor order
+    COLUMNS = (
+        Article.id,
+        Article.title,
+        Article.url,
+        Article.summary,
+        Article.source,
+        Article.published_date,
+        Article.crawled_date,
+        Article.relevant,
+        Article.tags,
+        Article.relevance_score,
+    )
+    # Field names clients may select with ``fields=``
+    FIELDS = tuple(column.key for column in COLUMNS)
+
+    def __init__(
+        self,
+        id,
+        title=None,
+        url=None,
+        summary=None,
+        source=None,
+        published_date=None,
+        crawled_date=None,
+        relevant=True,
+        tags=None,
+        relevance_score=None,
+        snippet=None,
+    ):
+        self.id = id
+        self.title = title
+        self.url = url
+        self.summary = summary
+        self.source = source
+        self.published_date = published_date
+        self.crawled_date = crawled_date
+        self.relevant = relevant
+        self.tags = tags
+        self.relevance_score = relevance_score
+        self.snippet = snippet
+
+    @classmethod
+    def from_row(cls, row) -> "ArticleSummary":
+        """Build a record from a row selected with COLUMNS"""
+        return cls(*row)
+
+    def __repr__(self):
+        return f"<ArticleSummary(id={self.id}, title='{(self.title or '')[:50]}...')>"
+
+    def to_dict(self, fields=None):
+        """
+        Convert to dictionary (without article content).
+
+        Args:
+            fields: Optional field names to include; all fields if omitted
+        """
+        data = {
+            "id": self.id,
+            "title": self.title,
+            "url": self.url,
+            "summary": self.summary,
+            "source": self.source,
+            "published_date": self.published_date.isoformat() if self.published_date else None,
+            "crawled_date": self.crawled_date.isoformat() if self.crawled_date else None,
+            "relevant": self.relevant,
+            "tags": self.tags.split(",") if self.tags else [],
+            "relevance_score": self.relevance_score,
+            "snippet": self.snippet,
         }
+        if fields:
+            return {name: data[name] for name in fields if name in data}
+        return data
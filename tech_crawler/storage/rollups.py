@@ -0,0 +1,203 @@
+"""Pre-aggregated daily counts maintained alongside article writes"""
+
+import itertools
+import logging
+import re
+from collections import Counter, defaultdict
+from datetime import date, datetime, timezone
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import and_, case, func, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from .models import Article, DailyCompanyCount, DailySourceCount, DailyTagCount
+
+logger = logging.getLogger(__name__)
+
+# Company tags are written by ArticleAnalyzer as "TICKER (Name)"
+_COMPANY_TAG = re.compile(r"^[A-Z.]+ \(.+\)$")
+
+
+def is_company_tag(tag: str) -> bool:
+    """Return True for tags that name a tracked company"""
+    return bool(_COMPANY_TAG.match(tag))
+
+
+def split_tags(tags: Optional[str]) -> set:
+    """Split a stored comma-separated tag string into a set"""
+    if not tags:
+        return set()
+    return {t.strip() for t in tags.split(",") if t.strip()}
+
+
+def _increment(session: Session, model, key: dict, deltas: dict) -> None:
+    """
+    Add deltas to one rollup row in a single statement, creating it if missing.
+
+    The addition happens in SQL (UPDATE ... SET n = n + delta, or an
+    INSERT ... ON CONFLICT DO UPDATE where the dialect has one), so
+    concurrent writers cannot lose each other's increments. Counts are
+    clamped at zero.
+    """
+    table = model.__table__
+    changes = {}
+    values = dict(key, article_count=0)
+    for column, delta in deltas.items():
+        total = func.coalesce(table.c[column], 0) + delta
+        if column == "relevance_sum":
+            changes[column] = total
+            values[column] = delta
+        else:
+            changes[column] = case((total < 0, 0), else_=total)
+            values[column] = max(0, delta)
+
+    dialect = session.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        insert = sqlite_insert if dialect == "sqlite" else postgresql_insert
+        statement = insert(table).values(**values)
+        session.execute(statement.on_conflict_do_update(index_elements=list(key), set_=changes))
+        return
+
+    condition = and_(*(table.c[column] == value for column, value in key.items()))
+    if not session.execute(update(table).where(condition).values(**changes)).rowcount:
+        session.execute(table.insert().values(**values))
+
+
+def _as_day(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.now(timezone.utc).date()
+
+
+class RollupAccumulator:
+    """
+    Collects rollup deltas for one write transaction.
+
+    Deltas are merged in memory and applied with one atomic upsert per
+    touched row, so a batch costs a statement per distinct (day, key)
+    rather than per article.
+    """
+
+    def __init__(self):
+        self.sources: Dict[tuple, int] = defaultdict(int)
+        self.tags: Dict[tuple, int] = defaultdict(int)
+        self.companies: Dict[tuple, int] = defaultdict(int)
+        # (day, tag) -> [relevance_sum delta, scored_count delta]
+        self.tag_relevance: Dict[tuple, list] = defaultdict(lambda: [0.0, 0])
+
+    def add_article(
+        self,
+        published_date,
+        source: str,
+        tags: Optional[str],
+        relevance: Optional[float] = None,
+    ) -> None:
+        """Count a newly stored article"""
+        day = _as_day(published_date)
+        tag_set = split_tags(tags)
+        self.sources[(day, source)] += 1
+        self._add_tags(day, tag_set, 1)
+        self._add_relevance(day, tag_set, relevance, 1)
+
+    def update_tags(
+        self,
+        published_date,
+        old_tags: Optional[str],
+        new_tags: Optional[str],
+        old_relevance: Optional[float] = None,
+        new_relevance: Optional[float] = None,
+    ) -> None:
+        """Adjust tag counts after an existing article was re-tagged or re-scored"""
+        old, new = split_tags(old_tags), split_tags(new_tags)
+        if old == new and old_relevance == new_relevance:
+            return
+        day = _as_day(published_date)
+        self._add_tags(day, old - new, -1)
+        self._add_tags(day, new - old, 1)
+        self._add_relevance(day, old, old_relevance, -1)
+        self._add_relevance(day, new, new_relevance, 1)
+
+    def _add_tags(self, day: date, tags: Iterable[str], delta: int) -> None:
+        for tag in tags:
+            self.tags[(day, tag)] += delta
+            if is_company_tag(tag):
+                self.companies[(day, tag)] += delta
+
+    def _add_relevance(self, day: date, tags: Iterable[str], relevance: Optional[float], delta: int) -> None:
+        if relevance is None:
+            return
+        for tag in tags:
+            totals = self.tag_relevance[(day, tag)]
+            totals[0] += delta * relevance
+            totals[1] += delta
+
+    def apply(self, session: Session) -> None:
+        """Write accumulated deltas into the rollup tables"""
+        tag_rows = {key: {"article_count": delta} for key, delta in self.tags.items() if delta}
+        for key, (relevance_delta, scored_delta) in self.tag_relevance.items():
+            if scored_delta or relevance_delta:
+                tag_rows.setdefault(key, {}).update(relevance_sum=relevance_delta, scored_count=scored_delta)
+
+        for model, key_name, rows in (
+            (DailySourceCount, "source", {key: {"article_count": d} for key, d in self.sources.items() if d}),
+            (DailyTagCount, "tag", tag_rows),
+            (DailyCompanyCount, "company", {key: {"article_count": d} for key, d in self.companies.items() if d}),
+        ):
+            for (day, name), deltas in rows.items():
+                _increment(session, model, {"day": day, key_name: name}, deltas)
+
+        self.sources.clear()
+        self.tags.clear()
+        self.companies.clear()
+        self.tag_relevance.clear()
+
+
+def rebuild_rollups(session: Session, batch_size: int = 1000, archived: Iterable[tuple] = ()) -> int:
+    """
+    Recompute every rollup table from the articles table.
+
+    Args:
+        archived: (published_date, source, tags, relevance_score) rows for
+            articles moved out of the articles table, counted as well
+
+    Returns:
+        int: Number of articles counted
+    """
+    session.query(DailySourceCount).delete()
+    session.query(DailyTagCount).delete()
+    session.query(DailyCompanyCount).delete()
+
+    accumulator = RollupAccumulator()
+    counted = 0
+    rows = (
+        session.query(Article.published_date, Article.source, Article.tags, Article.relevance_score)
+        .yield_per(batch_size)
+    )
+    for published_date, source, tags, relevance in itertools.chain(rows, archived):
+        accumulator.add_article(published_date, source, tags, relevance)
+        counted += 1
+
+    accumulator.apply(session)
+    logger.info(f"Rebuilt daily rollups from {counted} articles")
+    return counted
+
+
+def summarize_day(session: Session, day: date) -> dict:
+    """Return source, tag and company counters for one day"""
+    def counter(model, key_column):
+        rows = (
+            session.query(key_column, model.article_count)
+            .filter(model.day == day, model.article_count > 0)
+            .all()
+        )
+        return Counter({key: count for key, count in rows})
+
+    return {
+        "sources": counter(DailySourceCount, DailySourceCount.source),
+        "tags": counter(DailyTagCount, DailyTagCount.tag),
+        "companies": counter(DailyCompanyCount, DailyCompanyCount.company),
+    }
@@ -0,0 +1,408 @@
+"""Full-text search backends for articles"""
+
+import html
+import logging
+import re
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from .models import Article, ArticleBody
+
+logger = logging.getLogger(__name__)
+
+# Private-use markers wrap matched terms in snippets so the surrounding text
+# can be HTML-escaped before the markers are turned into <mark> tags
+_MATCH_START = "\x02"
+_MATCH_END = "\x03"
+
+_TOKEN_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+_WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def parse_query(query: str) -> List[Tuple[str, List[str], bool]]:
+    """
+    Split a user query into search terms.
+
+    Double-quoted text becomes a phrase and a trailing ``*`` marks a prefix
+    term. Everything except word characters is dropped, so the result is
+    safe to embed in backend query syntax.
+
+    Returns:
+        List of (kind, words, is_prefix) tuples where kind is "phrase" or "word"
+    """
+    terms = []
+    for phrase, word in _TOKEN_PATTERN.findall(query or ""):
+        if phrase:
+            words = _WORD_PATTERN.findall(phrase)
+            if words:
+                terms.append(("phrase", words, False))
+        else:
+            is_prefix = word.endswith("*")
+            words = _WORD_PATTERN.findall(word)
+            if len(words) == 1:
+                terms.append(("word", words, is_prefix))
+            elif words:
+                # Hyphenated or dotted input ("gpt-4") reads as a phrase
+                terms.append(("phrase", words, False))
+    return terms
+
+
+def render_snippet(snippet: Optional[str]) -> Optional[str]:
+    """Escape a backend snippet and convert match markers to <mark> tags"""
+    if not snippet:
+        return None
+    escaped = html.escape(snippet)
+    return escaped.replace(_MATCH_START, "<mark>").replace(_MATCH_END, "</mark>")
+
+
+def make_snippet(texts: Sequence[Optional[str]], query: str, tokens: int = 16) -> Optional[str]:
+    """
+    Build a highlighted snippet for backends that do not keep the text.
+
+    Picks the text with the most query-term matches and returns a window
+    of about ``tokens`` words around the first match, rendered like
+    render_snippet. Terms match as word prefixes, a rough stand-in for
+    the index's stemming.
+    """
+    words = [word for _, term_words, _ in parse_query(query) for word in term_words]
+    if not words:
+        return None
+    pattern = re.compile(
+        r"\b(?:" + "|".join(re.escape(word) for word in words) + r")\w*",
+        re.IGNORECASE,
+    )
+
+    best, best_count = None, 0
+    for candidate in texts:
+        count = len(pattern.findall(candidate or ""))
+        if count > best_count:
+            best, best_count = candidate, count
+    if best is None:
+        return None
+
+    parts = best.split()
+    first = next(i for i, part in enumerate(parts) if pattern.search(part))
+    start = max(0, min(first - tokens // 4, len(parts) - tokens))
+    window = " ".join(parts[start:start + tokens])
+    window = pattern.sub(lambda m: f"{_MATCH_START}{m.group(0)}{_MATCH_END}", window)
+    if start > 0:
+        window = "…" + window
+    if start + tokens < len(parts):
+        window += "…"
+    return render_snippet(window)
+
+
+class SearchIndex:
+    """
+    Keyword search fallback using LIKE scans.
+
+    Matches titles and summaries only: bodies are stored compressed in
+    article_bodies, so a LIKE scan cannot see them.
+    """
+
+    name = "like"
+
+    def create(self, connection) -> bool:
+        """
+        Create backing structures if missing.
+
+        Returns:
+            bool: True if the index was just created and needs a rebuild
+        """
+        return False
+
+    def clear(self, connection) -> None:
+        """Remove every entry from the index ahead of a rebuild"""
+
+    def index_article(
+        self,
+        session: Session,
+        article_id: int,
+        title: str,
+        summary: str,
+        content: str,
+        previous: Optional[Tuple[str, str, str]] = None,
+    ) -> None:
+        """
+        Add or refresh one article in the index.
+
+        Args:
+            previous: (title, summary, content) as last indexed, when the
+                article is already in the index
+        """
+
+    def index_archived(
+        self,
+        session: Session,
+        article_id: int,
+        title: str,
+        summary: str,
+        content: str,
+    ) -> None:
+        """Add an article that only exists in the cold archive"""
+
+    def archive_articles(self, session: Session, article_ids: Sequence[int]) -> None:
+        """Keep index entries for articles about to be replaced by archive stubs"""
+
+    def search(
+        self,
+        session: Session,
+        query: str,
+        limit: int,
+    ) -> List[Tuple[int, Optional[str]]]:
+        """
+        Run a search.
+
+        Returns:
+            List of (article_id, snippet) tuples, best match first
+        """
+        terms = parse_query(query)
+        if not terms:
+            return []
+
+        filters = []
+        for _, words, _ in terms:
+            pattern = f"%{' '.join(words)}%"
+            filters.append(Article.title.ilike(pattern) | Article.summary.ilike(pattern))
+
+        rows = (
+            session.query(Article.id)
+            .filter(*filters)
+            .order_by(Article.published_date.desc())
+            .limit(limit)
+            .all()
+        )
+        return [(row[0], None) for row in rows]
+
+
+class SQLiteSearchIndex(SearchIndex):
+    """
+    SQLite FTS5 index with BM25 ranking.
+
+    The table is contentless (content=''), so it stores only the index and
+    not a second, uncompressed copy of every body. Refreshing an entry
+    therefore needs the values it was indexed with, and snippets are built
+    from the stored articles.
+    """
+
+    name = "fts5"
+    # Column weights for bm25(): title, summary, content
+    WEIGHTS = (10.0, 4.0, 1.0)
+
+    def create(self, connection) -> bool:
+        existing = connection.execute(
+            text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'articles_fts'")
+        ).first()
+        if existing and "content=''" in existing[0].replace(" ", ""):
+            return False
+        if existing:
+            # Tables from before the switch to contentless hold a full copy of every body
+            connection.execute(text("DROP TABLE articles_fts"))
+
+        connection.execute(text(
+            "CREATE VIRTUAL TABLE articles_fts USING fts5("
+            "title, summary, content, content = '', tokenize = 'porter unicode61')"
+        ))
+        return True
+
+    def clear(self, connection) -> None:
+        connection.execute(text("INSERT INTO articles_fts (articles_fts) VALUES ('delete-all')"))
+
+    def index_article(self, session, article_id, title, summary, content, previous=None) -> None:
+        if previous is not None:
+            old_title, old_summary, old_content = previous
+            session.execute(
+                text(
+                    "INSERT INTO articles_fts (articles_fts, rowid, title, summary, content) "
+                    "VALUES ('delete', :id, :title, :summary, :content)"
+                ),
+                {
+                    "id": article_id,
+                    "title": old_title or "",
+                    "summary": old_summary or "",
+                    "content": old_content or "",
+                },
+            )
+        session.execute(
+            text(
+                "INSERT INTO articles_fts (rowid, title, summary, content) "
+                "VALUES (:id, :title, :summary, :content)"
+            ),
+            {
+                "id": article_id,
+                "title": title or "",
+                "summary": summary or "",
+                "content": content or "",
+            },
+        )
+
+    def index_archived(self, session, article_id, title, summary, content) -> None:
+        # Entries are keyed by rowid alone, so archived ids index like hot ones
+        self.index_article(session, article_id, title, summary, content)
+
+    @staticmethod
+    def build_match(query: str) -> str:
+        """Translate a user query into FTS5 MATCH syntax"""
+        parts = []
+        for kind, words, is_prefix in parse_query(query):
+            quoted = '"' + " ".join(words) + '"'
+            parts.append(quoted + "*" if is_prefix else quoted)
+        return " ".join(parts)
+
+    def search(self, session, query, limit):
+        match = self.build_match(query)
+        if not match:
+            return []
+
+        weights = ", ".join(str(w) for w in self.WEIGHTS)
+        ids = [
+            row[0]
+            for row in session.execute(
+                text(
+                    "SELECT rowid FROM articles_fts WHERE articles_fts MATCH :match "
+                    f"ORDER BY bm25(articles_fts, {weights}) LIMIT :limit"
+                ),
+                {"match": match, "limit": limit},
+            ).all()
+        ]
+        if not ids:
+            return []
+
+        rows = (
+            session.query(Article.id, Article.title, Article.summary, Article.content, ArticleBody)
+            .outerjoin(ArticleBody, ArticleBody.article_id == Article.id)
+            .filter(Article.id.in_(ids))
+            .all()
+        )
+        texts = {
+            row[0]: (row[1], row[2], row[4].text if row[4] is not None else row[3])
+            for row in rows
+        }
+        return [(article_id, make_snippet(texts.get(article_id, ()), query)) for article_id in ids]
+
+
+class PostgresSearchIndex(SearchIndex):
+    """PostgreSQL tsvector index with ts_rank_cd ranking"""
+
+    name = "tsvector"
+    CONFIG = "english"
+
+    def create(self, connection) -> bool:
+        created = False
+        # Archived articles lose their articles row, so their vectors live on the stub
+        for table in ("articles", "archived_articles"):
+            exists = connection.execute(
+                text(
+                    "SELECT 1 FROM information_schema.columns "
+                    "WHERE table_name = :table AND column_name = 'search_vector'"
+                ),
+                {"table": table},
+            ).first()
+            if exists:
+                continue
+
+            connection.execute(text(f"ALTER TABLE {table} ADD COLUMN search_vector tsvector"))
+            connection.execute(text(
+                f"CREATE INDEX IF NOT EXISTS ix_{table}_search_vector "
+                f"ON {table} USING GIN (search_vector)"
+            ))
+            created = True
+        return created
+
+    def clear(self, connection) -> None:
+        connection.execute(text("UPDATE articles SET search_vector = NULL"))
+        connection.execute(text("UPDATE archived_articles SET search_vector = NULL"))
+
+    def _vector_sql(self, title: str, summary: str, content: str) -> str:
+        return (
+            f"setweight(to_tsvector('{self.CONFIG}', coalesce({title}, '')), 'A') || "
+            f"setweight(to_tsvector('{self.CONFIG}', coalesce({summary}, '')), 'B') || "
+            f"setweight(to_tsvector('{self.CONFIG}', coalesce({content}, '')), 'C')"
+        )
+
+    def index_article(self, session, article_id, title, summary, content, previous=None) -> None:
+        session.execute(
+            text(
+                "UPDATE articles SET search_vector = "
+                f"{self._vector_sql('CAST(:title AS text)', 'CAST(:summary AS text)', 'CAST(:content AS text)')} "
+                "WHERE id = :id"
+            ),
+            {"id": article_id, "title": title, "summary": summary, "content": content},
+        )
+
+    def index_archived(self, session, article_id, title, summary, content) -> None:
+        session.execute(
+            text(
+                "UPDATE archived_articles SET search_vector = "
+                f"{self._vector_sql('CAST(:title AS text)', 'CAST(:summary AS text)', 'CAST(:content AS text)')} "
+                "WHERE id = :id"
+            ),
+            {"id": article_id, "title": title, "summary": summary, "content": content},
+        )
+
+    def archive_articles(self, session, article_ids) -> None:
+        session.execute(
+            text(
+                "UPDATE archived_articles SET search_vector = a.search_vector "
+                "FROM articles a WHERE a.id = archived_articles.id AND a.id = ANY(:ids)"
+            ),
+            {"ids": list(article_ids)},
+        )
+
+    @staticmethod
+    def build_tsquery(query: str) -> str:
+        """Translate a user query into to_tsquery syntax"""
+        parts = []
+        for kind, words, is_prefix in parse_query(query):
+            if kind == "phrase":
+                parts.append("(" + " <-> ".join(words) + ")")
+            else:
+                parts.append(words[0] + (":*" if is_prefix else ""))
+        return " & ".join(parts)
+
+    def search(self, session, query, limit):
+        tsquery = self.build_tsquery(query)
+        if not tsquery:
+            return []
+
+        rows = session.execute(
+            text(
+                "SELECT a.id, ts_headline(:config, coalesce(a.summary, a.title), q, :options) "
+                "FROM (SELECT id, title, summary, search_vector FROM articles "
+                "UNION ALL SELECT id, title, NULL, search_vector FROM archived_articles) a, "
+                "to_tsquery(:config, :tsquery) q "
+                "WHERE a.search_vector @@ q "
+                "ORDER BY ts_rank_cd(a.search_vector, q) DESC LIMIT :limit"
+            ),
+            {
+                "config": self.CONFIG,
+                "tsquery": tsquery,
+                "options": f"StartSel={_MATCH_START}, StopSel={_MATCH_END}, MaxFragments=2",
+                "limit": limit,
+            },
+        ).all()
+        return [(row[0], render_snippet(row[1])) for row in rows]
+
+
+def create_search_index(engine) -> SearchIndex:
+    """Pick the best search backend available for the engine's dialect"""
+    dialect = engine.dialect.name
+
+    if dialect == "sqlite":
+        try:
+            with engine.connect() as connection:
+                connection.execute(text(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS temp.fts5_probe USING fts5(x)"
+                ))
+                connection.execute(text("DROP TABLE temp.fts5_probe"))
+            return SQLiteSearchIndex()
+        except Exception as e:
+            logger.warning(f"FTS5 unavailable, falling back to LIKE search: {str(e)}")
+            return SearchIndex()
+
+    if dialect == "postgresql":
+        return PostgresSearchIndex()
+
+    return SearchIndex()
@@ -0,0 +1,195 @@
+"""In-memory prefix index for search autocomplete"""
+
+import logging
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, List, Tuple
+
+from ..config import Settings
+from .rollups import is_company_tag
+
+logger = logging.getLogger(__name__)
+
+_WORD_START = re.compile(r"[\s_\-/]+")
+# Prefix matches examined per lookup before ranking
+_MAX_SCAN = 500
+
+
+def company_tag(name: str, ticker: str) -> str:
+    """Tag ArticleAnalyzer writes for a tracked company"""
+    return f"{ticker} ({name.lower().title()})"
+
+
+def trend_tag(trend: str) -> str:
+    """Tag ArticleAnalyzer writes for a tracked trend"""
+    return trend.lower().replace(" ", "_").upper()
+
+
+class Suggestion:
+    """One autocomplete entry"""
+
+    __slots__ = ("label", "kind", "tag", "query", "keys")
+
+    def __init__(self, label: str, kind: str, tag: str, query: str, keys: Tuple[str, ...]):
+        self.label = label
+        self.kind = kind  # "company", "trend" or "tag"
+        self.tag = tag  # Value for the tag filter
+        self.query = query  # Text to run a full-text search with
+        self.keys = keys  # Lowercased strings a prefix may match
+
+    def to_dict(self, count: int) -> dict:
+        return {
+            "label": self.label,
+            "kind": self.kind,
+            "tag": self.tag,
+            "query": self.query,
+            "count": count,
+        }
+
+
+def _keys_for(*names: str) -> Tuple[str, ...]:
+    """Index a name under its full text and every later word start"""
+    keys = set()
+    for name in names:
+        words = [w for w in _WORD_START.split(name.lower()) if w]
+        for i in range(len(words)):
+            keys.add(" ".join(words[i:]))
+    return tuple(sorted(keys))
+
+
+class SuggestIndex:
+    """
+    Sorted-array prefix index over tracked companies, trends and stored tags.
+
+    Lookups bisect into a sorted list of keys and rank the matches by how
+    many articles carry the tag. Counts come from the daily tag rollups:
+    days before today are read once and kept, and each refresh after new
+    ingest reads only today's rows. The key array is rebuilt only when a
+    previously unseen tag appears.
+    """
+
+    def __init__(self, db):
+        """Initialize index over a Database"""
+        self.db = db
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Suggestion] = {}
+        # (sorted keys, tag per key) and tag counts; replaced, never mutated,
+        # so lookups need no lock
+        self._index: Tuple[List[str], List[str]] = ([], [])
+        self._counts: Counter = Counter()
+        self._base_counts: Counter = Counter()
+        self._base_day = None
+        self._base_loaded_at = 0.0
+        self._generation = None
+
+        for company in Settings.TECH_COMPANIES:
+            name, ticker = company["name"], company["ticker"]
+            names = (name,) if ticker == "PRIVATE" else (name, ticker)
+            self._add_entry(Suggestion(
+                label=name if ticker == "PRIVATE" else f"{name} ({ticker})",
+                kind="company",
+                tag=company_tag(name, ticker),
+                query=name,
+                keys=_keys_for(*names),
+            ))
+        for trend in Settings.TECH_TRENDS:
+            self._add_entry(Suggestion(
+                label=trend.title() if trend.islower() else trend,
+                kind="trend",
+                tag=trend_tag(trend),
+                query=f'"{trend}"' if " " in trend else trend,
+                keys=_keys_for(trend),
+            ))
+        self._rebuild_keys()
+
+    def _add_entry(self, entry: Suggestion) -> None:
+        self._entries.setdefault(entry.tag, entry)
+
+    def _entry_for_tag(self, tag: str) -> Suggestion:
+        """Build an entry for a stored tag that is not in the settings"""
+        text = tag.replace("_", " ")
+        return Suggestion(
+            label=text,
+            kind="company" if is_company_tag(tag) else "tag",
+            tag=tag,
+            query=f'"{text}"' if " " in text else text,
+            keys=_keys_for(text),
+        )
+
+    def _rebuild_keys(self) -> None:
+        pairs = sorted(
+            (key, entry.tag)
+            for entry in self._entries.values()
+            for key in entry.keys
+        )
+        self._index = ([key for key, _ in pairs], [tag for _, tag in pairs])
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Pick up tag counts from newly ingested articles.
+
+        Returns:
+            bool: True if the index was refreshed
+        """
+        generation = self.db.get_ingest_state()[0]
+        if not force and generation == self._generation:
+            return False
+
+        with self._lock:
+            if not force and generation == self._generation:
+                return False
+
+            today = datetime.now(timezone.utc).date()
+            stale_base = time.monotonic() - self._base_loaded_at > Settings.SUGGEST_FULL_REFRESH_INTERVAL
+            if force or self._base_day != today or stale_base:
+                # Past days rarely change; re-read them on a new day or when
+                # the base is old, so re-tagged older articles are picked up
+                self._base_counts = self.db.get_tag_counts(before=today)
+                self._base_day = today
+                self._base_loaded_at = time.monotonic()
+
+            counts = self._base_counts + self.db.get_tag_counts(since=today)
+
+            new_tags = [tag for tag in counts if tag not in self._entries]
+            for tag in new_tags:
+                self._add_entry(self._entry_for_tag(tag))
+            if new_tags:
+                self._rebuild_keys()
+
+            self._counts = counts
+            self._generation = generation
+
+        if new_tags:
+            logger.debug(f"Suggest index added {len(new_tags)} tags")
+        return True
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[dict]:
+        """
+        Get the most popular entries with a key starting with prefix.
+
+        Returns:
+            List of suggestion dicts, most articles first
+        """
+        prefix = " ".join(w for w in _WORD_START.split((prefix or "").lower()) if w)
+        if not prefix:
+            return []
+
+        keys, tags = self._index
+        counts = self._counts
+
+        matches = set()
+        position = bisect_left(keys, prefix)
+        end = min(len(keys), position + _MAX_SCAN)
+        while position < end and keys[position].startswith(prefix):
+            matches.add(tags[position])
+            position += 1
+
+        ranked = sorted(
+            matches,
+            key=lambda tag: (-counts.get(tag, 0), self._entries[tag].label.lower()),
+        )
+        return [self._entries[tag].to_dict(counts.get(tag, 0)) for tag in ranked[:limit]]
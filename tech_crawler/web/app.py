@@ -1,86 +1,135 @@
 """Flask web application for Tech Investment Crawler"""
 
 import logging
-from datetime import datetime, timedelta
-from flask import Flask, render_template, request, jsonify
-from tech_crawler.storage import Database
-from tech_crawler.analysis import ArticleAnalyzer
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from functools import wraps
+from flask import Flask, g, render_template, request, jsonify, make_response
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from tech_crawler.config import Settings
+from tech_crawler.storage import Database, ArticleSummary
+from tech_crawler.storage.suggest import SuggestIndex
+from tech_crawler.analysis import ArticleAnalyzer, DailySummaryCache, build_series, series_start
+from tech_crawler.web.events import EventBroadcaster
+from tech_crawler.web.responses import init_responses
+from tech_crawler.metrics import (
+    CONTENT_TYPE as METRICS_CONTENT_TYPE, HTTP_REQUESTS, HTTP_REQUEST_SECONDS, exposition, web_registry,
+)
 
 logger = logging.getLogger(__name__)
 
 
-def create_app():
+def create_app(database_url: str = None):
     """Create and configure Flask application"""
     app = Flask(__name__, template_folder='templates', static_folder='static')
     app.config['JSON_SORT_KEYS'] = False
+    init_responses(app)
     
     # Initialize database
-    db = Database()
+    db = Database(database_url)
     analyzer = ArticleAnalyzer()
+    summary_cache = DailySummaryCache(db)
+    broadcaster = EventBroadcaster(db)
+    suggest_index = SuggestIndex(db)
+    app.extensions['article_events'] = broadcaster
+    app.extensions['database'] = db
+
+    @app.before_request
+    def start_request_timer():
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def record_request_metrics(response):
+        """Count the request and time it under its route pattern"""
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        HTTP_REQUESTS.labels(endpoint=endpoint, method=request.method, status=response.status_code).inc()
+        started = g.get('request_started')
+        if started is not None:
+            HTTP_REQUEST_SECONDS.labels(endpoint=endpoint).observe(time.perf_counter() - started)
+        return response
+
+    @app.before_request
+    def open_db_scope():
+        """Share one database session across the whole request"""
+        db.begin_request()
+
+    @app.teardown_request
+    def close_db_scope(error=None):
+        """Release the request's session back to the pool"""
+        db.end_request(error)
     
+    def parse_date_arg(name):
+        """Parse an ISO date or datetime query argument, raising ValueError if invalid"""
+        value = request.args.get(name)
+        if not value:
+            return None
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            raise ValueError(f"Invalid {name} date: {value}")
+
+    def parse_fields_arg():
+        """Parse the comma-separated fields argument, raising ValueError on unknown names"""
+        value = request.args.get('fields')
+        if not value:
+            return None
+        fields = [name.strip() for name in value.split(',') if name.strip()]
+        unknown = [name for name in fields if name not in ArticleSummary.FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        return fields
+
+    def conditional_get(view=None, daily=False):
+        """
+        Serve 304 Not Modified while the ingest generation is unchanged.
+
+        The ETag is the generation counter, so a repeat poll is answered
+        from the validator alone, without querying or serializing. With
+        daily=True the UTC date is part of it too, for views whose window
+        ends today. Last-Modified is sent for clients and caches that show
+        it, but only If-None-Match is honoured: a one-second date would hide
+        a change made within the same second.
+        """
+        if view is None:
+            return lambda inner: conditional_get(inner, daily=daily)
+
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            generation, updated_at = db.get_ingest_state()
+            etag = f"g{generation}"
+            if daily:
+                etag += f"-{datetime.now(timezone.utc).date().isoformat()}"
+
+            if request.if_none_match.contains_weak(etag):
+                response = app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            # Weak, since compression may change the bytes but not the data
+            response.set_etag(etag, weak=True)
+            if updated_at:
+                response.last_modified = datetime.fromtimestamp(updated_at, timezone.utc)
+            response.cache_control.public = True
+            response.cache_control.max_age = Settings.API_CACHE_MAX_AGE
+            response.cache_control.must_revalidate = True
+            return response
+
+        return wrapper
+
     @app.route('/')
     def index():
         """Home page with dashboard and daily summary"""
         try:
-            # Get statistics
-            total_articles = db.get_article_count()
-            sources = db.get_sources()
+            # Get statistics from the rollup tables
+            totals = db.get_totals()
+            total_articles = totals['total_articles']
+            sources = totals['sources']
 
-            # Get today's articles
-            today = datetime.utcnow().date()
-            articles_today = db.get_articles(limit=1000, days_back=1)
-            articles_today = [a for a in articles_today if a.published_date and a.published_date.date() == today]
-
-
-            # Generate summary
-            summary = f"<b>{len(articles_today)}</b> articles crawled today from <b>{len(set(a.source for a in articles_today))}</b> sources."
-            narrative = ""
-            topics_covered = []
-            if articles_today:
-                from collections import Counter
-                # Top sources
-                source_counts = Counter(a.source for a in articles_today)
-                top_sources = ', '.join([f"{src} ({cnt})" for src, cnt in source_counts.most_common(3)])
-                # Top tags
-                tag_list = []
-                for a in articles_today:
-                    if a.tags:
-                        tag_list.extend([t.strip() for t in a.tags.split(',') if t.strip()])
-                tag_counts = Counter(tag_list)
-                top_tags = ', '.join([f"{tag} ({cnt})" for tag, cnt in tag_counts.most_common(3)])
-                summary += f" Top sources: {top_sources}."
-                if top_tags:
-                    summary += f" Top tags: {top_tags}."
-
-                # Topics covered: top 10 tags
-                topics_covered = [tag for tag, _ in tag_counts.most_common(10)]
-
-                # Narrative summary
-                companies = [t for t in tag_list if t.isupper() and len(t) <= 6]
-                trends = [t for t in tag_list if t.isupper() and len(t) > 6]
-                company_counts = Counter(companies)
-                trend_counts = Counter(trends)
-                top_company = company_counts.most_common(1)
-                top_trend = trend_counts.most_common(1)
-
-                import re
-                words = []
-                for a in articles_today:
-                    words += re.findall(r'\b\w{5,}\b', (a.title or "") + " " + (a.summary or ""))
-                word_counts = Counter([w.lower() for w in words if w.lower() not in {"about","which","their","there","these","would","could","should","between","after","before","where","while","using","other","first","since","being","under","those","among","through","during","because","against","within","without","amongst","among","amongst"}])
-                top_words = ', '.join([w for w, _ in word_counts.most_common(3)])
-
-                narrative = "<b>Today's articles</b> covered topics such as "
-                if top_trend:
-                    narrative += f"<b>{top_trend[0][0].replace('_',' ').title()}</b>"
-                if top_company:
-                    narrative += f", with frequent mentions of <b>{top_company[0][0]}</b>"
-                if top_words:
-                    narrative += f", and discussed keywords like <b>{top_words}</b>"
-                narrative += "."
-            else:
-                narrative = "No articles crawled today."
-                topics_covered = []
+            # Today's summary is precomputed; it is only rebuilt when stale
+            day_summary = summary_cache.get()
 
             # Get recent relevant articles
             recent_articles = db.get_articles(limit=10, days_back=30)
@@ -94,7 +143,6 @@ def create_app():
                     'url': article.url,
                     'source': article.source,
                     'summary': article.summary[:200] + '...' if article.summary and len(article.summary) > 200 else article.summary,
-                    'content': article.content,
                     'published_date': article.published_date.strftime('%Y-%m-%d %H:%M') if article.published_date else 'N/A',
                     'tags': article.tags.split(',') if article.tags else [],
                 })
@@ -105,40 +153,63 @@ def create_app():
                 num_sources=len(sources),
                 sources=', '.join(sources),
                 articles=articles_data,
-                daily_summary=summary,
-                narrative_summary=narrative,
-                topics_covered=topics_covered,
+                daily_summary=day_summary['summary'],
+                narrative_summary=day_summary['narrative'],
+                topics_covered=day_summary['topics_covered'],
             )
         except Exception as e:
             logger.error(f"Error loading dashboard: {str(e)}")
             return render_template('error.html', error=str(e)), 500
     
     @app.route('/api/articles')
+    @conditional_get(daily=True)
     def api_articles():
         """API endpoint for articles"""
         try:
             # Get query parameters
             limit = request.args.get('limit', 20, type=int)
-            days_back = request.args.get('days', 30, type=int)
             source = request.args.get('source', None)
+            tag = request.args.get('tag', None)
+            cursor = request.args.get('cursor', None)
+            min_relevance = request.args.get('min_relevance', None, type=float)
             
             # Validate parameters
-            limit = min(limit, 100)  # Max 100 per request
+            limit = max(1, min(limit, 100))  # Max 100 per request
+            try:
+                if cursor:
+                    db.decode_cursor(cursor)
+                published_after = parse_date_arg('start')
+                published_before = parse_date_arg('end')
+                fields = parse_fields_arg()
+            except ValueError as e:
+                return jsonify({
+                    'success': False,
+                    'error': str(e),
+                }), 400
+            # An explicit start date replaces the default 30 day window
+            days_back = request.args.get('days', None if published_after else 30, type=int)
             
             # Query database
-            articles = db.get_articles(limit=limit, days_back=days_back)
-            
-            # Filter by source if provided
-            if source:
-                articles = [a for a in articles if a.source == source]
+            articles, next_cursor = db.get_articles_page(
+                limit=limit,
+                cursor=cursor,
+                source=source,
+                tag=tag,
+                days_back=days_back,
+                published_after=published_after,
+                published_before=published_before,
+                min_relevance=min_relevance,
+                fields=fields,
+            )
             
             # Format response
-            data = [a.to_dict() for a in articles]
+            data = [a.to_dict(fields) for a in articles]
             
             return jsonify({
                 'success': True,
                 'count': len(data),
                 'articles': data,
+                'next_cursor': next_cursor,
             })
         except Exception as e:
             logger.error(f"Error fetching articles: {str(e)}")
@@ -147,7 +218,31 @@ def create_app():
                 'error': str(e),
             }), 500
     
+    @app.route('/api/articles/<int:article_id>')
+    def api_article(article_id):
+        """API endpoint for a single article, including its full content"""
+        try:
+            article = db.get_article_by_id(article_id)
+
+            if not article:
+                return jsonify({
+                    'success': False,
+                    'error': 'Article not found',
+                }), 404
+
+            return jsonify({
+                'success': True,
+                'article': article.to_dict(),
+            })
+        except Exception as e:
+            logger.error(f"Error fetching article {article_id}: {str(e)}")
+            return jsonify({
+                'success': False,
+                'error': str(e),
+            }), 500
+    
     @app.route('/api/search')
+    @conditional_get
     def api_search():
         """API endpoint for searching articles"""
         try:
@@ -175,12 +270,84 @@ def create_app():
                 'error': str(e),
             }), 500
     
+    @app.route('/api/suggest')
+    @conditional_get
+    def api_suggest():
+        """API endpoint for search autocomplete on companies, trends and tags"""
+        try:
+            query = request.args.get('q', '').strip()
+            limit = max(1, min(request.args.get('limit', 8, type=int), 25))
+
+            suggest_index.refresh()
+            suggestions = suggest_index.suggest(query, limit)
+
+            return jsonify({
+                'success': True,
+                'query': query,
+                'suggestions': suggestions,
+            })
+        except Exception as e:
+            logger.error(f"Error getting suggestions: {str(e)}")
+            return jsonify({
+                'success': False,
+                'error': str(e),
+            }), 500
+    
+    @app.route('/api/trends')
+    @conditional_get(daily=True)
+    def api_trends():
+        """API endpoint for mention volume of one tag over time"""
+        try:
+            tag = request.args.get('tag', '').strip()
+            interval = request.args.get('interval', 'day')
+            days = max(1, min(request.args.get('days', 365, type=int), 3650))
+            window = request.args.get('window', None, type=int)
+
+            if not tag:
+                return jsonify({
+                    'success': False,
+                    'error': 'tag is required',
+                }), 400
+
+            end = datetime.now(timezone.utc).date()
+            start = end - timedelta(days=days - 1)
+            try:
+                buckets = build_series(
+                    # Weekly buckets reach back to the Monday before start
+                    db.get_tag_series(tag, since=series_start(start, interval)),
+                    start,
+                    end,
+                    interval=interval,
+                    window=max(1, window) if window else None,
+                )
+            except ValueError as e:
+                return jsonify({
+                    'success': False,
+                    'error': str(e),
+                }), 400
+
+            return jsonify({
+                'success': True,
+                'tag': tag,
+                'interval': interval,
+                'total': sum(b['count'] for b in buckets),
+                'buckets': buckets,
+            })
+        except Exception as e:
+            logger.error(f"Error fetching trends for {tag}: {str(e)}")
+            return jsonify({
+                'success': False,
+                'error': str(e),
+            }), 500
+    
     @app.route('/api/stats')
+    @conditional_get
     def api_stats():
         """API endpoint for statistics"""
         try:
-            total = db.get_article_count()
-            sources = db.get_sources()
+            totals = db.get_totals()
+            total = totals['total_articles']
+            sources = totals['sources']
             recent = db.get_articles(limit=1, days_back=0)
             
             return jsonify({
@@ -197,6 +364,112 @@ def create_app():
                 'error': str(e),
             }), 500
     
+    @app.route('/api/crawl-health')
+    def api_crawl_health():
+        """API endpoint for per-source crawl performance from the run history"""
+        try:
+            days = request.args.get('days', None, type=int)
+            if days is not None:
+                days = max(1, min(days, 365))
+            recent_hours = max(1, min(request.args.get('recent_hours', 24, type=int), 24 * 30))
+            runs = max(0, min(request.args.get('runs', 10, type=int), 100))
+
+            return jsonify({
+                'success': True,
+                **db.get_crawl_health(days=days, recent_hours=recent_hours, run_limit=runs),
+            })
+        except Exception as e:
+            logger.error(f"Error fetching crawl health: {str(e)}")
+            return jsonify({
+                'success': False,
+                'error': str(e),
+            }), 500
+
+    @app.route('/metrics')
+    def metrics():
+        """Prometheus metrics for every worker plus the crawler's last textfile export"""
+        # Cache and stream figures belong to the worker answering this scrape
+        cache = db.cache_stats()
+        scraped = [
+            CounterMetricFamily('db_read_cache_hits_total', 'Read cache hits', value=cache['hits']),
+            CounterMetricFamily('db_read_cache_misses_total', 'Read cache misses', value=cache['misses']),
+            GaugeMetricFamily('db_read_cache_entries', 'Entries in the read cache', value=cache['size']),
+            GaugeMetricFamily('article_stream_clients', 'Connected /api/stream clients',
+                              value=broadcaster.subscriber_count),
+        ]
+
+        exported = ''
+        path = Settings.METRICS_TEXTFILE
+        if path and os.path.exists(path):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    exported = f.read()
+            except OSError as e:
+                logger.error(f"Error reading crawler metrics: {str(e)}")
+
+        try:
+            body = exposition(web_registry(), scraped, exported)
+        except ValueError as e:
+            # A truncated or hand-edited textfile must not take /metrics down
+            logger.error(f"Error parsing crawler metrics: {str(e)}")
+            body = exposition(web_registry(), scraped)
+
+        response = make_response(body)
+        response.headers['Content-Type'] = METRICS_CONTENT_TYPE
+        response.headers['Cache-Control'] = 'no-store'
+        return response
+
+    @app.route('/api/stream')
+    def api_stream():
+        """Server-Sent Events stream of newly ingested articles"""
+        if broadcaster.subscriber_count >= Settings.stream_client_limit():
+            return jsonify({
+                'success': False,
+                'error': 'Too many stream clients',
+            }), 503
+
+        # The browser resends Last-Event-ID itself; a client that had to open
+        # a new EventSource passes it as a query argument instead
+        last_event_id = request.headers.get('Last-Event-ID', type=int)
+        if last_event_id is None:
+            last_event_id = request.args.get('last_event_id', type=int)
+        subscription = broadcaster.subscribe()
+
+        # Replay what a reconnecting client missed; events that also arrive
+        # through the subscription are skipped by id below
+        backlog = []
+        if last_event_id is not None:
+            backlog = [
+                (event_id, article.to_dict())
+                for event_id, article in db.get_article_events(last_event_id)
+            ]
+
+        dumps = app.json.dumps
+
+        def generate():
+            last_sent = last_event_id or 0
+            try:
+                yield "retry: 5000\n\n"
+                batch = backlog
+                while not subscription.closed:
+                    if batch is None:
+                        # Comment lines keep proxies open and reveal closed clients
+                        yield ": keepalive\n\n"
+                    else:
+                        for event_id, article in batch:
+                            if event_id <= last_sent:
+                                continue
+                            last_sent = event_id
+                            yield f"id: {event_id}\nevent: article\ndata: {dumps(article)}\n\n"
+                    batch = subscription.get(timeout=Settings.STREAM_HEARTBEAT_INTERVAL)
+            finally:
+                broadcaster.unsubscribe(subscription)
+
+        response = app.response_class(generate(), mimetype='text/event-stream')
+        response.headers['Cache-Control'] = 'no-cache'
+        response.headers['X-Accel-Buffering'] = 'no'
+        return response
+    
     @app.route('/articles')
     def articles():
         """Articles listing page"""
@@ -234,7 +507,7 @@ def create_app():
             return render_template(
                 'article_detail.html',
                 article=article.to_dict(),
-                full_content=article.content or article.summary,
+                full_content=article.full_content or article.summary,
             )
         except Exception as e:
             logger.error(f"Error loading article: {str(e)}")
@@ -261,4 +534,4 @@ if __name__ == '__main__':
     )
     
     app = create_app()
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    app.run(debug=Settings.DEBUG, host=Settings.WEB_HOST, port=Settings.WEB_PORT)
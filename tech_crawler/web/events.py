@@ -0,0 +1,148 @@
+"""Live fan-out of newly ingested articles to Server-Sent Events clients"""
+
+import logging
+import queue
+import threading
+from typing import List, Optional, Tuple
+
+from ..config import Settings
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """One client's view of the article event stream"""
+
+    def __init__(self, max_size: int):
+        """Initialize subscription with a bounded backlog"""
+        self.queue = queue.Queue(maxsize=max_size)
+        self.closed = False
+
+    def push(self, events: List[Tuple[int, dict]]) -> bool:
+        """
+        Queue a batch of events without blocking the broadcaster.
+
+        Returns:
+            bool: False if the client fell too far behind and was closed
+        """
+        try:
+            self.queue.put_nowait(events)
+            return True
+        except queue.Full:
+            self.close()
+            return False
+
+    def get(self, timeout: float) -> Optional[List[Tuple[int, dict]]]:
+        """Wait for the next batch of events, or None on timeout"""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self) -> None:
+        """Mark the subscription closed; the stream ends on its next wakeup"""
+        self.closed = True
+
+
+class EventBroadcaster:
+    """
+    Tails the article_events table and fans batches out to subscribers.
+
+    A single thread per process watches the ingest generation counter and
+    reads new events only when it moves, so the database sees one query
+    per ingest batch however many clients are connected. The thread
+    starts with the first subscriber, which keeps it out of the gunicorn
+    master when the app is preloaded.
+    """
+
+    def __init__(self, db, poll_interval: Optional[float] = None, batch_size: int = 500):
+        """Initialize broadcaster over a Database"""
+        self.db = db
+        self.poll_interval = Settings.STREAM_POLL_INTERVAL if poll_interval is None else poll_interval
+        self.batch_size = batch_size
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self._last_id = 0
+        self._generation = None
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def subscribe(self) -> Subscription:
+        """Register a client and start the tailing thread if needed"""
+        subscription = Subscription(Settings.STREAM_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers.add(subscription)
+            if self._thread is None or not self._thread.is_alive():
+                # Start from the current tail; clients replay older events
+                # themselves via Last-Event-ID
+                self._last_id = self.db.get_latest_event_id()
+                self._generation = self.db.get_ingest_state()[0]
+                self._stop.clear()
+                self._thread = threading.Thread(
+                    target=self._run, name="article-events", daemon=True
+                )
+                self._thread.start()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a client"""
+        subscription.close()
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def stop(self) -> None:
+        """Stop the tailing thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_interval + 1)
+
+    def poll(self) -> int:
+        """
+        Read new events once and deliver them.
+
+        Returns:
+            int: Number of events delivered
+        """
+        generation = self.db.get_ingest_state()[0]
+        if generation == self._generation:
+            return 0
+        self._generation = generation
+
+        if not self.subscriber_count:
+            # Nobody is listening; move past the new events without reading them
+            self._last_id = self.db.get_latest_event_id()
+            return 0
+
+        delivered = 0
+        while True:
+            rows = self.db.get_article_events(self._last_id, self.batch_size)
+            if not rows:
+                break
+            self._last_id = rows[-1][0]
+            events = [(event_id, article.to_dict()) for event_id, article in rows]
+            self._publish(events)
+            delivered += len(events)
+            if len(rows) < self.batch_size:
+                break
+        return delivered
+
+    def _publish(self, events: List[Tuple[int, dict]]) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            if not subscription.push(events):
+                logger.warning("Dropping slow article stream client")
+                self.unsubscribe(subscription)
+
+    def _run(self) -> None:
+        logger.info("Article event broadcaster started")
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.poll()
+            except Exception as e:
+                logger.error(f"Error broadcasting article events: {str(e)}")
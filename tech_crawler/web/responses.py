@@ -0,0 +1,125 @@
+"""JSON serialization and compression for web responses"""
+
+import gzip
+import logging
+
+from flask import Flask, request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+from ..config import Settings
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "image/svg+xml",
+    "text/",
+)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider that serializes with orjson when it is installed.
+
+    Falls back to the stdlib encoder when orjson is missing, when
+    JSON_SERIALIZER=stdlib, or when pretty output is requested.
+    """
+
+    # Keep keys in insertion order, as the views build them
+    sort_keys = False
+
+    def __init__(self, app: Flask):
+        super().__init__(app)
+        backend = Settings.JSON_SERIALIZER.lower()
+        if backend == "orjson" and orjson is None:
+            logger.warning("JSON serializer 'orjson' unavailable, using stdlib json")
+        self.use_orjson = orjson is not None and backend in ("auto", "orjson")
+
+    def _orjson_dumps(self, obj) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option)
+
+    def dumps(self, obj, **kwargs) -> str:
+        if not self.use_orjson or kwargs.get("indent") or kwargs.get("cls"):
+            return super().dumps(obj, **kwargs)
+        return self._orjson_dumps(obj).decode("utf-8")
+
+    def response(self, *args, **kwargs):
+        compact = self.compact or (self.compact is None and not self._app.debug)
+        if not self.use_orjson or not compact:
+            return super().response(*args, **kwargs)
+
+        # orjson produces bytes; hand them to the response without a str round trip
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._orjson_dumps(obj) + b"\n", mimetype=self.mimetype)
+
+
+def choose_encoding(accept_encodings) -> str:
+    """Pick the best supported content coding the client accepts, or None"""
+    offered = ["br", "gzip"] if brotli is not None else ["gzip"]
+    return accept_encodings.best_match(offered)
+
+
+def compress_body(data: bytes, encoding: str) -> bytes:
+    """Compress a response body with the given content coding"""
+    level = Settings.RESPONSE_COMPRESSION_LEVEL
+    if encoding == "br":
+        # Brotli quality runs 0-11; scale the shared gzip-style level to it
+        return brotli.compress(data, quality=min(11, level + 2))
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def compress_response(response):
+    """
+    Compress a response body negotiated via Accept-Encoding.
+
+    Skips bodiless and streamed responses, already-encoded bodies and
+    anything under RESPONSE_COMPRESSION_MIN_SIZE bytes.
+    """
+    if response.status_code < 200 or response.status_code in (204, 304):
+        return response
+    if response.direct_passthrough or response.is_streamed:
+        return response
+    if "Content-Encoding" in response.headers:
+        return response
+    if not (response.mimetype or "").startswith(COMPRESSIBLE_TYPES):
+        return response
+
+    response.vary.add("Accept-Encoding")
+
+    min_size = Settings.RESPONSE_COMPRESSION_MIN_SIZE
+    if min_size < 0 or (response.content_length or 0) < min_size:
+        return response
+
+    encoding = choose_encoding(request.accept_encodings)
+    if not encoding:
+        return response
+
+    response.set_data(compress_body(response.get_data(), encoding))
+    response.headers["Content-Encoding"] = encoding
+
+    # The bytes on the wire changed, so a strong validator no longer holds
+    etag, is_weak = response.get_etag()
+    if etag and not is_weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_responses(app: Flask) -> None:
+    """Install the fast JSON provider and response compression on an app"""
+    app.json_provider_class = FastJSONProvider
+    app.json = FastJSONProvider(app)
+    app.after_request(compress_response)
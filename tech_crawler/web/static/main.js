@@ -4,6 +4,7 @@
 
 document.addEventListener('DOMContentLoaded', function() {
     console.log('Tech Investment Crawler web interface loaded');
+    document.querySelectorAll('input[list="search-suggestions"]').forEach(input => initializeSearchSuggestions(input));
 });
 
 /**
@@ -67,13 +68,15 @@ function highlightText(text, searchTerm) {
 }
 
 /**
- * Fetch articles from API
+ * Fetch one page of articles from API.
+ * Resolves to { articles, nextCursor }; pass nextCursor back to get the following page.
  */
-async function fetchArticles(options = {}) {
+async function fetchArticlesPage(options = {}) {
     const {
         limit = 20,
         days = 30,
         source = null,
+        cursor = null,
     } = options;
 
     try {
@@ -81,6 +84,7 @@ async function fetchArticles(options = {}) {
         url.searchParams.append('limit', limit);
         url.searchParams.append('days', days);
         if (source) url.searchParams.append('source', source);
+        if (cursor) url.searchParams.append('cursor', cursor);
 
         const response = await fetch(url);
         const data = await response.json();
@@ -89,13 +93,21 @@ async function fetchArticles(options = {}) {
             throw new Error(data.error || 'Failed to fetch articles');
         }
 
-        return data.articles;
+        return { articles: data.articles, nextCursor: data.next_cursor || null };
     } catch (error) {
         console.error('Error fetching articles:', error);
         throw error;
     }
 }
 
+/**
+ * Fetch articles from API
+ */
+async function fetchArticles(options = {}) {
+    const page = await fetchArticlesPage(options);
+    return page.articles;
+}
+
 /**
  * Search articles
  */
@@ -123,6 +135,58 @@ async function searchArticles(query) {
     }
 }
 
+/**
+ * Fetch autocomplete suggestions for a search prefix
+ */
+async function fetchSuggestions(prefix, limit = 8) {
+    const url = new URL('/api/suggest', window.location.origin);
+    url.searchParams.append('q', prefix);
+    url.searchParams.append('limit', limit);
+
+    const response = await fetch(url);
+    const data = await response.json();
+
+    if (!data.success) {
+        throw new Error(data.error || 'Failed to fetch suggestions');
+    }
+
+    return data.suggestions;
+}
+
+/**
+ * Fill a search input's datalist with suggestions as the user types
+ */
+function initializeSearchSuggestions(input, delay = 150) {
+    const list = input.list;
+    if (!list) return;
+
+    let timer = null;
+    let latest = '';
+
+    input.addEventListener('input', () => {
+        clearTimeout(timer);
+        const prefix = input.value.trim();
+        if (!prefix) {
+            list.innerHTML = '';
+            return;
+        }
+
+        timer = setTimeout(async () => {
+            latest = prefix;
+            try {
+                const suggestions = await fetchSuggestions(prefix);
+                // Ignore responses that arrive after the user kept typing
+                if (prefix !== latest) return;
+                list.innerHTML = suggestions
+                    .map(s => `<option value="${escapeHtml(s.query)}">${escapeHtml(s.label)} (${s.count})</option>`)
+                    .join('');
+            } catch (error) {
+                console.error('Error fetching suggestions:', error);
+            }
+        }, delay);
+    });
+}
+
 /**
  * Get database statistics
  */
@@ -142,6 +206,67 @@ async function getStats() {
     }
 }
 
+/**
+ * Subscribe to newly ingested articles pushed over Server-Sent Events.
+ * Calls onArticle(article) for each new article. The browser retries
+ * dropped connections itself, but gives up on a non-200 answer such as
+ * the 503 sent when a worker is at its stream limit; then a new
+ * EventSource is opened after a growing delay, resuming from the last
+ * event seen.
+ * Returns an object whose close() stops the subscription.
+ */
+function subscribeToArticles(onArticle) {
+    if (!window.EventSource) return null;
+
+    const subscription = {
+        source: null,
+        lastEventId: null,
+        delay: 5000,
+        timer: null,
+        closed: false,
+        close() {
+            this.closed = true;
+            clearTimeout(this.timer);
+            if (this.source) this.source.close();
+        },
+    };
+
+    function connect() {
+        const url = subscription.lastEventId
+            ? `/api/stream?last_event_id=${encodeURIComponent(subscription.lastEventId)}`
+            : '/api/stream';
+        const source = new EventSource(url);
+        subscription.source = source;
+
+        source.onopen = () => {
+            subscription.delay = 5000;
+        };
+        source.addEventListener('article', (event) => {
+            subscription.lastEventId = event.lastEventId || subscription.lastEventId;
+            try {
+                onArticle(JSON.parse(event.data));
+            } catch (error) {
+                console.error('Error handling streamed article:', error);
+            }
+        });
+        source.onerror = () => {
+            if (source.readyState !== EventSource.CLOSED) {
+                console.warn('Article stream disconnected; the browser is reconnecting');
+                return;
+            }
+            if (subscription.closed) return;
+            // Jitter keeps rejected tabs from retrying in lockstep
+            const delay = subscription.delay * (0.5 + Math.random());
+            console.warn(`Article stream refused; retrying in ${Math.round(delay / 1000)}s`);
+            subscription.timer = setTimeout(connect, delay);
+            subscription.delay = Math.min(subscription.delay * 2, 60000);
+        };
+    }
+
+    connect();
+    return subscription;
+}
+
 /**
  * Create article card HTML
  */
@@ -187,7 +312,8 @@ async function updateStatistics() {
 }
 
 /**
- * Initialize infinite scroll
+ * Initialize infinite scroll.
+ * onLoadMore(page) may return false to signal there is nothing left to load.
  */
 function initializeInfiniteScroll(options = {}) {
     const {
@@ -200,10 +326,11 @@ function initializeInfiniteScroll(options = {}) {
     if (!element) return;
 
     let isLoading = false;
+    let isDone = false;
     let page = 1;
 
     window.addEventListener('scroll', async () => {
-        if (isLoading) return;
+        if (isLoading || isDone) return;
 
         const scrollPercentage = (window.scrollY + window.innerHeight) / document.documentElement.scrollHeight;
         
@@ -212,7 +339,7 @@ function initializeInfiniteScroll(options = {}) {
             page++;
 
             if (onLoadMore) {
-                await onLoadMore(page);
+                isDone = (await onLoadMore(page)) === false;
             }
 
             isLoading = false;
@@ -240,6 +367,34 @@ function initializeDarkMode() {
 // Initialize dark mode on page load
 initializeDarkMode();
 
+/**
+ * Load full article content into a slide panel on first open
+ */
+async function loadSlideContent(panel) {
+    if (!panel.dataset.contentUrl || panel.dataset.loaded === 'true') return;
+    panel.dataset.loaded = 'true';
+
+    try {
+        const response = await fetch(panel.dataset.contentUrl);
+        const data = await response.json();
+
+        if (!data.success) {
+            throw new Error(data.error || 'Failed to load article');
+        }
+
+        const article = data.article;
+        panel.innerHTML = formatContentHtml(article.content || article.summary);
+    } catch (error) {
+        console.error('Error loading article content:', error);
+        panel.dataset.loaded = 'false';
+        panel.innerHTML = '<p class="error">Could not load article content.</p>';
+    }
+
+    if (panel.classList.contains('open')) {
+        panel.style.maxHeight = panel.scrollHeight + 'px';
+    }
+}
+
 /**
  * Slide toggle controls for inline article content
  */
@@ -257,6 +412,7 @@ document.addEventListener('click', function(event) {
 
     if (isOpen) {
         panel.style.maxHeight = panel.scrollHeight + 'px';
+        loadSlideContent(panel);
     } else {
         const currentHeight = panel.scrollHeight;
         panel.style.maxHeight = currentHeight + 'px';
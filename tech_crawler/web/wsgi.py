@@ -0,0 +1,13 @@
+"""WSGI entry point for production servers (gunicorn tech_crawler.web.wsgi:app)"""
+
+import logging
+
+from tech_crawler.config import Settings
+from tech_crawler.web.app import create_app
+
+logging.basicConfig(
+    level=logging.DEBUG if Settings.DEBUG else logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+)
+
+app = create_app()
@@ -0,0 +1,171 @@
+"""Tests for the benchmark suite"""
+
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from benchmarks.crawl_sim import percentile, simulate
+from benchmarks.publisher_farm import PublisherFarm
+from benchmarks.run import BASELINE, compare, main, run_benchmarks
+from tech_crawler.config import Settings
+from tech_crawler.crawlers import HTMLCrawler, RSSCrawler
+from tech_crawler.metrics import CRAWLER_REGISTRY
+
+
+class TestBenchmarks(unittest.TestCase):
+    """Test benchmark runs and regression checks"""
+
+    def test_fixture_benchmarks_run(self):
+        """Test the offline fixture benchmarks produce rates"""
+        report = run_benchmarks(rows=[], repeat=1, only=["rss_parse", "html_parse", "extract_content"])
+        self.assertEqual(set(report["results"]), {"rss_parse", "html_parse", "extract_content"})
+        self.assertEqual(report["results"]["rss_parse"]["ops"], 50 * 20)
+        self.assertEqual(report["results"]["html_parse"]["ops"], 50 * 20)
+        for result in report["results"].values():
+            self.assertGreater(result["rate"], 0)
+
+    def test_database_benchmarks_run(self):
+        """Test ingest and search run against a small database"""
+        report = run_benchmarks(rows=[50], repeat=1, only=["ingest"])
+        self.assertEqual(report["results"]["ingest_50"]["ops"], 50)
+        self.assertIn("search_50", report["results"])
+
+    def test_compare(self):
+        """Test only drops beyond the threshold count as regressions"""
+        baseline = {"results": {
+            "a": {"unit": "x/s", "rate": 100.0},
+            "b": {"unit": "x/s", "rate": 100.0},
+            "c": {"unit": "x/s", "rate": 100.0},
+        }}
+        current = {"results": {
+            "a": {"unit": "x/s", "rate": 85.0},
+            "b": {"unit": "x/s", "rate": 75.0},
+            "c": {"unit": "x/s", "rate": 60.0},
+            "new": {"unit": "x/s", "rate": 1.0},
+        }}
+        thresholds = {"default": 0.2, "benchmarks": {"c": 0.5}}
+        regressions = compare(current, baseline, thresholds)
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith("b: 75.0 x/s vs 100.0"))
+
+    def test_baseline_covers_default_suite(self):
+        """Test the committed baseline has a rate for every default benchmark"""
+        with open(BASELINE, encoding="utf-8") as f:
+            baseline = json.load(f)
+        report = run_benchmarks(rows=[10], repeat=1, only=["rss_parse"])
+        self.assertIn("rss_parse", baseline["results"])
+        self.assertIn("ingest_1000", baseline["results"])
+        self.assertEqual(compare(report, baseline, {"default": 1.0}), [])
+
+    def test_unmeasurable_rate_printed(self):
+        """Test a benchmark that took no time does not break the summary"""
+        report = {"results": {"instant": {"unit": "x/s", "ops": 0, "seconds": 0, "rate": None}}}
+        with mock.patch("benchmarks.run.run_benchmarks", return_value=report), \
+                mock.patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            self.assertEqual(main(["--rows", ""]), 0)
+        self.assertIn("n/a", stdout.getvalue())
+
+
+class TestCrawlSimulation(unittest.TestCase):
+    """Test the publisher farm and crawl simulation"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.farm = PublisherFarm(hosts=3, items=5, html_every=3, seed=1).start()
+
+    def tearDown(self):
+        """Clean up"""
+        self.farm.stop()
+
+    def test_conditional_fetch(self):
+        """Test crawlers revalidate and see 304 until new items are published"""
+        rss = RSSCrawler("Mock", f"{self.farm.url}/0/feed.xml")
+        self.assertTrue(rss.fetch())
+        self.assertEqual(len(rss.feed_data.entries), 5)
+
+        self.assertTrue(rss.fetch())
+        self.assertTrue(rss.not_modified)
+        self.assertEqual(rss.parse(), [])
+
+        html = HTMLCrawler("Mock", f"{self.farm.url}/2/")
+        self.assertTrue(html.fetch())
+        self.assertTrue(html.fetch())
+        self.assertTrue(html.not_modified)
+
+        self.farm.advance(2)
+        self.assertTrue(rss.fetch())
+        self.assertFalse(rss.not_modified)
+        self.assertEqual(self.farm.stats["not_modified"], 2)
+
+    def test_crawl_metrics(self):
+        """Test crawlers record stage timings, bytes and cache hits per source"""
+        source = f"Metrics {self.id()}"
+        rss = RSSCrawler(source, f"{self.farm.url}/1/feed.xml")
+        rss.fetch()
+        rss.parse()
+        rss.fetch()
+
+        def sample(name, **labels):
+            return CRAWLER_REGISTRY.get_sample_value(name, {"source": source, **labels})
+
+        self.assertEqual(sample("crawler_stage_seconds_count", stage="fetch"), 2)
+        self.assertEqual(sample("crawler_stage_seconds_count", stage="parse"), 1)
+        self.assertEqual(sample("crawler_stage_seconds_count", stage="full_content"), 5)
+        self.assertEqual(sample("crawler_stage_seconds_count", stage="extract"), 5)
+        self.assertGreater(sample("crawler_bytes_downloaded_total", kind="source"), 0)
+        self.assertGreater(sample("crawler_bytes_downloaded_total", kind="article"), 0)
+        self.assertEqual(sample("crawler_cache_hits_total"), 1)
+
+    def test_simulation_rounds(self):
+        """Test a simulated crawl reports throughput and skips unchanged feeds"""
+        report = simulate(self.farm.url, self.farm.sources(), rounds=2, advance=False)
+        first, second = report["rounds"]
+        self.assertEqual(first["articles"], 15)
+        self.assertEqual(first["fetches"], 3 + 15)
+        self.assertIsNotNone(first["fetch_p99_ms"])
+        self.assertIsNotNone(first["cpu_ms_per_article"])
+        self.assertEqual(second["articles"], 0)
+        self.assertEqual(second["not_modified"], 3)
+
+    def test_crawl_history_recorded(self):
+        """Test each run_crawl stores its per-source outcome"""
+        from main import TechInvestmentCrawler
+
+        with tempfile.TemporaryDirectory() as tmpdir, mock.patch.multiple(
+            Settings,
+            NEWS_SOURCES=self.farm.sources(),
+            DATABASE_URL=f"sqlite:///{os.path.join(tmpdir, 'history.db')}",
+            ARCHIVE_DIR=os.path.join(tmpdir, "archive"),
+            RATE_LIMIT_DELAY=0,
+        ):
+            crawler = TechInvestmentCrawler()
+            try:
+                first = crawler.run_crawl(analyze=False)
+                crawler.run_crawl(analyze=False)
+                health = crawler.db.get_crawl_health()
+            finally:
+                crawler.db.close()
+
+        self.assertIsNotNone(first["run_id"])
+        self.assertEqual(len(health["runs"]), 2)
+        self.assertEqual(len(health["sources"]), 3)
+        for source in health["sources"]:
+            self.assertEqual(source["runs"], 2)
+            self.assertEqual(source["new_articles"], 5)
+            self.assertEqual(source["not_modified_rate"], 0.5)
+            self.assertGreater(source["bytes_downloaded"], 0)
+            self.assertEqual(source["last_status"], 304)
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles"""
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertIsNone(percentile([], 50))
+
+
+if __name__ == "__main__":
+    unittest.main()
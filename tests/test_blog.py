@@ -0,0 +1,201 @@
+"""Tests for blog publishing"""
+
+import os
+import tempfile
+import time
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from tech_crawler.blog import BlogPublisher, OutboxWorker
+from tech_crawler.blog.mock_api import MockBlogAPI
+from tech_crawler.blog.publisher import retry_after_seconds
+from tech_crawler.config import Settings
+from tech_crawler.storage import Database
+
+
+def make_articles(n):
+    return [
+        {
+            "title": f"Article {i}",
+            "url": f"https://example.com/{i}",
+            "summary": f"Summary {i}",
+            "source": "Test Source",
+            "published_date": datetime(2026, 3, 2, 9, 30),
+        }
+        for i in range(n)
+    ]
+
+
+class TestBlogPublisher(unittest.TestCase):
+    """Test BlogPublisher against the mock blog API"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.api = MockBlogAPI(latency=0.05, seed=1).start()
+        self.settings = mock.patch.multiple(
+            Settings,
+            BLOG_ENABLED=True,
+            BLOG_API_URL=self.api.url,
+            BLOG_API_KEY="test-key",
+            BLOG_CONCURRENCY=8,
+            BLOG_BACKOFF_BASE=0.01,
+        )
+        self.settings.start()
+        # Publishing threads each use their own connection, so use a file database
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db = Database(f"sqlite:///{os.path.join(self.tmpdir.name, 'test.db')}")
+        self.publisher = BlogPublisher(self.db)
+
+    def tearDown(self):
+        """Clean up"""
+        self.publisher.close()
+        self.db.close()
+        self.tmpdir.cleanup()
+        self.settings.stop()
+        self.api.stop()
+
+    def test_batch_is_concurrent_and_idempotent(self):
+        """Test a batch publishes in parallel and a re-run posts nothing"""
+        articles = make_articles(16)
+
+        began = time.perf_counter()
+        self.assertEqual(self.publisher.publish_articles_batch(articles), 16)
+        elapsed = time.perf_counter() - began
+        # Serially this would take 16 * 50 ms
+        self.assertLess(elapsed, 0.6)
+
+        self.assertEqual(self.publisher.publish_articles_batch(articles), 0)
+        self.assertTrue(self.publisher.publish_article(articles[0]))
+        self.assertEqual(self.api.stats["created"], 16)
+        self.assertEqual(self.api.stats["requests"], 16)
+
+    def test_retries_rate_limits_and_errors(self):
+        """Test 429 and 503 responses are retried until they succeed"""
+        self.api.latency = 0
+        self.api.rate_limit_every = 3
+        self.api.retry_after = 0
+        self.api.error_rate = 0.1
+        self.publisher.max_retries = 8
+
+        self.assertEqual(self.publisher.publish_articles_batch(make_articles(10)), 10)
+        self.assertEqual(self.api.stats["created"], 10)
+        self.assertGreater(self.api.stats["rate_limited"], 0)
+
+    def test_weekly_summaries_are_separate_posts(self):
+        """Test summary posts with the same title but new content are not deduplicated"""
+        self.api.latency = 0
+        first_week = make_articles(3)
+        next_week = [dict(a, url=f"{a['url']}?week=2", title=f"{a['title']} update") for a in first_week]
+
+        self.assertTrue(self.publisher.create_summary_post(first_week))
+        self.assertTrue(self.publisher.create_summary_post(next_week))
+        self.assertEqual(self.api.stats["created"], 2)
+
+        # Retrying the same week is still a no-op on the blog
+        self.assertTrue(self.publisher.create_summary_post(next_week))
+        self.assertEqual(self.api.stats["created"], 2)
+
+    def test_disabled(self):
+        """Test nothing is sent when publishing is disabled"""
+        with mock.patch.object(Settings, "BLOG_ENABLED", False):
+            publisher = BlogPublisher(self.db)
+        self.assertEqual(publisher.publish_articles_batch(make_articles(2)), 0)
+        self.assertEqual(self.api.stats["requests"], 0)
+
+    def test_retry_after_parsing(self):
+        """Test Retry-After accepts seconds and HTTP dates"""
+        self.assertEqual(retry_after_seconds("2"), 2.0)
+        self.assertEqual(retry_after_seconds("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+        self.assertIsNone(retry_after_seconds("soon"))
+
+
+class TestPublishOutbox(unittest.TestCase):
+    """Test the publish outbox and its drain worker"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.api = MockBlogAPI(seed=1).start()
+        self.settings = mock.patch.multiple(
+            Settings,
+            BLOG_ENABLED=True,
+            BLOG_API_URL=self.api.url,
+            BLOG_API_KEY="test-key",
+            BLOG_MAX_RETRIES=0,
+            BLOG_OUTBOX_ENABLED=True,
+            BLOG_OUTBOX_RETRY_DELAY=0,
+        )
+        self.settings.start()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_url = f"sqlite:///{os.path.join(self.tmpdir.name, 'test.db')}"
+        self.db = Database(self.db_url)
+
+    def tearDown(self):
+        """Clean up"""
+        self.db.close()
+        self.tmpdir.cleanup()
+        self.settings.stop()
+        self.api.stop()
+
+    def make_worker(self, db):
+        return OutboxWorker(db, BlogPublisher(db), batch_size=4, poll_interval=0)
+
+    def test_ingest_queues_new_articles_only(self):
+        """Test new articles are queued once and updates are not queued"""
+        self.assertEqual(self.db.add_articles_batch(make_articles(5)), 5)
+        self.db.add_articles_batch(make_articles(5))
+        self.db.add_article({"title": "Single", "url": "https://example.com/single"})
+        self.assertEqual(self.db.get_outbox_counts(), {"pending": 6})
+
+    def test_drain_survives_restart(self):
+        """Test a backlog left by one process is published by the next"""
+        self.db.add_articles_batch(make_articles(10))
+        self.db.close()
+
+        db = Database(self.db_url)
+        worker = self.make_worker(db)
+        self.assertEqual(worker.drain(), 10)
+        self.assertEqual(worker.stats["published"], 10)
+        self.assertEqual(db.get_outbox_counts(), {})
+        self.assertEqual(self.api.stats["created"], 10)
+        worker.publisher.close()
+        self.db = db
+
+    def test_expired_claim_is_not_posted_twice(self):
+        """Test rows whose worker died mid-batch are retried without duplicate posts"""
+        self.db.add_articles_batch(make_articles(3))
+        claimed = self.db.claim_outbox(10, lease_seconds=0)
+        publisher = BlogPublisher(self.db)
+        # The "crashed" worker posted the articles but never removed the rows
+        self.assertEqual(publisher.publish_many([a for _, a in claimed]), [True] * 3)
+
+        worker = self.make_worker(self.db)
+        self.assertEqual(worker.drain(), 3)
+        self.assertEqual(self.db.get_outbox_counts(), {})
+        self.assertEqual(self.api.stats["created"], 3)
+        publisher.close()
+        worker.publisher.close()
+
+    def test_failures_are_retried_then_parked(self):
+        """Test failed posts stay queued and are parked after the last attempt"""
+        self.db.add_articles_batch(make_articles(2))
+        self.api.error_rate = 1.0
+        worker = self.make_worker(self.db)
+        worker.max_attempts = 2
+
+        self.assertEqual(worker.drain_once(), 2)
+        self.assertEqual(self.db.get_outbox_counts(), {"pending": 2})
+        self.assertEqual(worker.drain_once(), 2)
+        self.assertEqual(self.db.get_outbox_counts(), {"failed": 2})
+        self.assertEqual(worker.drain_once(), 0)
+
+        # --retry-failed puts parked rows back with fresh attempts
+        self.api.error_rate = 0.0
+        self.assertEqual(self.db.requeue_failed_outbox(), 2)
+        self.assertEqual(worker.drain_once(), 2)
+        self.assertEqual(self.db.get_outbox_counts(), {})
+        worker.publisher.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -55,5 +55,23 @@ class TestBaseCrawler(unittest.TestCase):
         self.assertEqual(len(self.crawler.articles), 3)
 
 
+class TestExtractContent(unittest.TestCase):
+    """Test BaseCrawler.extract_content"""
+
+    def test_prefers_article_paragraphs(self):
+        """Test paragraphs outside <article> are ignored when it exists"""
+        html = (
+            "<html><body><p>Navigation</p>"
+            "<article><p>First</p><p> </p><p>Second</p></article>"
+            "<footer><p>Footer</p></footer></body></html>"
+        )
+        self.assertEqual(BaseCrawler.extract_content(html), "First\n\nSecond")
+
+    def test_falls_back_to_page_paragraphs(self):
+        """Test pages without <article> use every paragraph"""
+        self.assertEqual(BaseCrawler.extract_content("<p>One</p><div><p>Two</p></div>"), "One\n\nTwo")
+        self.assertIsNone(BaseCrawler.extract_content("<div>No paragraphs</div>"))
+
+
 if __name__ == "__main__":
     unittest.main()
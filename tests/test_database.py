@@ -1,9 +1,20 @@
 """Tests for database functionality"""
 
+import os
+import tempfile
 import unittest
-from datetime import datetime
+import unittest.mock
+from datetime import datetime, timedelta
 
-from tech_crawler.storage import Database, Article
+from sqlalchemy import create_engine, event, text
+
+from tech_crawler.metrics import CRAWLER_REGISTRY
+from tech_crawler.storage import Database, Article, ArticleSummary, IngestQueue
+from tech_crawler.storage.archive import ArticleArchive
+from tech_crawler.storage.models import DailySourceCount
+from tech_crawler.storage.rollups import RollupAccumulator
+from tech_crawler.storage.search import SearchIndex
+from tech_crawler.storage.suggest import SuggestIndex
 
 
 class TestDatabase(unittest.TestCase):
@@ -70,6 +81,235 @@ class TestDatabase(unittest.TestCase):
         articles = self.db.get_articles(limit=10)
         self.assertEqual(len(articles), 5)
 
+    def test_listings_exclude_content(self):
+        """Test listings return compact records and details keep the body"""
+        self.db.add_article({
+            "title": "Test Article",
+            "url": "https://example.com/test",
+            "summary": "Test summary",
+            "content": "Long article body",
+            "source": "Test Source",
+            "published_date": datetime.now(),
+        })
+
+        listed = self.db.get_articles(limit=10)[0]
+        self.assertIsInstance(listed, ArticleSummary)
+        self.assertNotIn("content", listed.to_dict())
+
+        detail = self.db.get_article_by_id(listed.id)
+        self.assertEqual(detail.to_dict()["content"], "Long article body")
+
+    def test_content_stored_compressed(self):
+        """Test bodies live compressed outside the articles row"""
+        body = "Semiconductor supply chain analysis. " * 200
+        article = self.db.add_article({
+            "title": "Test Article",
+            "url": "https://example.com/test",
+            "content": body,
+            "source": "Test Source",
+            "published_date": datetime.now(),
+        })
+
+        with self.db.engine.connect() as connection:
+            inline = connection.execute(
+                text("SELECT content FROM articles WHERE id = :id"), {"id": article.id}
+            ).scalar()
+            stored = connection.execute(
+                text("SELECT data FROM article_bodies WHERE article_id = :id"), {"id": article.id}
+            ).scalar()
+
+        self.assertIsNone(inline)
+        self.assertLess(len(stored), len(body) // 4)
+        self.assertEqual(self.db.get_article_by_id(article.id).full_content, body)
+        self.assertEqual(len(self.db.search_articles("semiconductor")), 1)
+
+    def test_migrate_legacy_content(self):
+        """Test inline bodies from older databases are moved to article_bodies"""
+        article = self.db.add_article({
+            "title": "Test Article",
+            "url": "https://example.com/test",
+            "source": "Test Source",
+            "published_date": datetime.now(),
+        })
+        with self.db.engine.begin() as connection:
+            connection.execute(text("DELETE FROM article_bodies"))
+            connection.execute(
+                text("UPDATE articles SET content = 'legacy body' WHERE id = :id"), {"id": article.id}
+            )
+
+        self.assertEqual(self.db.migrate_legacy_content(), 1)
+        self.assertEqual(self.db.migrate_legacy_content(), 0)
+        self.assertEqual(self.db.get_article_by_id(article.id).full_content, "legacy body")
+
+    def test_daily_rollups(self):
+        """Test rollups follow inserts and re-tagging"""
+        published = datetime(2026, 3, 2, 9, 30)
+        self.db.add_articles_batch([
+            {
+                "title": f"Article {i}",
+                "url": f"https://example.com/article{i}",
+                "source": "Source A" if i < 2 else "Source B",
+                "published_date": published,
+                "tags": ["NVDA (Nvidia)", "MACHINE_LEARNING"] if i == 0 else ["MACHINE_LEARNING"],
+            }
+            for i in range(3)
+        ])
+        self.db.add_article({
+            "title": "Article 2",
+            "url": "https://example.com/article2",
+            "source": "Source B",
+            "published_date": published,
+            "tags": ["CLOUD_COMPUTING"],
+        })
+
+        rollup = self.db.get_daily_rollup(published.date())
+        self.assertEqual(rollup["sources"], {"Source A": 2, "Source B": 1})
+        self.assertEqual(rollup["tags"]["MACHINE_LEARNING"], 2)
+        self.assertEqual(rollup["tags"]["CLOUD_COMPUTING"], 1)
+        self.assertEqual(rollup["companies"], {"NVDA (Nvidia)": 1})
+
+        totals = self.db.get_totals()
+        self.assertEqual(totals["total_articles"], 3)
+        self.assertEqual(totals["sources"], ["Source A", "Source B"])
+
+        expected = dict(rollup["tags"])
+        self.db.rebuild_rollups()
+        self.assertEqual(dict(self.db.get_daily_rollup(published.date())["tags"]), expected)
+
+    def test_tag_series_tracks_relevance(self):
+        """Test tag rollups keep relevance sums through re-scoring"""
+        published = datetime(2026, 3, 2, 9, 30)
+        for i, score in enumerate((0.2, 0.6)):
+            self.db.add_article({
+                "title": f"Article {i}",
+                "url": f"https://example.com/{i}",
+                "source": "Test Source",
+                "published_date": published,
+                "tags": ["AI"],
+                "relevance_score": score,
+            })
+        self.db.add_articles_batch([{
+            "title": "Article 0",
+            "url": "https://example.com/0",
+            "tags": ["AI"],
+            "relevance_score": 0.4,
+        }])
+
+        [(day, count, relevance_sum, scored)] = self.db.get_tag_series("AI")
+        self.assertEqual((day, count, scored), (published.date(), 2, 2))
+        self.assertAlmostEqual(relevance_sum, 1.0)
+
+    def test_read_cache_invalidated_by_ingest(self):
+        """Test cached reads are served until the generation moves"""
+        self.db.add_article({
+            "title": "Article 0",
+            "url": "https://example.com/article0",
+            "source": "Test Source",
+            "published_date": datetime.now(),
+        })
+        generation = self.db.get_ingest_state()[0]
+
+        first = self.db.get_articles(limit=10)
+        self.assertIs(self.db.get_articles(limit=10), first)
+        self.assertIs(self.db.get_article_by_id(first[0].id), self.db.get_article_by_id(first[0].id))
+        self.assertGreater(self.db.cache_stats()["hits"], 0)
+
+        self.db.add_article({
+            "title": "Article 1",
+            "url": "https://example.com/article1",
+            "source": "Test Source",
+            "published_date": datetime.now(),
+        })
+        self.assertEqual(self.db.get_ingest_state()[0], generation + 1)
+        self.assertEqual(len(self.db.get_articles(limit=10)), 2)
+
+    def test_read_cache_keyed_by_generation_before_query(self):
+        """Test a result computed before an ingest is not cached as current"""
+        _, store_key = self.db._cache_get(("probe",))
+
+        # Another writer commits while the caller is still querying, and a
+        # concurrent read notices the new generation first
+        self.db.add_article({
+            "title": "Article 0",
+            "url": "https://example.com/article0",
+            "source": "Test Source",
+            "published_date": datetime.now(),
+        })
+        self.db.get_articles(limit=10)
+        self.db.read_cache.set(store_key, ["stale"])
+
+        self.assertIsNone(self.db._cache_get(("probe",))[0])
+
+    def test_keyset_pagination(self):
+        """Test cursor pages cover every article exactly once"""
+        published = datetime(2026, 1, 1)
+        for i in range(7):
+            self.db.add_article({
+                "title": f"Article {i}",
+                "url": f"https://example.com/article{i}",
+                "source": "Test Source",
+                # Pairs share a timestamp so the id tie-breaker matters
+                "published_date": published + timedelta(hours=i // 2),
+            })
+
+        seen = []
+        cursor = None
+        while True:
+            page, cursor = self.db.get_articles_page(limit=3, cursor=cursor)
+            seen.extend(a.id for a in page)
+            if cursor is None:
+                break
+
+        self.assertEqual(len(seen), 7)
+        self.assertEqual(len(set(seen)), 7)
+
+    def test_filters_pushed_into_query(self):
+        """Test tag, date-range and relevance filters still return full pages"""
+        start = datetime(2026, 3, 1, 12, 0)
+        for i in range(6):
+            self.db.add_article({
+                "title": f"Article {i}",
+                "url": f"https://example.com/{i}",
+                "source": "Test Source",
+                "published_date": start + timedelta(days=i),
+                "tags": ["NVDA (Nvidia)", "AI"] if i % 2 else ["AI_chips"],
+                "relevance_score": i / 10,
+            })
+
+        tagged = self.db.get_articles(limit=2, tag="NVDA (Nvidia)")
+        self.assertEqual([a.title for a in tagged], ["Article 5", "Article 3"])
+        # Exact tag match: "AI" must not match "AI_chips"
+        self.assertEqual(len(self.db.get_articles(tag="AI")), 3)
+
+        ranged = self.db.get_articles(
+            published_after=start + timedelta(days=1),
+            published_before=start + timedelta(days=4),
+        )
+        self.assertEqual([a.title for a in ranged], ["Article 3", "Article 2", "Article 1"])
+
+        relevant = self.db.get_articles(min_relevance=0.35)
+        self.assertEqual([a.title for a in relevant], ["Article 5", "Article 4"])
+
+    def test_sparse_fields(self):
+        """Test only requested columns are selected"""
+        self.db.add_article({
+            "title": "Test Article",
+            "url": "https://example.com/test",
+            "summary": "Test summary",
+            "source": "Test Source",
+            "published_date": datetime.now(),
+        })
+
+        article = self.db.get_articles(fields=["title"])[0]
+        self.assertIsNone(article.summary)
+        self.assertIsNotNone(article.published_date)
+        self.assertEqual(article.to_dict(["title"]), {"title": "Test Article"})
+
+    def test_decode_invalid_cursor(self):
+        """Test malformed cursors are rejected"""
+        with self.assertRaises(ValueError):
+            self.db.decode_cursor("not-a-cursor")
+
     def test_search_articles(self):
         """Test searching articles"""
         # Add test articles
@@ -87,6 +327,587 @@ class TestDatabase(unittest.TestCase):
         results = self.db.search_articles("Python", limit=10)
         self.assertEqual(len(results), 2)
 
+    def test_search_phrase_prefix_and_snippet(self):
+        """Test phrase and prefix queries with highlighted snippets"""
+        for i, title in enumerate(["Quantum computing breakthrough", "Computing the quantum <b>odds</b>"]):
+            self.db.add_article({
+                "title": title,
+                "url": f"https://example.com/q{i}",
+                "summary": f"Summary {i}",
+                "source": "Test Source",
+                "published_date": datetime.now(),
+            })
+
+        phrase = self.db.search_articles('"quantum computing"', limit=10)
+        self.assertEqual([a.title for a in phrase], ["Quantum computing breakthrough"])
+
+        prefix = self.db.search_articles("quant*", limit=10)
+        self.assertEqual(len(prefix), 2)
+        for article in prefix:
+            self.assertIn("<mark>", article.snippet)
+            self.assertNotIn("<b>", article.snippet)
+
+    def test_search_index_follows_updates(self):
+        """Test updated content is searchable"""
+        article_data = {
+            "title": "Chip news",
+            "url": "https://example.com/chips",
+            "summary": "Nothing yet",
+            "source": "Test Source",
+            "published_date": datetime.now(),
+        }
+        self.db.add_article(article_data)
+        self.assertEqual(self.db.search_articles("foundry"), [])
+
+        self.db.add_articles_batch([dict(article_data, summary="New foundry capacity")])
+        self.assertEqual(len(self.db.search_articles("foundry")), 1)
+
+
+    def test_search_index_is_contentless(self):
+        """Test FTS keeps no copy of bodies, drops replaced terms and snippets from the body"""
+        article_data = {
+            "title": "Chip news",
+            "url": "https://example.com/chips",
+            "summary": "Capacity update",
+            "content": "The foundry will add capacity next year.",
+            "source": "Test Source",
+            "published_date": datetime.now(),
+        }
+        self.db.add_article(article_data)
+        with self.db.engine.connect() as connection:
+            tables = {row[0] for row in connection.execute(text("SELECT name FROM sqlite_master"))}
+        self.assertNotIn("articles_fts_content", tables)
+
+        hit = self.db.search_articles("foundry")[0]
+        self.assertIn("<mark>foundry</mark>", hit.snippet)
+
+        self.db.add_articles_batch([dict(article_data, content="Lithography tools ship in March.")])
+        self.assertEqual(self.db.search_articles("foundry"), [])
+        self.assertEqual(len(self.db.search_articles("lithography")), 1)
+
+    def test_like_fallback(self):
+        """Test the LIKE backend matches titles and summaries, not compressed bodies"""
+        with unittest.mock.patch(
+            "tech_crawler.storage.database.create_search_index", return_value=SearchIndex()
+        ):
+            db = Database(self.db_url)
+        try:
+            db.add_article({
+                "title": "Foundry capacity",
+                "url": "https://example.com/foundry",
+                "summary": "Wafer starts",
+                "content": "Body mentions lithography",
+                "source": "Test Source",
+                "published_date": datetime.now(),
+            })
+            self.assertEqual(db.search_index.name, "like")
+            self.assertEqual(len(db.search_articles("wafer")), 1)
+            self.assertEqual(db.search_articles("lithography"), [])
+        finally:
+            db.close()
+
+class TestSessionScope(unittest.TestCase):
+    """Test request-scoped sessions and pooling"""
+
+    def setUp(self):
+        """Use a file database so the engine has a real connection pool"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db = Database(f"sqlite:///{os.path.join(self.tmpdir.name, 'test.db')}")
+        self.checkouts = 0
+
+        def count_checkout(*args):
+            self.checkouts += 1
+
+        event.listen(self.db.engine, "checkout", count_checkout)
+
+    def tearDown(self):
+        """Clean up"""
+        self.db.close()
+        self.tmpdir.cleanup()
+
+    def test_scope_shares_one_connection(self):
+        """Test calls inside a scope reuse one session and connection"""
+        with self.db.session_scope():
+            self.db.get_article_count()
+            self.db.get_totals()
+            self.db.get_articles(limit=5)
+            self.db.get_sources()
+        self.assertEqual(self.checkouts, 1)
+
+        self.db.get_article_count()
+        self.db.get_sources()
+        self.assertEqual(self.checkouts, 3)
+
+    def test_pool_configured(self):
+        """Test pool settings are applied to file databases"""
+        self.assertIn("Pool size: 5", self.db.get_pool_status())
+
+    def test_rollup_increments_are_atomic(self):
+        """Test a session holding a stale rollup row does not overwrite another writer's count"""
+        day = datetime(2026, 1, 5)
+        key = (day.date(), "Source A")
+
+        def add_one(session):
+            rollups = RollupAccumulator()
+            rollups.add_article(day, "Source A", "")
+            rollups.apply(session)
+            session.commit()
+
+        first = self.db.SessionLocal()
+        add_one(first)
+        stale = first.get(DailySourceCount, key)
+        self.assertEqual(stale.article_count, 1)
+
+        second = self.db.SessionLocal()
+        add_one(second)
+        second.close()
+
+        # first still has the row loaded with a count of 1
+        add_one(first)
+        first.close()
+        self.assertEqual(self.db.get_daily_rollup(day.date())["sources"], {"Source A": 3})
+
+
+@unittest.skipUnless(os.getenv("TEST_POSTGRES_URL"), "TEST_POSTGRES_URL not set")
+class TestPostgresProfile(unittest.TestCase):
+    """Test against a local PostgreSQL instance"""
+
+    def setUp(self):
+        """Connect to the instance named by TEST_POSTGRES_URL"""
+        self.db = Database(os.environ["TEST_POSTGRES_URL"])
+        with self.db.engine.begin() as connection:
+            connection.execute(text("DELETE FROM articles WHERE url LIKE 'https://pg-test.example.com/%'"))
+
+    def tearDown(self):
+        """Clean up"""
+        with self.db.engine.begin() as connection:
+            connection.execute(text("DELETE FROM articles WHERE url LIKE 'https://pg-test.example.com/%'"))
+        self.db.close()
+
+    def test_write_search_and_scope(self):
+        """Test ingest, tsvector search and scoped sessions on PostgreSQL"""
+        self.db.add_articles_batch([{
+            "title": f"Postgres quantum article {i}",
+            "url": f"https://pg-test.example.com/{i}",
+            "content": "Quantum error correction",
+            "source": "PG Source",
+            "published_date": datetime.now(),
+        } for i in range(3)])
+
+        with self.db.session_scope():
+            results = self.db.search_articles("quantum", limit=10)
+            page, _ = self.db.get_articles_page(limit=2, source="PG Source")
+
+        self.assertGreaterEqual(len(results), 3)
+        self.assertEqual(len(page), 2)
+        self.assertTrue(self.db.get_pool_status())
+
+    def test_archived_articles_stay_searchable(self):
+        """Test tsvector entries move to the archive stub with the article"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self.db.archive = ArticleArchive(tmpdir)
+            self.db.add_article({
+                "title": "Postgres archived article",
+                "url": "https://pg-test.example.com/archived",
+                "content": "Superconducting qubit fabrication",
+                "source": "PG Source",
+                "published_date": datetime.now() - timedelta(days=4000),
+            })
+            try:
+                self.assertGreaterEqual(self.db.archive_articles(older_than_days=3650), 1)
+                urls = [a.url for a in self.db.search_articles("qubit fabrication", limit=10)]
+                self.assertIn("https://pg-test.example.com/archived", urls)
+            finally:
+                with self.db.engine.begin() as connection:
+                    connection.execute(text(
+                        "DELETE FROM archived_articles WHERE url LIKE 'https://pg-test.example.com/%'"
+                    ))
+
+
+class TestIngestQueue(unittest.TestCase):
+    """Test the batched writer queue"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db = Database(f"sqlite:///{os.path.join(self.tmpdir.name, 'test.db')}")
+
+    def tearDown(self):
+        """Clean up"""
+        self.db.close()
+        self.tmpdir.cleanup()
+
+    def test_concurrent_producers(self):
+        """Test articles from many threads land in few batches"""
+        import threading
+
+        def produce(worker, ingest):
+            ingest.put_many({
+                "title": f"Article {worker}-{i}",
+                "url": f"https://example.com/{worker}/{i}",
+                "source": f"Source {worker}",
+                "published_date": datetime.now(),
+            } for i in range(25))
+
+        with IngestQueue(self.db, max_size=10, batch_size=50, flush_interval=0.5) as ingest:
+            workers = [threading.Thread(target=produce, args=(w, ingest)) for w in range(4)]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+
+        self.assertEqual(ingest.stats["added"], 100)
+        self.assertEqual(self.db.get_article_count(), 100)
+        self.assertLess(ingest.stats["batches"], 100)
+
+    def test_poisoned_article_does_not_sink_batch(self):
+        """Test one unstorable article is dropped and counted while the rest commit"""
+        articles = [{
+            "title": f"Article {i}",
+            "url": f"https://example.com/good/{i}",
+            "source": "Good Source",
+            "published_date": datetime.now(),
+        } for i in range(9)]
+        articles.insert(4, {
+            "title": None,  # violates NOT NULL at commit
+            "url": "https://example.com/bad",
+            "source": "Bad Source",
+            "published_date": datetime.now(),
+        })
+        labels = {"source": "Bad Source", "stage": "db_commit"}
+        errors_before = CRAWLER_REGISTRY.get_sample_value("crawler_errors_total", labels) or 0
+
+        with IngestQueue(self.db, batch_size=50, flush_interval=0.5) as ingest:
+            ingest.put_many(articles)
+
+        self.assertEqual(self.db.get_article_count(), 9)
+        self.assertEqual(ingest.stats["added"], 9)
+        self.assertEqual(ingest.stats["errors"], 1)
+        self.assertEqual(ingest.source_stats["Good Source"]["added"], 9)
+        self.assertEqual(ingest.source_stats["Bad Source"]["errors"], 1)
+        self.assertEqual(CRAWLER_REGISTRY.get_sample_value("crawler_errors_total", labels), errors_before + 1)
+
+    def test_put_requires_start(self):
+        """Test enqueueing before start fails loudly"""
+        with self.assertRaises(RuntimeError):
+            IngestQueue(self.db).put({"url": "https://example.com"})
+
+
+class TestCrawlHistory(unittest.TestCase):
+    """Test persisted crawl runs and per-source aggregates"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.db = Database("sqlite:///:memory:")
+
+    def tearDown(self):
+        """Clean up"""
+        self.db.close()
+
+    def record(self, started_at, fast_new=3, slow_error=None):
+        return self.db.record_crawl_run(
+            {"started_at": started_at, "duration_seconds": 2.5, "sources_crawled": 2, "new_articles": fast_new},
+            [
+                {"source": "Fast", "started_at": started_at, "duration_seconds": 0.5, "http_status": 200,
+                 "bytes_downloaded": 3000, "articles_parsed": 5, "new_articles": fast_new},
+                {"source": "Slow", "started_at": started_at, "duration_seconds": 2.0, "http_status": 503,
+                 "errors": 1 if slow_error else 0, "error": slow_error},
+            ],
+        )
+
+    def test_crawl_health(self):
+        """Test sources are aggregated over the window, slowest first"""
+        now = datetime.utcnow()
+        self.record(now - timedelta(hours=2), fast_new=3, slow_error="fetch: 503 Server Error")
+        self.record(now - timedelta(hours=1), fast_new=1)
+        self.record(now - timedelta(days=30), fast_new=50)
+
+        health = self.db.get_crawl_health(days=7)
+        self.assertEqual([s["source"] for s in health["sources"]], ["Slow", "Fast"])
+        slow, fast = health["sources"]
+        self.assertEqual(fast["runs"], 2)
+        self.assertEqual(fast["new_articles"], 4)
+        self.assertEqual(fast["bytes_per_new_article"], 1500)
+        self.assertEqual(slow["error_rate"], 0.5)
+        self.assertIsNone(slow["last_error"])
+        self.assertEqual(slow["last_status"], 503)
+        self.assertEqual(len(health["runs"]), 3)
+
+    def test_prune_crawl_runs(self):
+        """Test old runs are deleted together with their sources"""
+        self.record(datetime.utcnow() - timedelta(days=200))
+        recent_id = self.record(datetime.utcnow())
+        self.assertEqual(self.db.prune_crawl_runs(older_than_days=90), 1)
+        health = self.db.get_crawl_health(days=365)
+        self.assertEqual([run["id"] for run in health["runs"]], [recent_id])
+        self.assertEqual(health["sources"][0]["runs"], 1)
+
+
+class TestArchive(unittest.TestCase):
+    """Test tiered retention"""
+
+    def setUp(self):
+        """Set up a database with an archive in a temporary directory"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db = Database("sqlite:///:memory:", archive=ArticleArchive(self.tmpdir.name))
+
+        now = datetime.now()
+        for i, age in enumerate([400, 380, 2]):
+            self.db.add_article({
+                "title": f"Quantum article {i}",
+                "url": f"https://example.com/article{i}",
+                "summary": f"Summary {i}",
+                "content": f"Quantum body {i}",
+                "source": "Test Source",
+                "published_date": now - timedelta(days=age),
+                "tags": ["NVDA (Nvidia)"],
+                "relevance_score": 0.5,
+            })
+
+    def tearDown(self):
+        """Clean up"""
+        self.tmpdir.cleanup()
+
+    def test_archive_and_fall_through(self):
+        """Test old articles move out but stay reachable"""
+        self.assertEqual(self.db.archive_articles(older_than_days=365), 2)
+        self.assertEqual(self.db.get_article_count(), 1)
+        self.assertTrue(self.db.archive.partitions())
+
+        article = self.db.get_article_by_id(1)
+        self.assertEqual(article.full_content, "Quantum body 0")
+
+        results = self.db.search_articles("quantum", limit=10)
+        self.assertEqual(len(results), 3)
+
+        # Re-crawling an archived URL does not resurrect it in the hot table
+        self.db.add_articles_batch([{
+            "title": "Quantum article 0",
+            "url": "https://example.com/article0",
+            "source": "Test Source",
+            "published_date": datetime.now(),
+        }])
+        self.assertEqual(self.db.get_article_count(), 1)
+
+    def test_archive_restores_all_fields(self):
+        """Test archived articles come back with their relevance score and tags"""
+        self.db.archive_articles(older_than_days=365)
+        article = self.db.get_article_by_id(1)
+        self.assertEqual(article.relevance_score, 0.5)
+        self.assertEqual(article.tags, "NVDA (Nvidia)")
+
+    def test_rebuilds_keep_archived_articles(self):
+        """Test reindexing and rollup rebuilds still count archived articles"""
+        self.db.archive_articles(older_than_days=365)
+        old_day = (datetime.now() - timedelta(days=400)).date()
+        before = self.db.get_daily_rollup(old_day)
+
+        self.db.rebuild_search_index()
+        self.db.rebuild_rollups()
+
+        self.assertEqual(len(self.db.search_articles("quantum body", limit=10)), 3)
+        after = self.db.get_daily_rollup(old_day)
+        self.assertEqual(after, before)
+        self.assertEqual(after["sources"], {"Test Source": 1})
+        series = {day: rest for day, *rest in self.db.get_tag_series("NVDA (Nvidia)")}
+        self.assertEqual(series[old_day], [1, 0.5, 1])
+
+    def test_archived_ids_not_reused_after_upgrade(self):
+        """Test a pre-AUTOINCREMENT articles table never hands an archived id out again"""
+        path = os.path.join(self.tmpdir.name, "upgraded.db")
+        engine = create_engine(f"sqlite:///{path}")
+        now = datetime.now()
+        with engine.begin() as connection:
+            # Schema as created before the series
+            connection.execute(text(
+                "CREATE TABLE articles (id INTEGER NOT NULL, title VARCHAR(500) NOT NULL, "
+                "url VARCHAR(1000) NOT NULL, summary TEXT, content TEXT, source VARCHAR(100) NOT NULL, "
+                "published_date DATETIME NOT NULL, crawled_date DATETIME, updated_date DATETIME, "
+                "relevant BOOLEAN, processed BOOLEAN, tags VARCHAR(500), PRIMARY KEY (id))"
+            ))
+            connection.execute(text("CREATE UNIQUE INDEX ix_articles_url ON articles (url)"))
+            for i, (title, age) in enumerate([("New chips", 2), ("Old quantum", 400)], start=1):
+                connection.execute(
+                    text("INSERT INTO articles (id, title, url, source, published_date, content, tags) "
+                         "VALUES (:id, :title, :url, 'Test Source', :published, :title, 'AI')"),
+                    {"id": i, "title": title, "url": f"https://example.com/old{i}",
+                     "published": now - timedelta(days=age)},
+                )
+        engine.dispose()
+
+        db = Database(f"sqlite:///{path}", archive=ArticleArchive(self.tmpdir.name))
+        try:
+            self.assertEqual(db.archive_articles(older_than_days=365), 1)
+            fresh = db.add_article({
+                "title": "Fresh article",
+                "url": "https://example.com/fresh",
+                "source": "Test Source",
+                "published_date": now,
+            })
+
+            self.assertEqual(fresh.id, 3)
+            self.assertEqual(db.get_article_by_id(2).title, "Old quantum")
+            self.assertEqual([a.title for a in db.search_articles("old")], ["Old quantum"])
+            self.assertEqual(db.get_article_by_id(1).title, "New chips")
+        finally:
+            db.close()
+
+    def test_archive_disabled(self):
+        """Test a zero retention window archives nothing"""
+        self.assertEqual(self.db.archive_articles(older_than_days=0), 0)
+        self.assertEqual(self.db.get_article_count(), 3)
+
+
+class TestSuggestIndex(unittest.TestCase):
+    """Test autocomplete prefix index"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.db = Database("sqlite:///:memory:")
+        self.index = SuggestIndex(self.db)
+
+    def add(self, n, tags, days_ago=0):
+        self.db.add_article({
+            "title": f"Article {n}",
+            "url": f"https://example.com/{n}",
+            "source": "Test Source",
+            "published_date": datetime.utcnow() - timedelta(days=days_ago),
+            "tags": tags,
+        })
+
+    def test_settings_entries_without_data(self):
+        """Test tickers, names and later words of trends are matched"""
+        self.assertEqual(self.index.suggest("nvd")[0]["tag"], "NVDA (Nvidia)")
+        self.assertEqual(self.index.suggest("NVIDIA")[0]["label"], "Nvidia (NVDA)")
+        learning = self.index.suggest("learn")
+        self.assertEqual(learning[0]["tag"], "MACHINE_LEARNING")
+        self.assertEqual(learning[0]["query"], '"machine learning"')
+        self.assertEqual(self.index.suggest(""), [])
+
+    def test_popularity_ranking_and_incremental_refresh(self):
+        """Test ranking follows tag counts and new tags appear after ingest"""
+        self.add(1, ["MSFT (Microsoft)"], days_ago=3)
+        self.add(2, ["META (Meta)", "METAVERSE"])
+        self.add(3, ["METAVERSE"])
+        self.index.refresh()
+
+        ranked = [s["tag"] for s in self.index.suggest("me")]
+        self.assertEqual(ranked[:2], ["METAVERSE", "META (Meta)"])
+        self.assertEqual(self.index.suggest("micro")[0]["count"], 1)
+
+        self.add(4, ["Robotics"])
+        with unittest.mock.patch.object(
+            self.db, "get_tag_counts", wraps=self.db.get_tag_counts
+        ) as reads:
+            self.assertTrue(self.index.refresh())
+            self.assertFalse(self.index.refresh())
+        # Only today's rollups are read once past days are loaded
+        self.assertEqual(reads.call_count, 1)
+        self.assertEqual(self.index.suggest("robot")[0]["tag"], "Robotics")
+
+
+class TestSQLiteProfile(unittest.TestCase):
+    """Test SQLite connection tuning"""
+
+    def setUp(self):
+        """Use a file database since WAL is unavailable in memory"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        db_path = os.path.join(self.tmpdir.name, "test.db")
+        self.db = Database(f"sqlite:///{db_path}")
+
+    def tearDown(self):
+        """Clean up"""
+        self.db.close()
+        self.tmpdir.cleanup()
+
+    def test_pragmas_applied(self):
+        """Test connections use WAL with relaxed sync and a busy timeout"""
+        with self.db.engine.connect() as connection:
+            journal_mode = connection.execute(text("PRAGMA journal_mode")).scalar()
+            synchronous = connection.execute(text("PRAGMA synchronous")).scalar()
+            busy_timeout = connection.execute(text("PRAGMA busy_timeout")).scalar()
+
+        self.assertEqual(journal_mode.lower(), "wal")
+        self.assertEqual(synchronous, 1)  # NORMAL
+        self.assertGreater(busy_timeout, 0)
+
+    def test_missing_columns_added(self):
+        """Test columns added to the models are created on older databases"""
+        self.db.add_article({
+            "title": "Test Article",
+            "url": "https://example.com/test",
+            "source": "Test Source",
+            "published_date": datetime.now(),
+        })
+        with self.db.engine.begin() as connection:
+            connection.execute(text("DROP INDEX ix_articles_relevance_score"))
+            connection.execute(text("ALTER TABLE articles DROP COLUMN relevance_score"))
+        self.db.close()
+
+        db = Database(str(self.db.engine.url))
+        try:
+            self.assertEqual(len(db.get_articles(min_relevance=0)), 0)
+            self.assertEqual(len(db.get_articles()), 1)
+        finally:
+            db.close()
+
+    def test_tag_relevance_backfilled_on_upgrade(self):
+        """Test relevance columns added to existing rollups are filled from the articles"""
+        published = datetime(2026, 2, 1)
+        self.db.add_article({
+            "title": "Test Article",
+            "url": "https://example.com/test",
+            "source": "Test Source",
+            "published_date": published,
+            "tags": ["AI"],
+            "relevance_score": 0.5,
+        })
+        with self.db.engine.begin() as connection:
+            connection.execute(text("ALTER TABLE daily_tag_counts DROP COLUMN relevance_sum"))
+            connection.execute(text("ALTER TABLE daily_tag_counts DROP COLUMN scored_count"))
+        self.db.close()
+
+        db = Database(str(self.db.engine.url))
+        try:
+            self.assertEqual(db.get_tag_series("AI"), [(published.date(), 1, 0.5, 1)])
+        finally:
+            db.close()
+
+    def test_search_table_converted_to_contentless(self):
+        """Test an FTS table that stores bodies is rebuilt as contentless"""
+        self.db.add_article({
+            "title": "Foundry news",
+            "url": "https://example.com/test",
+            "source": "Test Source",
+            "published_date": datetime.now(),
+        })
+        with self.db.engine.begin() as connection:
+            connection.execute(text("DROP TABLE articles_fts"))
+            connection.execute(text("CREATE VIRTUAL TABLE articles_fts USING fts5(title, summary, content)"))
+        self.db.close()
+
+        db = Database(str(self.db.engine.url))
+        try:
+            with db.engine.connect() as connection:
+                sql = connection.execute(
+                    text("SELECT sql FROM sqlite_master WHERE name = 'articles_fts'")
+                ).scalar()
+            self.assertIn("content = ''", sql)
+            self.assertEqual(len(db.search_articles("foundry")), 1)
+        finally:
+            db.close()
+
+    def test_run_maintenance(self):
+        """Test maintenance runs without error on a live database"""
+        self.db.add_article({
+            "title": "Test Article",
+            "url": "https://example.com/test",
+            "source": "Test Source",
+            "published_date": datetime.now(),
+        })
+        self.db.run_maintenance()
+        self.assertEqual(self.db.get_article_count(), 1)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,99 @@
+"""Tests for summary post digests"""
+
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from tech_crawler.blog import BlogPublisher, DigestBuilder, build_digest
+from tech_crawler.blog.digest import render_digest
+from tech_crawler.storage import Database
+
+
+def article(n, score, source="Source A", title=None):
+    return {
+        "title": title or f"Headline number {n} about topic{n}",
+        "url": f"https://example.com/{n}",
+        "summary": f"Summary {n}",
+        "source": source,
+        "relevance_score": score,
+    }
+
+
+class TestDigestBuilder(unittest.TestCase):
+    """Test DigestBuilder selection"""
+
+    def test_top_k_by_relevance(self):
+        """Test the highest scoring articles are picked in order"""
+        sources = ["Source A", "Source B", "Source C", "Source D"]
+        articles = [article(n, n / 100, sources[n % 4]) for n in range(100)]
+        picked = DigestBuilder(top_k=5, per_source=5).extend(articles).top()
+        self.assertEqual([a["url"] for a in picked], [f"https://example.com/{n}" for n in (99, 98, 97, 96, 95)])
+
+    def test_per_source_cap(self):
+        """Test no source fills more than its share of the digest"""
+        articles = [article(n, 1.0 - n / 100, "Big Source") for n in range(20)]
+        articles.append(article(100, 0.1, "Small Source"))
+        picked = DigestBuilder(top_k=5, per_source=2).extend(articles).top()
+        self.assertEqual(len(picked), 3)
+        self.assertEqual(sum(a["source"] == "Big Source" for a in picked), 2)
+
+    def test_near_duplicates_suppressed(self):
+        """Test a syndicated story appears once, keeping the better scored copy"""
+        articles = [
+            article(1, 0.5, "Source A", "Nvidia unveils new AI chip for data centers"),
+            article(2, 0.9, "Source B", "Nvidia unveils new AI chip for data centers today"),
+            article(3, 0.4, "Source C", "Cloud spending rises again"),
+        ]
+        picked = DigestBuilder(top_k=5, per_source=5).extend(articles).top()
+        self.assertEqual([a["url"] for a in picked], ["https://example.com/2", "https://example.com/3"])
+
+    def test_memory_is_bounded(self):
+        """Test candidates stay bounded however many articles stream through"""
+        builder = DigestBuilder(top_k=10, per_source=3)
+        builder.extend(article(n, (n * 37 % 1000) / 1000, f"Source {n % 5}") for n in range(20000))
+        self.assertEqual(builder.seen, 20000)
+        self.assertLessEqual(sum(len(heap) for heap in builder._heaps.values()), 15)
+        self.assertEqual(len(builder.top()), 10)
+
+    def test_render(self):
+        """Test the digest renders as Markdown"""
+        content = render_digest([article(1, 0.5)], "Weekly", generated_on=datetime(2026, 3, 2))
+        self.assertTrue(content.startswith("# Weekly\n\n*Generated on 2026-03-02*\n"))
+        self.assertIn("## Headline number 1 about topic1\nSource: [Source A](https://example.com/1)\nSummary 1\n", content)
+
+
+class TestDigestFromDatabase(unittest.TestCase):
+    """Test digests streamed from the database"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.db = Database("sqlite:///:memory:")
+        now = datetime.utcnow()
+        articles = [
+            dict(article(n, n / 10), published_date=now - timedelta(days=1))
+            for n in range(5)
+        ]
+        articles.append(dict(article(9, 1.0), published_date=now - timedelta(days=30)))
+        self.db.add_articles_batch(articles)
+
+    def tearDown(self):
+        """Clean up"""
+        self.db.close()
+
+    def test_window(self):
+        """Test only articles inside the window are considered"""
+        picked = build_digest(self.db, since=datetime.utcnow() - timedelta(days=7), top_k=3, per_source=3)
+        self.assertEqual([a["url"] for a in picked], [f"https://example.com/{n}" for n in (4, 3, 2)])
+
+    def test_summary_post(self):
+        """Test create_summary_post publishes the rendered digest"""
+        publisher = BlogPublisher(self.db)
+        with mock.patch.object(publisher, "publish_article", return_value=True) as publish:
+            self.assertTrue(publisher.create_summary_post(title="Weekly"))
+        content = publish.call_args[0][0]["content"]
+        self.assertIn("https://example.com/4", content)
+        self.assertNotIn("https://example.com/9", content)
+
+
+if __name__ == "__main__":
+    unittest.main()
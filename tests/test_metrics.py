@@ -0,0 +1,68 @@
+"""Tests for metric export"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from prometheus_client import CollectorRegistry, Counter
+from prometheus_client.core import GaugeMetricFamily
+
+from tech_crawler.metrics import (
+    CRAWL_LAST_RUN, CRAWLER_REGISTRY, HTTP_REQUESTS, exposition, web_registry, write_textfile,
+)
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestMetricsExport(unittest.TestCase):
+    """Test the crawler textfile and the combined /metrics exposition"""
+
+    def test_textfile(self):
+        """Test the crawler export holds crawler metrics only"""
+        CRAWL_LAST_RUN.set(1700000000)
+        HTTP_REQUESTS.labels(endpoint="/", method="GET", status=200).inc()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "metrics", "crawler.prom")
+            write_textfile(path)
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+        self.assertIn("crawler_last_run_timestamp_seconds 1.7e+09", text)
+        self.assertNotIn("http_requests_total", text)
+
+    def test_exposition_merges_export(self):
+        """Test scrape-time families and the crawler export join the registry's output"""
+        registry = CollectorRegistry()
+        Counter("web_total", "Web", registry=registry).inc(3)
+        exported = "# HELP crawler_test_total Test\n# TYPE crawler_test_total counter\ncrawler_test_total 7\n"
+
+        text = exposition(registry, [GaugeMetricFamily("clients", "Clients", value=2)], exported).decode()
+        self.assertIn("web_total 3.0\n", text)
+        self.assertIn("clients 2.0\n", text)
+        self.assertIn("crawler_test_total 7.0\n", text)
+
+    def test_exposition_skips_imported_crawler_metrics(self):
+        """Test crawler families from the web registry give way to the crawler's export"""
+        text = exposition(CRAWLER_REGISTRY).decode()
+        self.assertNotIn("crawler_last_run_timestamp_seconds", text)
+
+    def test_multiprocess_workers_are_summed(self):
+        """Test /metrics adds up the request counters of every worker process"""
+        script = (
+            "from tech_crawler.metrics import HTTP_REQUESTS\n"
+            "HTTP_REQUESTS.labels(endpoint='/api/articles', method='GET', status=200).inc(2)\n"
+        )
+        with tempfile.TemporaryDirectory() as tmpdir:
+            env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=tmpdir)
+            for _ in range(2):
+                subprocess.run([sys.executable, "-c", script], cwd=REPO_ROOT, env=env, check=True)
+            with mock.patch.dict(os.environ, {"PROMETHEUS_MULTIPROC_DIR": tmpdir}):
+                text = exposition(web_registry()).decode()
+        self.assertIn('http_requests_total{endpoint="/api/articles",method="GET",status="200"} 4.0', text)
+        self.assertNotIn("crawler_last_run_timestamp_seconds", text)
+
+
+if __name__ == "__main__":
+    unittest.main()
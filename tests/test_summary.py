@@ -0,0 +1,72 @@
+"""Tests for daily dashboard summary"""
+
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from tech_crawler.analysis import DailySummaryCache, build_daily_summary
+from tech_crawler.storage import Database
+
+
+class TestDailySummary(unittest.TestCase):
+    """Test DailySummaryCache"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.db = Database("sqlite:///:memory:")
+        self.cache = DailySummaryCache(self.db, ttl=0)
+
+    def tearDown(self):
+        """Clean up"""
+        self.db.close()
+
+    def add(self, n, tags="AI"):
+        self.db.add_article({
+            "title": f"Semiconductor supply update {n}",
+            "url": f"https://example.com/{n}",
+            "summary": "Chipmakers expand capacity",
+            "source": "Test Source",
+            "published_date": datetime.utcnow(),
+            "tags": tags,
+        })
+
+    def test_empty_day(self):
+        """Test a day without articles"""
+        payload = self.cache.get()
+        self.assertEqual(payload["article_count"], 0)
+        self.assertEqual(payload["narrative"], "No articles crawled today.")
+
+    def test_summary_reused_until_new_articles(self):
+        """Test the summary is computed once per ingest generation"""
+        self.add(1, "AI,NVDA (Nvidia)")
+
+        with mock.patch(
+            "tech_crawler.analysis.summary.build_daily_summary",
+            wraps=build_daily_summary,
+        ) as build:
+            first = self.cache.get()
+            second = self.cache.get()
+            self.assertEqual(build.call_count, 1)
+            self.assertEqual(first, second)
+            self.assertEqual(first["article_count"], 1)
+            self.assertIn("NVDA (Nvidia)", first["narrative"])
+            self.assertIn("semiconductor", first["narrative"])
+
+            self.add(2)
+            third = self.cache.get()
+            self.assertEqual(build.call_count, 2)
+            self.assertEqual(third["article_count"], 2)
+
+    def test_stored_summary_shared(self):
+        """Test a summary refreshed elsewhere is read back without recomputing"""
+        self.add(1)
+        DailySummaryCache(self.db).refresh()
+
+        with mock.patch("tech_crawler.analysis.summary.build_daily_summary") as build:
+            payload = self.cache.get()
+            build.assert_not_called()
+        self.assertEqual(payload["article_count"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+"""Tests for trend time series"""
+
+import time
+import unittest
+from datetime import date, timedelta
+
+from tech_crawler.analysis import build_series
+
+
+class TestBuildSeries(unittest.TestCase):
+    """Test build_series"""
+
+    def test_daily_buckets_fill_gaps(self):
+        """Test days without rows become zero buckets"""
+        start = date(2026, 3, 1)
+        rows = [
+            (date(2026, 3, 1), 2, 1.0, 2),
+            (date(2026, 3, 3), 4, 0.0, 0),
+        ]
+        buckets = build_series(rows, start, date(2026, 3, 4))
+
+        self.assertEqual([b["count"] for b in buckets], [2, 0, 4, 0])
+        self.assertEqual(buckets[0]["avg_relevance"], 0.5)
+        self.assertIsNone(buckets[2]["avg_relevance"])
+        self.assertEqual(buckets[1]["moving_average"], 1.0)
+        self.assertEqual(buckets[0]["start"], "2026-03-01")
+
+    def test_weekly_buckets(self):
+        """Test weeks start on Monday and sum their days"""
+        rows = [
+            (date(2026, 3, 2), 1, 0.0, 0),  # Monday
+            (date(2026, 3, 8), 2, 0.0, 0),  # Sunday, same week
+            (date(2026, 3, 9), 5, 0.0, 0),  # Next Monday
+        ]
+        buckets = build_series(rows, date(2026, 3, 4), date(2026, 3, 10), interval="week")
+
+        self.assertEqual([(b["start"], b["count"]) for b in buckets], [
+            ("2026-03-02", 3),
+            ("2026-03-09", 5),
+        ])
+
+    def test_spike_detection(self):
+        """Test a burst over a steady baseline is flagged"""
+        start = date(2026, 1, 1)
+        counts = [2, 3, 2, 3, 2, 3, 2, 3, 20, 3]
+        rows = [(start + timedelta(days=i), c, 0.0, 0) for i, c in enumerate(counts)]
+        buckets = build_series(rows, start, start + timedelta(days=len(counts) - 1))
+
+        self.assertEqual([i for i, b in enumerate(buckets) if b["spike"]], [8])
+
+    def test_invalid_interval(self):
+        """Test unknown intervals are rejected"""
+        with self.assertRaises(ValueError):
+            build_series([], date(2026, 1, 1), date(2026, 1, 2), interval="month")
+
+    def test_year_of_data_is_fast(self):
+        """Test a year of daily rows is bucketed well under 100 ms"""
+        start = date(2025, 1, 1)
+        rows = [(start + timedelta(days=i), i % 17, 0.5 * (i % 17), i % 17) for i in range(365)]
+
+        began = time.perf_counter()
+        buckets = build_series(rows, start, start + timedelta(days=364))
+        elapsed = time.perf_counter() - began
+
+        self.assertEqual(len(buckets), 365)
+        self.assertLess(elapsed, 0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
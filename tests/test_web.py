@@ -0,0 +1,312 @@
+"""Tests for web application"""
+
+import gzip
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from tech_crawler.config import Settings
+from tech_crawler.web.app import create_app
+from tech_crawler.web import responses
+from tech_crawler.web.events import EventBroadcaster
+
+
+class TestWebAPI(unittest.TestCase):
+    """Test JSON API endpoints"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.app = create_app("sqlite:///:memory:")
+        self.client = self.app.test_client()
+        self.db = self.app.extensions["database"]
+
+        now = datetime.utcnow()
+        for i in range(5):
+            self.db.add_article({
+                "title": f"Nvidia article {i}",
+                "url": f"https://example.com/article{i}",
+                "summary": f"Summary {i}",
+                "content": f"Full body {i}",
+                "source": "Source A" if i % 2 else "Source B",
+                "published_date": now - timedelta(hours=i),
+                "tags": ["NVDA (Nvidia)"],
+            })
+
+    def test_articles_cursor_pagination(self):
+        """Test /api/articles pages through results with cursors"""
+        first = self.client.get("/api/articles?limit=2").get_json()
+        self.assertEqual(first["count"], 2)
+        self.assertIsNotNone(first["next_cursor"])
+
+        second = self.client.get(f"/api/articles?limit=2&cursor={first['next_cursor']}").get_json()
+        first_ids = {a["id"] for a in first["articles"]}
+        second_ids = {a["id"] for a in second["articles"]}
+        self.assertFalse(first_ids & second_ids)
+
+    def test_articles_source_filter(self):
+        """Test source filtering returns a full page from that source"""
+        data = self.client.get("/api/articles?limit=2&source=Source+B").get_json()
+        self.assertEqual(data["count"], 2)
+        self.assertTrue(all(a["source"] == "Source B" for a in data["articles"]))
+
+    def test_listing_omits_content_detail_includes_it(self):
+        """Test list payloads skip bodies that the detail endpoint serves"""
+        listing = self.client.get("/api/articles?limit=1").get_json()
+        article = listing["articles"][0]
+        self.assertNotIn("content", article)
+
+        detail = self.client.get(f"/api/articles/{article['id']}").get_json()
+        self.assertTrue(detail["article"]["content"].startswith("Full body"))
+
+        self.assertEqual(self.client.get("/api/articles/9999").status_code, 404)
+
+    def test_articles_invalid_cursor(self):
+        """Test malformed cursors are rejected"""
+        response = self.client.get("/api/articles?cursor=bogus")
+        self.assertEqual(response.status_code, 400)
+
+    def test_articles_fields_and_filters(self):
+        """Test sparse fields and filter validation on /api/articles"""
+        data = self.client.get("/api/articles?fields=id,title&tag=NVDA+(Nvidia)").get_json()
+        self.assertEqual(data["count"], 5)
+        self.assertEqual(set(data["articles"][0]), {"id", "title"})
+
+        self.assertEqual(self.client.get("/api/articles?fields=content").status_code, 400)
+        self.assertEqual(self.client.get("/api/articles?start=yesterday").status_code, 400)
+
+    def test_suggest(self):
+        """Test /api/suggest returns ranked completions"""
+        data = self.client.get("/api/suggest?q=nv").get_json()
+        self.assertEqual(data["suggestions"][0]["tag"], "NVDA (Nvidia)")
+        self.assertEqual(data["suggestions"][0]["count"], 5)
+
+    def test_trends(self):
+        """Test /api/trends buckets mentions of one tag"""
+        data = self.client.get("/api/trends?tag=NVDA+(Nvidia)&days=7").get_json()
+        self.assertEqual(len(data["buckets"]), 7)
+        self.assertEqual(data["total"], 5)
+
+        self.assertEqual(self.client.get("/api/trends").status_code, 400)
+        self.assertEqual(self.client.get("/api/trends?tag=AI&interval=month").status_code, 400)
+
+    def test_weekly_trends_cover_first_week(self):
+        """Test the first weekly bucket counts days before start back to Monday"""
+        today = datetime.now(timezone.utc).date()
+        days = 10 if (today - timedelta(days=9)).weekday() else 11
+        start = today - timedelta(days=days - 1)
+        monday = start - timedelta(days=start.weekday())
+        self.db.add_article({
+            "title": "Early week article",
+            "url": "https://example.com/monday",
+            "source": "Source A",
+            "published_date": datetime.combine(monday, datetime.min.time()),
+            "tags": ["WEEKLY"],
+        })
+
+        data = self.client.get(f"/api/trends?tag=WEEKLY&interval=week&days={days}").get_json()
+        self.assertEqual(data["buckets"][0]["count"], 1)
+
+    def test_conditional_get(self):
+        """Test repeat polls get 304 until new articles are ingested"""
+        first = self.client.get("/api/articles")
+        self.assertEqual(first.status_code, 200)
+        etag = first.headers["ETag"]
+        self.assertIn("must-revalidate", first.headers["Cache-Control"])
+        self.assertIn("Last-Modified", first.headers)
+
+        repeat = self.client.get("/api/articles", headers={"If-None-Match": etag})
+        self.assertEqual(repeat.status_code, 304)
+        self.assertEqual(repeat.data, b"")
+
+        # Dates alone are too coarse to validate against
+        by_date = self.client.get(
+            "/api/articles", headers={"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"}
+        )
+        self.assertEqual(by_date.status_code, 200)
+
+        self.db.add_article({
+            "title": "Fresh article",
+            "url": "https://example.com/fresh",
+            "source": "Source A",
+            "published_date": datetime.utcnow(),
+        })
+        changed = self.client.get("/api/articles", headers={"If-None-Match": etag})
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed.headers["ETag"], etag)
+        self.assertEqual(changed.get_json()["count"], 6)
+
+    def test_volatile_views_revalidate(self):
+        """Test /api/stats revalidates and rolling windows change at midnight"""
+        stats = self.client.get("/api/stats")
+        self.assertNotIn("cache", stats.get_json())
+        self.assertIn("Last-Modified", stats.headers)
+        self.assertEqual(
+            self.client.get("/api/stats", headers={"If-None-Match": stats.headers["ETag"]}).status_code, 304
+        )
+
+        tomorrow = datetime.now(timezone.utc) + timedelta(days=1)
+        for url in ("/api/trends?tag=AI", "/api/articles"):
+            etag = self.client.get(url).headers["ETag"]
+            self.assertEqual(self.client.get(url, headers={"If-None-Match": etag}).status_code, 304)
+
+            with mock.patch("tech_crawler.web.app.datetime") as fake_datetime:
+                fake_datetime.now.return_value = tomorrow
+                fake_datetime.fromisoformat = datetime.fromisoformat
+                fake_datetime.fromtimestamp = datetime.fromtimestamp
+                next_day = self.client.get(url, headers={"If-None-Match": etag})
+            self.assertEqual(next_day.status_code, 200, url)
+
+    def test_compression_negotiated(self):
+        """Test large bodies are gzipped and small ones are not"""
+        with mock.patch.object(responses.Settings, "RESPONSE_COMPRESSION_MIN_SIZE", 200):
+            large = self.client.get("/api/articles", headers={"Accept-Encoding": "gzip"})
+            self.assertEqual(large.headers["Content-Encoding"], "gzip")
+            self.assertIn("Accept-Encoding", large.headers["Vary"])
+            self.assertTrue(large.headers["ETag"].startswith("W/"))
+            payload = json.loads(gzip.decompress(large.data))
+            self.assertEqual(payload["count"], 5)
+
+            small = self.client.get("/api/articles/9999", headers={"Accept-Encoding": "gzip"})
+            self.assertNotIn("Content-Encoding", small.headers)
+
+            plain = self.client.get("/api/articles")
+            self.assertNotIn("Content-Encoding", plain.headers)
+
+            etag = large.headers["ETag"]
+            cached = self.client.get(
+                "/api/articles", headers={"Accept-Encoding": "gzip", "If-None-Match": etag}
+            )
+            self.assertEqual(cached.status_code, 304)
+            self.assertNotIn("Content-Encoding", cached.headers)
+
+    def test_json_serializers_agree(self):
+        """Test the fast serializer matches the stdlib fallback"""
+        fast = self.client.get("/api/articles").get_json()
+        with mock.patch.object(self.app.json, "use_orjson", False):
+            stdlib = self.client.get("/api/articles").get_json()
+        self.assertEqual(fast, stdlib)
+
+
+    def test_crawl_health(self):
+        """Test /api/crawl-health reports per-source performance"""
+        now = datetime.utcnow()
+        self.db.record_crawl_run(
+            {"started_at": now, "duration_seconds": 1.0, "sources_crawled": 1},
+            [{"source": "Source A", "started_at": now, "duration_seconds": 1.0, "http_status": 304,
+              "not_modified": True}],
+        )
+        data = self.client.get("/api/crawl-health?days=1").get_json()
+        self.assertTrue(data["success"])
+        self.assertEqual(data["window_days"], 1)
+        self.assertEqual(data["sources"][0]["source"], "Source A")
+        self.assertEqual(data["sources"][0]["not_modified_rate"], 1.0)
+        self.assertEqual(len(data["runs"]), 1)
+
+    def test_metrics_endpoint(self):
+        """Test /metrics reports request counts and appends the crawler textfile"""
+        self.client.get("/api/articles?limit=1")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "crawler.prom")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("# HELP crawler_test_total Test\n# TYPE crawler_test_total counter\ncrawler_test_total 7\n")
+            with mock.patch.object(Settings, "METRICS_TEXTFILE", path):
+                response = self.client.get("/metrics")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith("text/plain; version=0.0.4"))
+        text = response.get_data(as_text=True)
+        self.assertRegex(text, r'http_requests_total\{endpoint="/api/articles",method="GET",status="200"\} \d+')
+        self.assertIn('http_request_duration_seconds_count{endpoint="/api/articles"}', text)
+        self.assertIn("db_read_cache_hits_total", text)
+        self.assertIn("crawler_test_total 7.0", text)
+
+    def test_metrics_survive_bad_textfile(self):
+        """Test an unparseable crawler export does not take /metrics down"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "crawler.prom")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("crawler_test_total{source=\"A\" 7\n")
+            with mock.patch.object(Settings, "METRICS_TEXTFILE", path):
+                response = self.client.get("/metrics")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("db_read_cache_hits_total", response.get_data(as_text=True))
+
+class TestEventStream(unittest.TestCase):
+    """Test live article stream"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.app = create_app("sqlite:///:memory:")
+        self.client = self.app.test_client()
+        self.db = self.app.extensions["database"]
+
+    def add(self, n):
+        self.db.add_article({
+            "title": f"Article {n}",
+            "url": f"https://example.com/{n}",
+            "source": "Test Source",
+            "published_date": datetime.utcnow(),
+        })
+
+    def test_one_query_per_batch_for_all_subscribers(self):
+        """Test new articles reach every subscriber from a single read"""
+        broadcaster = EventBroadcaster(self.db, poll_interval=60)
+        subscribers = [broadcaster.subscribe() for _ in range(3)]
+
+        with mock.patch.object(
+            self.db, "get_article_events", wraps=self.db.get_article_events
+        ) as reads:
+            self.assertEqual(broadcaster.poll(), 0)
+            self.db.add_articles_batch([
+                {"title": "A", "url": "https://example.com/a", "source": "S"},
+                {"title": "B", "url": "https://example.com/b", "source": "S"},
+            ])
+            self.assertEqual(broadcaster.poll(), 2)
+            self.assertEqual(broadcaster.poll(), 0)
+            self.assertEqual(reads.call_count, 1)
+
+        for subscription in subscribers:
+            batch = subscription.get(timeout=0)
+            self.assertEqual([article["title"] for _, article in batch], ["A", "B"])
+        broadcaster.stop()
+
+    def test_stream_replays_after_last_event_id(self):
+        """Test a reconnecting client receives the events it missed"""
+        self.add(1)
+        self.add(2)
+        first_id = self.db.get_article_events(0)[0][0]
+
+        response = self.client.get("/api/stream", headers={"Last-Event-ID": str(first_id)})
+        self.assertEqual(response.mimetype, "text/event-stream")
+        chunks = iter(response.response)
+        self.assertEqual(next(chunks), b"retry: 5000\n\n")
+        event = next(chunks).decode("utf-8")
+        self.assertIn(f"id: {first_id + 1}\nevent: article\n", event)
+        self.assertIn('"title":"Article 2"', event)
+        response.close()
+
+        # A client that had to open a new EventSource resumes by query argument
+        response = self.client.get(f"/api/stream?last_event_id={first_id}")
+        chunks = iter(response.response)
+        next(chunks)
+        self.assertIn(f"id: {first_id + 1}\n", next(chunks).decode("utf-8"))
+        response.close()
+
+    def test_stream_limit_leaves_threads_free(self):
+        """Test thread-based workers accept fewer streams than they have threads"""
+        with mock.patch.multiple(Settings, WEB_WORKER_CLASS="gthread", WEB_THREADS=4, STREAM_MAX_CLIENTS=50):
+            self.assertEqual(Settings.stream_client_limit(), 2)
+            streams = [self.client.get("/api/stream") for _ in range(2)]
+            self.assertEqual(self.client.get("/api/stream").status_code, 503)
+            for response in streams:
+                response.close()
+        with mock.patch.multiple(Settings, WEB_WORKER_CLASS="gevent", WEB_THREADS=1, STREAM_MAX_CLIENTS=50):
+            self.assertEqual(Settings.stream_client_limit(), 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 """Web server entry point for Tech Investment Crawler"""
 
 import logging
+from tech_crawler.config import Settings
 from tech_crawler.web.app import create_app
 
 # Configure logging
@@ -12,7 +13,9 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 if __name__ == '__main__':
+    # Single-process development server; in production use
+    # gunicorn -c gunicorn.conf.py tech_crawler.web.wsgi:app
     logger.info("Starting Tech Investment Crawler Web Server")
     app = create_app()
-    logger.info("Web server running at http://localhost:5000")
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    logger.info(f"Web server running at http://localhost:{Settings.WEB_PORT}")
+    app.run(debug=Settings.DEBUG, host=Settings.WEB_HOST, port=Settings.WEB_PORT)